@@ -13,6 +13,7 @@ from unfold.admin import ModelAdmin, TabularInline
 from unfold.sites import UnfoldAdminSite
 
 # from apps.accounts.models import User
+from apps.dashboard.navigation import CachedNavigationMixin
 from apps.organisation.admin import CostCentreAdmin, PositionAdmin, RegionAdmin
 from apps.organisation.models import (
     CostCentre,
@@ -39,6 +40,7 @@ from apps.recruitment.models import (
 
 from .forms import CustomUserChangeForm, CustomUserCreationForm
 from .models import User
+from .roles import is_admin
 
 # Unregister default admin configurations for Group and EmailAddress
 admin.site.unregister(Group)
@@ -77,22 +79,22 @@ class UserAdmin(ModelAdmin, ExportActionModelAdmin):
     def get_queryset(self, request):
         qs = super().get_queryset(request).exclude(is_superuser=True)
 
-        if request.user.is_superuser or request.user.groups.filter(name="admin").exists():
+        if is_admin(request.user):
             return qs.exclude(email="AnonymousUser")
         return qs.filter(user=request.user)
 
     def has_add_permission(self, request):
-        if request.user.is_superuser or request.user.groups.filter(name="admin").exists():
+        if is_admin(request.user):
             return True
         return False
 
     def has_delete_permission(self, request, obj=None):
-        if request.user.is_superuser or request.user.groups.filter(name="admin").exists():
+        if is_admin(request.user):
             return True
         return False
 
 
-class SuperuserDashboard(UnfoldAdminSite):
+class SuperuserDashboard(CachedNavigationMixin, UnfoldAdminSite):
     """
     Custom admin site for superusers.
 
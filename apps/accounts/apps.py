@@ -9,6 +9,7 @@ class AccountsConfig(AppConfig):
         """
         Perform any app-specific initialisation when the app is ready.
 
-        This method imports the signals module to ensure that any signal handlers
-        associated with the 'accounts' app are correctly registered when the app is loaded.
+        This method imports the roles module so that cached group names are invalidated
+        whenever a user's group membership changes.
         """
+        from . import roles  # noqa: F401
@@ -2,7 +2,8 @@ from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.core.mail import send_mail
 from django.db import models
 from django.utils.crypto import get_random_string
-from phonenumber_field.modelfields import PhoneNumberField
+
+from apps.utils.phone import PhoneNumberField
 
 
 class CustomUserManager(BaseUserManager):
@@ -0,0 +1,74 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_save, pre_delete
+from django.dispatch import receiver
+
+ROLES_CACHE_KEY = "accounts:roles:{user_id}"
+ROLES_CACHE_TIMEOUT = 60 * 60
+
+User = get_user_model()
+
+
+def get_roles(user):
+    """
+    Returns the names of the groups the user belongs to.
+
+    The names are loaded once per request and kept on the user object, so repeated
+    permission checks within a request don't query the groups again. Across requests they
+    are cached until the user's group membership changes.
+
+    Args:
+        user (User): The user, usually `request.user`.
+
+    Returns:
+        frozenset: The user's group names, empty for anonymous users.
+    """
+    if not user.is_authenticated:
+        return frozenset()
+
+    roles = getattr(user, "_roles", None)
+    if roles is None:
+        key = ROLES_CACHE_KEY.format(user_id=user.pk)
+        roles = cache.get(key)
+        if roles is None:
+            roles = frozenset(user.groups.values_list("name", flat=True))
+            cache.set(key, roles, ROLES_CACHE_TIMEOUT)
+        user._roles = roles
+    return roles
+
+
+def has_role(user, *names):
+    """Checks whether the user belongs to any of the named groups."""
+    return not get_roles(user).isdisjoint(names)
+
+
+def is_admin(user):
+    """Checks whether the user is a superuser or belongs to the "admin" group."""
+    return user.is_superuser or has_role(user, "admin")
+
+
+def invalidate_roles(user_ids):
+    cache.delete_many([ROLES_CACHE_KEY.format(user_id=user_id) for user_id in user_ids])
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_member_roles(sender, instance, action, reverse, pk_set, **kwargs):
+    """Drops the cached roles of users added to or removed from a group."""
+    if not reverse:
+        if action.startswith("post_"):
+            invalidate_roles([instance.pk])
+    elif action == "pre_clear":
+        # The members of a group being cleared are only known before the clear
+        invalidate_roles(instance.user_set.values_list("pk", flat=True))
+    elif action in ("post_add", "post_remove"):
+        invalidate_roles(pk_set)
+
+
+@receiver(post_save, sender=Group)
+@receiver(pre_delete, sender=Group)
+def invalidate_group_roles(sender, instance, **kwargs):
+    """Drops the cached roles of a group's members when it is renamed or deleted."""
+    if kwargs.get("created"):
+        return
+    invalidate_roles(instance.user_set.values_list("pk", flat=True))
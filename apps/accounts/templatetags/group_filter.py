@@ -1,5 +1,7 @@
 from django import template
 
+from apps.accounts.roles import has_role
+
 register = template.Library()
 
 
@@ -18,4 +20,4 @@ def is_in_group(user, group_name):
     Returns:
         bool: True if the user is in the specified group, otherwise False.
     """
-    return user.groups.filter(name=group_name).exists()
+    return has_role(user, group_name)
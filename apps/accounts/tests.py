@@ -1 +1,46 @@
-# Create your tests here.
+import pytest
+from django.contrib.auth.models import Group
+
+from apps.accounts.models import User
+from apps.accounts.roles import get_roles, has_role, is_admin
+
+
+@pytest.fixture
+def user():
+    user = User.objects.create_user(email="reviewer@example.com", first_name="Test", last_name="Reviewer")
+    user.groups.add(Group.objects.create(name="recruiter"))
+    return User.objects.get(pk=user.pk)
+
+
+@pytest.mark.django_db
+def test_roles_loaded_once(user, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        assert has_role(user, "recruiter")
+        assert not has_role(user, "admin")
+        assert not is_admin(user)
+
+    # A fresh user object for the next request reads the cached roles
+    with django_assert_num_queries(0):
+        assert get_roles(User(pk=user.pk)) == {"recruiter"}
+
+
+@pytest.mark.django_db
+def test_roles_invalidated_on_membership_change(user):
+    assert get_roles(user) == {"recruiter"}
+
+    Group.objects.create(name="admin").user_set.add(user)
+    assert is_admin(User.objects.get(pk=user.pk))
+
+    user.groups.clear()
+    assert get_roles(User.objects.get(pk=user.pk)) == frozenset()
+
+
+@pytest.mark.django_db
+def test_roles_invalidated_on_group_rename(user):
+    assert get_roles(user) == {"recruiter"}
+
+    group = Group.objects.get(name="recruiter")
+    group.name = "admin"
+    group.save()
+
+    assert get_roles(User.objects.get(pk=user.pk)) == {"admin"}
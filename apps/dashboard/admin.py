@@ -5,6 +5,7 @@ from unfold.sites import UnfoldAdminSite
 
 from apps.accounts.admin import EmailAddressAdmin, GroupAdmin, UserAdmin
 from apps.accounts.models import User
+from apps.accounts.roles import has_role
 from apps.organisation.admin import CostCentreAdmin, PositionAdmin, RegionAdmin
 from apps.organisation.models import CostCentre, Position, Region
 from apps.pages.models import FAQ, Announcement
@@ -21,10 +22,11 @@ from apps.recruitment.models import (
     VacancyType,
 )
 
+from .navigation import CachedNavigationMixin
 from .views import AdminLoginView
 
 
-class AdminDashboard(UnfoldAdminSite):
+class AdminDashboard(CachedNavigationMixin, UnfoldAdminSite):
     site_header = "Admin Dashboard"
     site_title = "Admin Dashboard"
     index_title = "Admin Dashboard"
@@ -41,7 +43,7 @@ class AdminDashboard(UnfoldAdminSite):
         return (
             request.user.is_active
             and request.user.is_authenticated
-            and request.user.groups.filter(name="admin").exists()
+            and has_role(request.user, "admin")
         )
 
 
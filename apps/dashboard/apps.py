@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class DashboardConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.dashboard"
+
+    def ready(self):
+        """
+        Imports the navigation and cache modules so that cached sidebar permissions and
+        staff dashboard content are invalidated whenever what they were built from changes.
+        """
+        from . import cache, navigation  # noqa: F401
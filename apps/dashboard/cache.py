@@ -0,0 +1,74 @@
+import math
+
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.pages.models import Announcement
+from apps.recruitment.models import Vacancy, VacancyType
+
+STAFF_INDEX_CACHE_KEY = "dashboard:staff_index"
+STAFF_INDEX_CACHE_TIMEOUT = 60 * 15
+
+
+def staff_index_cache_timeout(now, content):
+    """
+    Returns how long the content of the staff dashboard may be cached.
+
+    The content is only valid until the first vacancy or announcement on it passes its
+    deadline, so the timeout never reaches past it.
+
+    Args:
+        now (datetime): The time the content was loaded.
+        content (dict): The vacancies and announcements shown.
+
+    Returns:
+        int: The timeout in seconds.
+    """
+    timeout = STAFF_INDEX_CACHE_TIMEOUT
+    for item in [*content["vacancies"], *content["announcements"]]:
+        timeout = min(timeout, math.ceil((item.deadline - now).total_seconds()))
+    return max(timeout, 1)
+
+
+def get_staff_index_content():
+    """
+    Returns the vacancies and announcements shown on the staff dashboard.
+
+    Everyone admitted to the staff dashboard sees every published vacancy and visible
+    announcement, so the content is loaded once and served from the cache until it changes
+    or its nearest deadline passes.
+
+    Returns:
+        dict: The vacancies, with their types loaded, and the announcements.
+    """
+    content = cache.get(STAFF_INDEX_CACHE_KEY)
+    if content is not None:
+        return content
+
+    now = timezone.now()
+    vacancies = Vacancy.objects.filter(is_published=True, deadline__gt=now)
+    announcements = Announcement.objects.filter(is_visible=True, deadline__gt=now)
+    content = {
+        "vacancies": list(vacancies.select_related("vacancy_type").order_by("-created_at")),
+        "announcements": list(announcements),
+    }
+    cache.set(STAFF_INDEX_CACHE_KEY, content, staff_index_cache_timeout(now, content))
+    return content
+
+
+def invalidate_staff_index_cache():
+    """Removes the staff dashboard content from the cache."""
+    cache.delete(STAFF_INDEX_CACHE_KEY)
+
+
+@receiver(post_save, sender=Vacancy)
+@receiver(post_delete, sender=Vacancy)
+@receiver(post_save, sender=VacancyType)
+@receiver(post_delete, sender=VacancyType)
+@receiver(post_save, sender=Announcement)
+@receiver(post_delete, sender=Announcement)
+def invalidate_staff_index(sender, **kwargs):
+    """Drops the cached staff dashboard content whenever a vacancy or announcement changes."""
+    invalidate_staff_index_cache()
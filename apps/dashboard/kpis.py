@@ -0,0 +1,139 @@
+import json
+from datetime import datetime, time, timedelta
+
+from django.core.cache import cache
+from django.db.models import Avg, Count, F, Min, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from apps.accounts.roles import is_admin
+from apps.recruitment.models import Application
+
+KPI_CACHE_KEY = "dashboard:recruitment_kpis:{scope}"
+KPI_CACHE_TIMEOUT = 60
+KPI_DAYS = 30
+
+GENDERS = [("female", "Female"), ("male", "Male"), ("", "Not given")]
+
+
+def get_kpi_applications(user):
+    """Returns the applications the user's KPIs are computed over: all for admins, else those they review."""
+    applications = Application.objects.all()
+    if not is_admin(user):
+        applications = applications.filter(vacancy__reviewers=user)
+    return applications
+
+
+def compute_recruitment_kpis(applications, days=KPI_DAYS):
+    """
+    Computes the recruitment dashboard KPIs with two grouped aggregate queries.
+
+    The first groups the applications of the last `days` days by day, status, origin and
+    gender, which is enough to derive the daily series, the status funnel and both splits.
+    The second aggregates the review times of the applications to open vacancies.
+
+    Args:
+        applications (QuerySet): The applications in scope.
+        days (int): The number of days the daily series and splits cover.
+
+    Returns:
+        dict: The KPIs, with the chart data encoded as JSON.
+    """
+    now = timezone.now()
+    today = timezone.localdate()
+    start = today - timedelta(days=days - 1)
+
+    # A range on the raw column, rather than __date, so the submitted_at index serves it
+    since = timezone.make_aware(datetime.combine(start, time.min))
+    rows = (
+        applications.filter(submitted_at__gte=since)
+        .values("status", "is_internal", "gender", day=TruncDate("submitted_at"))
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+
+    dates = [start + timedelta(days=i) for i in range(days)]
+    internal_per_day = dict.fromkeys(dates, 0)
+    external_per_day = dict.fromkeys(dates, 0)
+    statuses = dict.fromkeys(Application.STATUS.values, 0)
+    genders = dict.fromkeys((value for value, _ in GENDERS), 0)
+    for row in rows:
+        per_day = internal_per_day if row["is_internal"] else external_per_day
+        if row["day"] in per_day:
+            per_day[row["day"]] += row["count"]
+        statuses[row["status"]] = statuses.get(row["status"], 0) + row["count"]
+        gender = row["gender"] if row["gender"] in genders else ""
+        genders[gender] += row["count"]
+
+    total = sum(statuses.values())
+    internal = sum(internal_per_day.values())
+    reviewed = statuses[Application.STATUS.ACCEPTED] + statuses[Application.STATUS.REJECTED]
+
+    review = applications.filter(vacancy__deadline__gte=now).aggregate(
+        applications=Count("id"),
+        pending=Count("id", filter=Q(status=Application.STATUS.SUBMITTED)),
+        reviewed=Count("id", filter=Q(reviewed_at__isnull=False)),
+        average_review_time=Avg(F("reviewed_at") - F("submitted_at"), filter=Q(reviewed_at__isnull=False)),
+        oldest_pending=Min("submitted_at", filter=Q(status=Application.STATUS.SUBMITTED)),
+    )
+
+    def percentage(count):
+        return round(count * 100 / total) if total else 0
+
+    return {
+        "days": days,
+        "total": total,
+        "per_day_chart": json.dumps(
+            {
+                "labels": [date.strftime("%d %b") for date in dates],
+                "datasets": [
+                    {"label": "External", "data": list(external_per_day.values())},
+                    {"label": "Internal", "data": list(internal_per_day.values())},
+                ],
+            }
+        ),
+        "funnel": [
+            ("Received", total, 100 if total else 0),
+            ("Reviewed", reviewed, percentage(reviewed)),
+            ("Accepted", statuses[Application.STATUS.ACCEPTED], percentage(statuses[Application.STATUS.ACCEPTED])),
+        ],
+        "origin": [
+            ("Internal", internal, percentage(internal)),
+            ("External", total - internal, percentage(total - internal)),
+        ],
+        "gender_chart": json.dumps(
+            {
+                "labels": [label for _, label in GENDERS],
+                "datasets": [{"label": "Applications", "data": [genders[value] for value, _ in GENDERS]}],
+            }
+        ),
+        "open_vacancies": {
+            **review,
+            "average_review_days": (
+                round(review["average_review_time"].total_seconds() / 86400, 1)
+                if review["average_review_time"] is not None
+                else None
+            ),
+            "oldest_pending_days": (now - review["oldest_pending"]).days if review["oldest_pending"] else None,
+        },
+    }
+
+
+def get_recruitment_kpis(user):
+    """
+    Returns the recruitment dashboard KPIs for a user, cached for `KPI_CACHE_TIMEOUT` seconds.
+
+    Admins share one cache entry; every other user's KPIs cover only the vacancies they review.
+
+    Args:
+        user (User): The user viewing the dashboard.
+
+    Returns:
+        dict: The KPIs, as returned by `compute_recruitment_kpis`.
+    """
+    key = KPI_CACHE_KEY.format(scope="all" if is_admin(user) else user.pk)
+    kpis = cache.get(key)
+    if kpis is None:
+        kpis = compute_recruitment_kpis(get_kpi_applications(user))
+        cache.set(key, kpis, KPI_CACHE_TIMEOUT)
+    return kpis
@@ -0,0 +1,100 @@
+import hashlib
+import uuid
+
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.urls import reverse
+from unfold.settings import get_config
+
+from apps.accounts.roles import get_roles
+
+NAVIGATION_CACHE_KEY = "dashboard:navigation:{prefix}:{roles}"
+NAVIGATION_VERSION_KEY = "dashboard:navigation:version"
+NAVIGATION_CACHE_TIMEOUT = 60 * 60
+
+
+def get_navigation_callbacks(config):
+    """Yields the permission callback of every sidebar and tab item, in the order they are declared."""
+    for group in config["SIDEBAR"].get("navigation", []):
+        for item in group["items"]:
+            yield item.get("permission")
+    for tab in config["TABS"]:
+        for item in tab["items"]:
+            yield item.get("permission")
+
+
+def navigation_cache_key(user, prefix):
+    """
+    Builds the cache key of the navigation permissions for a role set under a URL prefix.
+
+    Args:
+        user (User): The user the navigation is drawn for.
+        prefix (str): The URL prefix of the admin site being rendered.
+
+    Returns:
+        str: The cache key.
+    """
+    roles = sorted(get_roles(user))
+    if user.is_superuser:
+        roles.append(":superuser")
+    digest = hashlib.sha256("\n".join(roles).encode()).hexdigest()[:32]
+    return NAVIGATION_CACHE_KEY.format(prefix=prefix, roles=digest)
+
+
+def invalidate_navigation():
+    """Expires every cached navigation tree by moving on to a new version."""
+    cache.set(NAVIGATION_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+class CachedNavigationMixin:
+    """
+    Caches which sidebar and tab items of the Unfold configuration a user may see.
+
+    The `permission` callbacks of the declarative `UNFOLD` config are evaluated once per
+    role set (the user's group names and superuser flag) and admin site URL prefix. Later
+    requests read the results with a single cache lookup, while the links and active states
+    are still built from the config on every request. The cache is versioned and the version
+    moves on whenever groups or their permissions change. Permissions granted directly to a
+    user, rather than through a group, are not part of the role set, so navigation should
+    be granted through groups.
+    """
+
+    def get_navigation_permissions(self, request):
+        permissions = getattr(request, "_navigation_permissions", None)
+        if permissions is not None:
+            return permissions
+
+        callbacks = list(get_navigation_callbacks(get_config(self.settings_name)))
+        key = navigation_cache_key(request.user, reverse(f"{self.name}:index"))
+        cached = cache.get_many([key, NAVIGATION_VERSION_KEY])
+        version = cached.get(NAVIGATION_VERSION_KEY)
+
+        entry = cached.get(key)
+        if entry is not None and entry[0] == version and len(entry[1]) == len(callbacks):
+            results = entry[1]
+        else:
+            results = []
+            for callback in callbacks:
+                results.append(super()._call_permission_callback(callback, request))
+            cache.set(key, (version, results), NAVIGATION_CACHE_TIMEOUT)
+
+        permissions = {id(callback): result for callback, result in zip(callbacks, results)}
+        request._navigation_permissions = permissions
+        return permissions
+
+    def _call_permission_callback(self, callback, request):
+        permissions = self.get_navigation_permissions(request)
+        if id(callback) in permissions:
+            return permissions[id(callback)]
+        return super()._call_permission_callback(callback, request)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidate_navigation_on_permission_change(sender, **kwargs):
+    """Expires the cached navigation whenever groups or their permissions change."""
+    if kwargs.get("action", "post_").startswith("post_"):
+        invalidate_navigation()
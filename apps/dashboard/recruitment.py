@@ -1,5 +1,6 @@
 from unfold.sites import UnfoldAdminSite
 
+from apps.accounts.roles import has_role
 from apps.recruitment.admin import (
     ApplicationAdmin,
     InterviewAdmin,
@@ -7,24 +8,30 @@ from apps.recruitment.admin import (
 )
 from apps.recruitment.models import Application, Interview, Vacancy
 
+from .kpis import get_recruitment_kpis
+from .navigation import CachedNavigationMixin
 from .views import RecruiterLoginView
 
 
-class RecruitmentAdminArea(UnfoldAdminSite):
+class RecruitmentAdminArea(CachedNavigationMixin, UnfoldAdminSite):
     site_header = "Recruitment Admin"
     site_title = "Recruitment"
     index_title = "Recruitment Dashboard"
-    index_template = "admin/index.html"
+    index_template = "admin/recruitment/dashboard.html"
     enable_nav_sidebar = False
 
     def login(self, request, extra_context=None):
         return RecruiterLoginView.as_view()(request)
 
+    def index(self, request, extra_context=None):
+        extra_context = {**(extra_context or {}), "kpis": get_recruitment_kpis(request.user)}
+        return super().index(request, extra_context)
+
     def has_permission(self, request):
         return (
             request.user.is_active
             and request.user.is_authenticated
-            and request.user.groups.filter(name="recruiter").exists()
+            and has_role(request.user, "recruiter")
         )
 
 
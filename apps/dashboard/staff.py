@@ -1,11 +1,12 @@
 from django.http import HttpRequest
-from django.utils import timezone
 from unfold.admin import ModelAdmin
 from unfold.sites import UnfoldAdminSite
 
-from apps.pages.models import Announcement
-from apps.recruitment.models import Application, Interview, Vacancy
+from apps.accounts.roles import is_admin
+from apps.recruitment.models import Application, Interview
 
+from .cache import get_staff_index_content
+from .navigation import CachedNavigationMixin
 from .views import StaffLoginView
 
 
@@ -45,7 +46,7 @@ class ApplicationAdmin(ModelAdmin):
     def get_queryset(self, request):
         qs = super().get_queryset(request)
 
-        if request.user.is_superuser or request.user.groups.filter(name="admin").exists():
+        if is_admin(request.user):
             return qs
         return qs.filter(email=request.user.email)
 
@@ -83,7 +84,7 @@ class InterviewAdmin(ModelAdmin):
 
 
 # class StaffDashboard(admin.AdminSite):
-class StaffDashboard(UnfoldAdminSite):
+class StaffDashboard(CachedNavigationMixin, UnfoldAdminSite):
     site_header = "Staff Dashboard"
     site_title = "Staff Dashboard"
     # index_title = "Staff Dashboard"
@@ -94,15 +95,10 @@ class StaffDashboard(UnfoldAdminSite):
     # password_change_template = "admin/password_change.html"
 
     def index(self, request, extra_context=None):
-        announcements = Announcement.objects.filter(
-            deadline__gt=timezone.now(),
-            is_visible=True,
-        )
-        vacancies = Vacancy.objects.filter(is_published=True, deadline__gt=timezone.now()).order_by("-created_at")
+        # The admin index adds each_context itself, so the sidebar is only built once
         extra_context = {
-            **self.each_context(request),
-            "announcements": announcements,
-            "vacancies": vacancies,
+            **(extra_context or {}),
+            **get_staff_index_content(),
             "title": request.user,
         }
         return super().index(request, extra_context)
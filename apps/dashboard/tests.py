@@ -1 +1,155 @@
-# Create your tests here.
+from datetime import date, timedelta
+
+import pytest
+from django.contrib.auth.models import Group, Permission
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.dashboard.cache import get_staff_index_content
+from apps.dashboard.kpis import compute_recruitment_kpis
+from apps.dashboard.staff import staff_dashboard_site
+from apps.pages.models import Announcement
+from apps.recruitment.models import Application, Vacancy
+
+
+@pytest.fixture
+def staff_user():
+    user = User.objects.create_user(email="staff@example.com", first_name="Test", last_name="Staff")
+    user.groups.add(Group.objects.create(name="staff"))
+    return user
+
+
+def get_request(user):
+    request = RequestFactory().get("/dashboard/staff/")
+    request.user = User.objects.get(pk=user.pk)
+    return request
+
+
+def visible_titles(navigation):
+    return [str(item["title"]) for group in navigation for item in group["items"] if item["has_permission"]]
+
+
+@pytest.mark.django_db
+def test_sidebar_permissions_cached_per_role_set(staff_user, django_assert_num_queries):
+    navigation = staff_dashboard_site.get_sidebar_list(get_request(staff_user))
+    assert visible_titles(navigation) == ["Dashboard", "Recruitment"]
+
+    request = get_request(staff_user)
+    with django_assert_num_queries(0):
+        staff_dashboard_site.get_sidebar_list(request)
+        staff_dashboard_site.get_tabs_list(request)
+
+
+@pytest.mark.django_db
+def test_sidebar_cache_invalidated_on_permission_change(staff_user, django_assert_num_queries):
+    staff_dashboard_site.get_sidebar_list(get_request(staff_user))
+
+    Group.objects.get(name="staff").permissions.add(Permission.objects.get(codename="view_application"))
+
+    request = get_request(staff_user)
+    with django_assert_num_queries(2):
+        # Recomputing the navigation loads the user's permissions for the has_perm checks
+        staff_dashboard_site.get_sidebar_list(request)
+
+
+@pytest.fixture
+def applications():
+    vacancy = Vacancy.objects.create(title="Software Engineer", deadline=timezone.now() + timedelta(days=7))
+    now = timezone.now()
+    rows = [
+        ("female", False, Application.STATUS.SUBMITTED, None),
+        ("female", True, Application.STATUS.ACCEPTED, timedelta(days=2)),
+        ("male", False, Application.STATUS.REJECTED, timedelta(days=1)),
+        ("", False, Application.STATUS.SUBMITTED, None),
+    ]
+    for i, (gender, is_internal, status, review_time) in enumerate(rows):
+        submitted_at = now - timedelta(days=i)
+        Application.objects.create(
+            vacancy=vacancy,
+            first_name="Test",
+            last_name=f"User{i}",
+            email=f"user{i}@example.com",
+            primary_contact=f"+26481123456{i}",
+            date_of_birth=date(1990, 1, 1),
+            gender=gender,
+            is_internal=is_internal,
+            status=status,
+            submitted_at=submitted_at,
+            reviewed_at=submitted_at + review_time if review_time else None,
+        )
+    return vacancy
+
+
+@pytest.mark.django_db
+def test_recruitment_kpis_computed_with_two_queries(applications, django_assert_num_queries):
+    with django_assert_num_queries(2):
+        kpis = compute_recruitment_kpis(Application.objects.all())
+
+    assert kpis["total"] == 4
+    assert kpis["funnel"] == [("Received", 4, 100), ("Reviewed", 2, 50), ("Accepted", 1, 25)]
+    assert kpis["origin"] == [("Internal", 1, 25), ("External", 3, 75)]
+    assert '"data": [2, 1, 1]' in kpis["gender_chart"]
+    assert kpis["open_vacancies"]["pending"] == 2
+    assert kpis["open_vacancies"]["average_review_days"] == 1.5
+
+
+@pytest.mark.django_db
+def test_recruitment_index_shows_cached_kpis(applications, client):
+    user = User.objects.create_user(email="recruiter@example.com", first_name="Test", last_name="Recruiter")
+    user.groups.add(Group.objects.create(name="recruiter"))
+    applications.reviewers.add(user)
+    client.force_login(user)
+
+    response = client.get(reverse("Recruitment:index"))
+    assert response.status_code == 200
+    assert response.context["kpis"]["total"] == 4
+    assert b"Status funnel" in response.content
+    assert b'data-type="bar"' in response.content
+
+    Application.objects.filter(gender="").delete()
+    assert client.get(reverse("Recruitment:index")).context["kpis"]["total"] == 4
+
+
+@pytest.fixture
+def staff_content():
+    deadline = timezone.now() + timedelta(days=7)
+    Vacancy.objects.create(title="Internal Auditor", deadline=deadline, is_published=True)
+    Vacancy.objects.create(title="Software Engineer", deadline=deadline, is_published=True, is_public=True)
+    Announcement.objects.create(content="Staff braai on Friday", deadline=deadline, is_visible=True)
+
+
+@pytest.mark.django_db
+def test_staff_index_content_served_from_cache(staff_user, staff_content, client):
+    client.force_login(staff_user)
+    response = client.get(reverse("Staff:index"))
+    assert [vacancy.title for vacancy in response.context["vacancies"]] == ["Software Engineer", "Internal Auditor"]
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(reverse("Staff:index"))
+    assert b"Staff braai on Friday" in response.content
+    assert not [
+        query for query in queries if "recruitment_vacancy" in query["sql"] or "pages_announcement" in query["sql"]
+    ]
+
+
+@pytest.mark.django_db
+def test_staff_index_shows_internal_content_to_users_without_groups(staff_content, client):
+    user = User.objects.create_user(email="employee@example.com", first_name="Test", last_name="Employee")
+    client.force_login(user)
+
+    response = client.get(reverse("Staff:index"))
+    assert [vacancy.title for vacancy in response.context["vacancies"]] == ["Software Engineer", "Internal Auditor"]
+    assert b"Staff braai on Friday" in response.content
+
+
+@pytest.mark.django_db
+def test_staff_index_content_invalidated(staff_content):
+    assert len(get_staff_index_content()["vacancies"]) == 2
+    assert len(get_staff_index_content()["announcements"]) == 1
+
+    Vacancy.objects.filter(title="Internal Auditor").get().delete()
+    assert [vacancy.title for vacancy in get_staff_index_content()["vacancies"]] == ["Software Engineer"]
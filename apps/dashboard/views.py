@@ -1,6 +1,8 @@
 from allauth.account.views import LoginView
 from django.urls import reverse
 
+from apps.accounts.roles import has_role
+
 
 # Create your views here.
 class CustomLoginView(LoginView):
@@ -9,10 +11,10 @@ class CustomLoginView(LoginView):
     def get_success_url(self):
         user = self.request.user
 
-        if user.groups.filter(name="admin").exists():
+        if has_role(user, "admin"):
             return reverse("Admin:index")
 
-        if user.groups.filter(name="recruiter").exists():
+        if has_role(user, "recruiter"):
             return reverse("Recruitment:index")
 
         return None
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class PagesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.pages"
+
+    def ready(self):
+        """
+        Imports the signals module so that the homepage cache is invalidated
+        whenever the content it renders changes.
+        """
+        from . import signals  # noqa: F401
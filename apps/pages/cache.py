@@ -0,0 +1,58 @@
+import math
+
+from django.core.cache import cache
+from django.db.models import Min
+
+from apps.pages.models import Announcement
+from apps.recruitment.models import Vacancy
+
+INDEX_CACHE_KEY = "pages:index:{audience}"
+INDEX_CACHE_TIMEOUT = 60 * 15
+
+# Rendered into the cached page in place of the real CSRF token, which is swapped in per request.
+CSRF_TOKEN_PLACEHOLDER = "__csrf_token_placeholder__"
+
+
+def index_cache_key(is_intranet):
+    """
+    Returns the cache key of the rendered homepage for the given audience.
+
+    Args:
+        is_intranet (bool): Whether the request came from the intranet.
+
+    Returns:
+        str: The cache key.
+    """
+    return INDEX_CACHE_KEY.format(audience="intranet" if is_intranet else "public")
+
+
+def index_cache_timeout(now):
+    """
+    Returns how long the rendered homepage may be cached.
+
+    The page is only valid until the nearest vacancy or announcement deadline, after which
+    the expired entry has to drop off the page, so the timeout never reaches past it.
+
+    Args:
+        now (datetime): The time the page was rendered.
+
+    Returns:
+        int: The timeout in seconds.
+    """
+    deadlines = [
+        Vacancy.objects.filter(is_published=True, deadline__gt=now).aggregate(next=Min("deadline"))["next"],
+        Announcement.objects.filter(is_visible=True, is_external=True, deadline__gt=now).aggregate(
+            next=Min("deadline")
+        )["next"],
+    ]
+
+    timeout = INDEX_CACHE_TIMEOUT
+    for deadline in deadlines:
+        if deadline is not None:
+            timeout = min(timeout, math.ceil((deadline - now).total_seconds()))
+    return max(timeout, 1)
+
+
+def invalidate_index_cache():
+    """Removes the rendered homepage of every audience from the cache."""
+    cache.delete_many([index_cache_key(True), index_cache_key(False)])
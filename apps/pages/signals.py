@@ -0,0 +1,25 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from apps.recruitment.models import Vacancy
+
+from .cache import invalidate_index_cache
+from .models import FAQ, Announcement
+
+
+@receiver(post_save, sender=Vacancy)
+@receiver(post_delete, sender=Vacancy)
+@receiver(m2m_changed, sender=Vacancy.town.through)
+@receiver(post_save, sender=Announcement)
+@receiver(post_delete, sender=Announcement)
+@receiver(post_save, sender=FAQ)
+@receiver(post_delete, sender=FAQ)
+def invalidate_homepage(sender, **kwargs):
+    """
+    Drops the cached homepage whenever content shown on it changes.
+
+    Args:
+        sender: The model class that changed.
+        kwargs: Additional keyword arguments.
+    """
+    invalidate_index_cache()
@@ -1,6 +1,10 @@
+from datetime import timedelta
+
 import pytest
 from django.urls import reverse
+from django.utils import timezone
 
+from apps.pages.cache import index_cache_timeout
 from apps.recruitment.models import Vacancy
 
 
@@ -39,3 +43,38 @@ def test_footer_links(client):
         # Check for required links
         for link in required_links:
             assert link in content
+
+
+@pytest.mark.django_db
+def test_homepage_served_from_cache(client, django_assert_num_queries):
+    url = reverse("home")
+    client.get(url)
+
+    with django_assert_num_queries(0):
+        response = client.get(url)
+    assert response.status_code == 200
+    assert "Vacancies" in response.content.decode("utf-8")
+    assert "csrftoken" in response.cookies
+
+
+@pytest.mark.django_db
+def test_homepage_cache_invalidated_on_vacancy_save(client):
+    url = reverse("home")
+    client.get(url)
+
+    Vacancy.objects.create(
+        title="Cached Vacancy Engineer",
+        deadline=timezone.now() + timedelta(days=7),
+        is_public=True,
+        is_published=True,
+    )
+    response = client.get(url)
+    assert "Cached Vacancy Engineer" in response.content.decode("utf-8")
+
+
+@pytest.mark.django_db
+def test_homepage_cache_expires_at_nearest_deadline():
+    now = timezone.now()
+    Vacancy.objects.create(title="Closing Soon", deadline=now + timedelta(seconds=90), is_published=True)
+
+    assert index_cache_timeout(now) == 90
@@ -1,6 +1,16 @@
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
 from django.shortcuts import render
+from django.template.loader import render_to_string
 from django.utils import timezone
 
+from apps.accounts.roles import get_roles
+from apps.pages.cache import (
+    CSRF_TOKEN_PLACEHOLDER,
+    index_cache_key,
+    index_cache_timeout,
+)
 from apps.pages.models import FAQ, Announcement
 from apps.recruitment.models import Vacancy
 
@@ -8,18 +18,24 @@ from apps.recruitment.models import Vacancy
 def index(request):
     template_name = "pages/index.html"
 
+    # Anonymous visitors all see the same page, so it is served from the cache per audience
+    is_cacheable = request.method == "GET" and not request.user.is_authenticated
+    if is_cacheable:
+        cache_key = index_cache_key(request.is_intranet)
+        content = cache.get(cache_key)
+        if content is not None:
+            return HttpResponse(content.replace(CSRF_TOKEN_PLACEHOLDER, get_token(request)))
+
+    now = timezone.now()
     if request.is_intranet:
-        vacancies = Vacancy.objects.filter(is_published=True, deadline__gt=timezone.now()).order_by("-created_at")
+        vacancies = Vacancy.objects.filter(is_published=True, deadline__gt=now)
     else:
-        vacancies = Vacancy.objects.filter(is_public=True, is_published=True, deadline__gt=timezone.now()).order_by(
-            "-created_at"
-        )
-    announcements = Announcement.objects.filter(deadline__gt=timezone.now(), is_visible=True, is_external=True)
+        vacancies = Vacancy.objects.filter(is_public=True, is_published=True, deadline__gt=now)
+    vacancies = vacancies.select_related("vacancy_type").order_by("-created_at")
+    announcements = Announcement.objects.filter(deadline__gt=now, is_visible=True, is_external=True)
     faqs = FAQ.objects.filter(is_visible=True)
 
-    user_groups = []
-    if request.user.is_authenticated:
-        user_groups = [group.name for group in request.user.groups.all()]
+    user_groups = sorted(get_roles(request.user))
 
     context = {
         "vacancies": vacancies,
@@ -27,6 +43,13 @@ def index(request):
         "faqs": faqs,
         "user_groups": user_groups,
     }
+
+    if is_cacheable:
+        context["csrf_token"] = CSRF_TOKEN_PLACEHOLDER
+        content = render_to_string(template_name, context, request)
+        cache.set(cache_key, content, index_cache_timeout(now))
+        return HttpResponse(content.replace(CSRF_TOKEN_PLACEHOLDER, get_token(request)))
+
     return render(request, template_name, context)
 
 
@@ -1,7 +1,18 @@
+import os
+import uuid
+from urllib.parse import urlencode
+
 from django.contrib import admin
+from django.contrib.admin.views.main import ORDER_VAR
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
-from django.db.models import Case, IntegerField, Value, When
+from django.core.exceptions import PermissionDenied
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.http import FileResponse, Http404, QueryDict
+from django.shortcuts import get_object_or_404, redirect
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
 from django.utils import timezone
 from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
@@ -10,7 +21,10 @@ from unfold.admin import ModelAdmin, StackedInline, TabularInline
 from unfold.contrib.filters.admin import RangeDateFilter
 from unfold.contrib.import_export.forms import SelectableFieldsExportForm
 
+from apps.accounts.roles import is_admin
+
 from .forms import (
+    ApplicationBackgroundExportForm,
     ApplicationExportForm, # Added this import
     ApplicationReviewForm,
     InterviewForm,
@@ -20,6 +34,7 @@ from .forms import (
 )
 from .models import (
     Application,
+    ApplicationExport,
     Interview,
     Location,
     MinimumRequirement,
@@ -28,6 +43,9 @@ from .models import (
     Vacancy,
     VacancyType,
 )
+from .search import search_applications
+from .summary import get_application_years
+from .tasks import export_applications_task
 
 User = get_user_model()
 
@@ -82,6 +100,9 @@ class VacancyAdmin(ModelAdmin):
         "vacancy_type",
         "is_public",
         "is_published",
+        "applications_count",
+        "awaiting_review_count",
+        "interviews_count",
     ]
     list_filter = [
         "title",
@@ -92,15 +113,38 @@ class VacancyAdmin(ModelAdmin):
     inlines = [MinimumRequirementsAddInline]
 
     def get_queryset(self, request):
-        qs = super().get_queryset(request)
+        # The pipeline counters are joined in, so the count columns cost no extra queries
+        qs = super().get_queryset(request).select_related("pipeline", "vacancy_type")
 
         # Allow superusers and admins to see all vacancies
-        if request.user.is_superuser or request.user.groups.filter(name="admin").exists():
+        if is_admin(request.user):
             return qs
 
         # Filter vacancies where the user is a reviewer
         return qs.filter(reviewers=request.user)
 
+    def get_pipeline_count(self, obj, field):
+        pipeline = getattr(obj, "pipeline", None)
+        return getattr(pipeline, field, 0)
+
+    def applications_count(self, obj):
+        return self.get_pipeline_count(obj, "applications")
+
+    applications_count.short_description = "Applications"
+    applications_count.admin_order_field = "pipeline__applications"
+
+    def awaiting_review_count(self, obj):
+        return self.get_pipeline_count(obj, "submitted")
+
+    awaiting_review_count.short_description = "Awaiting review"
+    awaiting_review_count.admin_order_field = "pipeline__submitted"
+
+    def interviews_count(self, obj):
+        return self.get_pipeline_count(obj, "interviews")
+
+    interviews_count.short_description = "Interviews"
+    interviews_count.admin_order_field = "pipeline__interviews"
+
     def has_view_permission(self, request, obj=None):
         if obj is None:
             return True
@@ -109,10 +153,10 @@ class VacancyAdmin(ModelAdmin):
     def has_change_permission(self, request, obj=None):
         if obj is None:
             return True
-        return request.user.is_superuser or request.user.groups.filter(name="admin").exists()
+        return is_admin(request.user)
 
     def has_delete_permission(self, request, obj=None):
-        if request.user.is_superuser or request.user.groups.filter(name="admin").exists():
+        if is_admin(request.user):
             return True
         return False
 
@@ -149,35 +193,120 @@ class ApplicantResponseInline(TabularInline):
         return False
 
 
+def get_reviewable_vacancies(user):
+    """Returns the vacancies the user may filter by: all of them for admins, otherwise those they review."""
+    if is_admin(user):
+        return Vacancy.objects.all()
+    return Vacancy.objects.filter(reviewers=user)
+
+
 class VacancyFilter(admin.SimpleListFilter):
+    """
+    Filters by vacancy without loading every vacancy into the changelist.
+
+    Only the selected vacancy is looked up when the changelist renders. The options are
+    searched and paged by the admin's `vacancy_options_view`, fetched over HTMX as the user
+    types in the filter.
+    """
+
     title = _("Vacancy")  # Filter title in admin panel
     parameter_name = "vacancy"  # URL query parameter name
+    field_path = "vacancy"
+    template = "admin/recruitment/filters/vacancy_filter.html"
+
+    def __init__(self, request, params, model, model_admin):
+        super().__init__(request, params, model, model_admin)
+        opts = model_admin.opts
+        self.options_url = reverse(
+            f"{model_admin.admin_site.name}:{opts.app_label}_{opts.model_name}_vacancy_options"
+        )
 
-    def lookups(self, request, model_admin):
-        """Return a list of (value, label) tuples for the filter choices."""
-        if request.user.is_superuser or request.user.groups.filter(name="admin"):
-            vacancies = Vacancy.objects.all()  # Superusers & admins see all vacancies
-        else:
-            vacancies = Vacancy.objects.filter(reviewers=request.user).distinct()  # Restricted for normal users
+    def has_output(self):
+        return True
 
-        return [(str(vac.id), vac.title) for vac in vacancies]
+    def lookups(self, request, model_admin):
+        """Return the selected vacancy as the only (value, label) choice."""
+        try:
+            vacancy_id = uuid.UUID(self.value())
+        except (TypeError, ValueError):
+            return []
+
+        vacancy = get_reviewable_vacancies(request.user).filter(id=vacancy_id).only("id", "title").first()
+        return [(str(vacancy.id), vacancy.title)] if vacancy else []
+
+    def choices(self, changelist):
+        query_string = changelist.get_query_string(remove=[self.parameter_name])
+        yield {
+            "selected": self.lookup_choices[0] if self.lookup_choices else None,
+            "clear_query_string": query_string,
+            "options_url": f"{self.options_url}?{urlencode({'query': query_string})}",
+        }
 
     def queryset(self, request, queryset):
         """Filter the queryset based on selected vacancy."""
-        if self.value():
-            return queryset.filter(vacancy__id=self.value())
+        if self.lookup_choices:
+            return queryset.filter(**{f"{self.field_path}__id": self.lookup_choices[0][0]})
         return queryset
 
 
+class InterviewVacancyFilter(VacancyFilter):
+    field_path = "application__vacancy"
+
+
+class VacancyFilterMixin:
+    """Serves the searchable, paginated options of the `VacancyFilter` of a model admin."""
+
+    vacancy_options_per_page = 20
+
+    def get_urls(self):
+        info = self.opts.app_label, self.opts.model_name
+        return [
+            path(
+                "vacancy-options/",
+                self.admin_site.admin_view(self.vacancy_options_view),
+                name="%s_%s_vacancy_options" % info,
+            ),
+        ] + super().get_urls()
+
+    def vacancy_options_view(self, request):
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+
+        vacancies = get_reviewable_vacancies(request.user).only("id", "title")
+        term = request.GET.get("term", "").strip()
+        if term:
+            vacancies = vacancies.filter(title__icontains=term)
+        page = Paginator(vacancies.order_by("-deadline", "id"), self.vacancy_options_per_page).get_page(
+            request.GET.get("page")
+        )
+
+        query = QueryDict(request.GET.get("query", "").lstrip("?"), mutable=True)
+        query.pop("p", None)
+        options = []
+        for vacancy in page:
+            query[VacancyFilter.parameter_name] = str(vacancy.id)
+            options.append((vacancy, f"?{query.urlencode()}"))
+
+        next_url = None
+        if page.has_next():
+            params = request.GET.copy()
+            params["page"] = page.next_page_number()
+            next_url = f"{request.path}?{params.urlencode()}"
+
+        return TemplateResponse(
+            request,
+            "admin/recruitment/filters/vacancy_options.html",
+            {"options": options, "page": page, "next_url": next_url},
+        )
+
+
 class ApplicationYearFilter(admin.SimpleListFilter):
     title = _('Year')
     parameter_name = 'application_year'
 
     def lookups(self, request, model_admin):
-        # Get distinct years from submitted_at field
-        years = Application.objects.all().dates('submitted_at', 'year')
-        unique_years = sorted(list(set([year.year for year in years])), reverse=True)
-        return [(str(year), str(year)) for year in unique_years]
+        # Years with applications, read from the maintained year summary
+        return [(str(year), str(year)) for year in get_application_years()]
 
     def queryset(self, request, queryset):
         if self.value():
@@ -186,10 +315,11 @@ class ApplicationYearFilter(admin.SimpleListFilter):
 
 
 @admin.register(Application)
-class ApplicationAdmin(ModelAdmin, ExportActionModelAdmin):
+class ApplicationAdmin(VacancyFilterMixin, ModelAdmin, ExportActionModelAdmin):
     model = Application
     export_form_class = ApplicationExportForm # Changed to custom form
     change_form_template = 'admin/recruitment/application/change_form.html'
+    import_export_change_list_template = 'admin/recruitment/application/change_list.html'
 
     readonly_fields = [
         "first_name",
@@ -218,7 +348,9 @@ class ApplicationAdmin(ModelAdmin, ExportActionModelAdmin):
         "submitted_at",
     ]
     list_filter = (VacancyFilter, ApplicationYearFilter, "status", "submitted_at")
+    # Searched through the indexed search documents, see get_search_results
     search_fields = ("first_name", "last_name", "email")
+    search_help_text = _("Search by name, email, phone number or vacancy")
     inlines = [ApplicantResponseInline]
 
     def reviewers_list(self, obj):
@@ -230,50 +362,125 @@ class ApplicationAdmin(ModelAdmin, ExportActionModelAdmin):
     def get_queryset(self, request):
         qs = super().get_queryset(request)
 
+        # "submitted" > "rejected" > "accepted" alphabetically, so ordering by descending status lists
+        # submitted applications first and can be served by the (status, submitted_at) index
+        qs = qs.order_by("-status", "-submitted_at")
+
         # Allow superusers and users in the "admin" group to see all applications
-        if request.user.is_superuser or request.user.groups.filter(name="admin").exists():
-            return qs.annotate(
-                status_order=Case(
-                    When(status="submitted", then=Value(0)),
-                    When(status="rejected", then=Value(1)),
-                    When(status="accepted", then=Value(2)),
-                    default=Value(3),
-                    output_field=IntegerField(),
-                )
-            ).order_by("status_order", "-submitted_at")
+        if is_admin(request.user):
+            return qs
 
         # Restrict access to only applications related to vacancies the user can review
         vacancies_user_can_review = Vacancy.objects.filter(reviewers=request.user)
-        return (
-            qs.filter(vacancy__in=vacancies_user_can_review)
-            .annotate(
-                status_order=Case(
-                    When(status="submitted", then=Value(0)),
-                    When(status="rejected", then=Value(1)),
-                    When(status="accepted", then=Value(2)),
-                    default=Value(3),
-                    output_field=IntegerField(),
-                )
-            )
-            .order_by("status_order", "-submitted_at")
-        )
+        return qs.filter(vacancy__in=vacancies_user_can_review)
 
     def has_view_permission(self, request, obj=None):
         if obj is None:
             return True
         return request.user.is_superuser or request.user in obj.vacancy.reviewers.all()
 
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Searches the indexed application search documents instead of scanning the
+        `search_fields`. Serves both the changelist and the application autocomplete of
+        InterviewAdmin, ranking the results unless a changelist column was sorted.
+        """
+        if not search_term:
+            return queryset, False
+        queryset = search_applications(queryset, search_term)
+        if ORDER_VAR not in request.GET:
+            queryset = queryset.order_by("-search_rank", "-pk")
+        return queryset, False
+
+    def get_urls(self):
+        info = self.opts.app_label, self.opts.model_name
+        return [
+            path(
+                "background-export/",
+                self.admin_site.admin_view(self.background_export_view),
+                name="%s_%s_background_export" % info,
+            ),
+            path(
+                "background-export/<uuid:pk>/",
+                self.admin_site.admin_view(self.background_export_status_view),
+                name="%s_%s_background_export_status" % info,
+            ),
+            path(
+                "background-export/<uuid:pk>/download/",
+                self.admin_site.admin_view(self.background_export_download_view),
+                name="%s_%s_background_export_download" % info,
+            ),
+        ] + super().get_urls()
+
+    def get_background_export(self, request, pk):
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        return get_object_or_404(ApplicationExport, pk=pk, requested_by=request.user)
+
+    def background_export_view(self, request):
+        """
+        Starts an export that a Celery worker writes to disk, for exports too large to
+        build within a request.
+        """
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+
+        form = ApplicationBackgroundExportForm(request.POST or None)
+        if request.method == "POST" and form.is_valid():
+            export = ApplicationExport.objects.create(requested_by=request.user, **form.cleaned_data)
+            transaction.on_commit(lambda: export_applications_task.delay(str(export.pk)))
+            info = self.admin_site.name, self.opts.app_label, self.opts.model_name
+            return redirect("%s:%s_%s_background_export_status" % info, export.pk)
+
+        return TemplateResponse(
+            request,
+            "admin/recruitment/application/background_export.html",
+            {
+                **self.admin_site.each_context(request),
+                "opts": self.opts,
+                "title": _("Background export"),
+                "form": form,
+                "exports": request.user.application_exports.all()[:10],
+            },
+        )
+
+    def background_export_status_view(self, request, pk):
+        """
+        Shows the progress of an export. HTMX polls the same URL for the status fragment
+        until the export has finished.
+        """
+        export = self.get_background_export(request, pk)
+        if request.headers.get("HX-Request"):
+            template = "admin/recruitment/application/background_export_status.html"
+        else:
+            template = "admin/recruitment/application/background_export_detail.html"
+        return TemplateResponse(
+            request,
+            template,
+            {
+                **self.admin_site.each_context(request),
+                "opts": self.opts,
+                "title": _("Background export"),
+                "export": export,
+            },
+        )
+
+    def background_export_download_view(self, request, pk):
+        export = self.get_background_export(request, pk)
+        if export.status != ApplicationExport.STATUS.DONE or not export.file:
+            raise Http404("The export is not ready.")
+        return FileResponse(export.file.open("rb"), as_attachment=True, filename=os.path.basename(export.file.name))
+
     def has_change_permission(self, request, obj=None):
         if obj is None:
             return True
         return (
-            request.user.is_superuser
-            or request.user.groups.filter(name="admin").exists()
+            is_admin(request.user)
             or request.user in obj.vacancy.reviewers.all()
         )
 
     def has_delete_permission(self, request, obj=None):
-        if request.user.is_superuser or request.user.groups.filter(name="admin").exists():
+        if is_admin(request.user):
             return True
         return False
 
@@ -343,12 +550,12 @@ admin.site.register(Location, ModelAdmin)
 
 
 @admin.register(Interview)
-class InterviewAdmin(ModelAdmin, ExportActionModelAdmin):
+class InterviewAdmin(VacancyFilterMixin, ModelAdmin, ExportActionModelAdmin):
     form = InterviewForm
     export_form_class = SelectableFieldsExportForm
     # readonly_fields = ["application"]
     list_display = ["application", "status", "schedule_datetime"]
-    list_filter = ["status", ("schedule_datetime", RangeDateFilter)]
+    list_filter = [InterviewVacancyFilter, "status", ("schedule_datetime", RangeDateFilter)]
     list_filter_submit = True
     autocomplete_fields = ("application",)
 
@@ -363,7 +570,7 @@ class InterviewAdmin(ModelAdmin, ExportActionModelAdmin):
 
     def get_queryset(self, request):
         qs = super().get_queryset(request)
-        if request.user.is_superuser or request.user.groups.filter(name="admin").exists():
+        if is_admin(request.user):
             return qs
 
         return qs.filter(application__vacancy__reviewers=request.user)
@@ -374,7 +581,7 @@ class InterviewAdmin(ModelAdmin, ExportActionModelAdmin):
         return request.user.is_superuser or obj.application.vacancy.reviewers.filter(id=request.user.id).exists()
 
     def has_add_permission(self, request):
-        if request.user.is_superuser or request.user.groups.filter(name="admin").exists():
+        if is_admin(request.user):
             return True
 
         # Check if the user is a reviewer for any vacancy
@@ -387,7 +594,7 @@ class InterviewAdmin(ModelAdmin, ExportActionModelAdmin):
         return request.user.is_superuser or request.user in obj.vacancy.reviewers.all()
 
     def has_delete_permission(self, request, obj=None):
-        if request.user.is_superuser or request.user.groups.filter(name="admin").exists():
+        if is_admin(request.user):
             return True
         return False
 
@@ -7,4 +7,8 @@ class RecruitmentConfig(AppConfig):
     label = "recruitment"
 
     def ready(self):
-        pass
+        """
+        Imports the modules holding cache invalidation, summary, counter and migration receivers
+        so they are connected when the app is loaded.
+        """
+        from . import pipeline, schema, search, summary  # noqa: F401
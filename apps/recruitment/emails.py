@@ -1,15 +1,22 @@
-from django.core.mail import EmailMessage
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Q
 from django.urls import reverse
-from jinja2 import Environment, FileSystemLoader
+from django.utils import timezone
+
+from .models import EmailNotification
+from .templating import email_templates
 
-env = Environment(loader=FileSystemLoader("templates/emails/"))
 email = "training@telecom.na"
 message = None
 
 
-def send_email_notification(subject, template_name, instance, recipient_name, recipient_list):
+def build_email_message(subject, template_name, instance, recipient_name, recipient_list, **context):
     """
-    Sends an email notification with the provided subject, template, and recipient details.
+    Renders an email template into an HTML email message.
 
     Args:
         subject (str): The subject of the email.
@@ -17,94 +24,256 @@ def send_email_notification(subject, template_name, instance, recipient_name, re
         instance (object): The object instance to be passed to the template for rendering.
         recipient_name (str): The name of the email recipient.
         recipient_list (list): A list of email addresses to send the notification to.
+        context: Additional template context.
+
+    Returns:
+        EmailMessage: The rendered email message, not yet sent.
     """
-    from_email = email
-    template = env.get_template(template_name)
-    message = template.render(instance=instance, recipient_name=recipient_name)
+    message = email_templates.render(template_name, instance=instance, recipient_name=recipient_name, **context)
 
     send_email = EmailMessage(
         subject=subject,
         body=message,
-        from_email=from_email,
+        from_email=email,
         to=recipient_list,
     )
     send_email.content_subtype = "html"
-    send_email.send()
+    return send_email
 
 
-def send_vacancy_application_notification_email(instance, created):
+def render_many(template_name, instances, **context):
     """
-    Sends a vacancy application status notification email based on the application's status.
+    Renders the bodies of an email for many applications, e.g. for a broadcast.
 
     Args:
-        instance (object): The application instance to be used for rendering the email.
-        created (bool): A flag indicating whether the application was just created or updated.
+        template_name (str): The name of the email template to be used.
+        instances (iterable): The Application instances to render the email for.
+        context: Additional template context shared by every body.
+
+    Returns:
+        list: The rendered bodies, in the order of the instances.
+    """
+    return email_templates.render_many(
+        template_name,
+        ({"instance": instance, "recipient_name": get_recipient_name(instance), **context} for instance in instances),
+    )
+
+
+def get_recipient_name(application):
+    first_name = getattr(application, "first_name", None)
+    last_name = getattr(application, "last_name", None)
+    return f"{first_name} {last_name}" if first_name and last_name else "Applicant"
+
+
+def get_invitation_url(interview):
+    invitation_link = reverse("recruitment:interview_invitation", kwargs={"pk": interview.pk}).lstrip("/")
+    return f"http://training.telecom.na/{invitation_link}"
+
+
+def get_vacancy_application_notification(instance, created):
     """
-    first_name = getattr(instance, "first_name", None)
-    last_name = getattr(instance, "last_name", None)
-    recipient_list = [instance.email]
+    Picks the subject and template of the notification for an application status.
 
-    recipient_name = f"{first_name} {last_name}" if first_name and last_name else "Applicant"
+    Args:
+        instance (Application): The application the notification is about.
+        created (bool): A flag indicating whether the application was just created or updated.
 
+    Returns:
+        tuple: The subject and template name, or None if no email should be sent.
+    """
     if created and instance.status == "submitted":
-        send_email_notification(
-            subject="Application Submitted",
-            template_name="submitted.html",
-            instance=instance,
-            recipient_name=recipient_name,
-            recipient_list=recipient_list,
-        )
-    elif not created and instance.status == "accepted":
-        send_email_notification(
-            subject="Application Accepted",
-            template_name="accepted.html",
-            instance=instance,
-            recipient_name=recipient_name,
-            recipient_list=recipient_list,
-        )
-    elif not created and instance.status == "rejected":
-        send_email_notification(
-            subject="Application Rejected",
-            template_name="rejected.html",
-            instance=instance,
-            recipient_name=recipient_name,
-            recipient_list=recipient_list,
-        )
+        return "Application Submitted", "submitted.html"
+    if not created and instance.status == "accepted":
+        return "Application Accepted", "accepted.html"
+    if not created and instance.status == "rejected":
+        return "Application Rejected", "rejected.html"
+    return None
+
+
+# **********************************************************************************************
+#                                       BATCHED DISPATCH
+# **********************************************************************************************
+def queue_vacancy_application_notification_email(instance, created):
+    """
+    Adds the application status notification to the outbox instead of sending it right away.
+
+    Args:
+        instance (Application): The application the notification is about.
+        created (bool): A flag indicating whether the application was just created or updated.
+
+    Returns:
+        EmailNotification: The queued notification, or None if no email should be sent.
+    """
+    notification = get_vacancy_application_notification(instance, created)
+    if notification is None:
+        return None
 
+    subject, template_name = notification
+    return EmailNotification.objects.create(
+        subject=subject,
+        template_name=template_name,
+        recipient=instance.email,
+        recipient_name=get_recipient_name(instance),
+        application=instance,
+    )
 
-def send_interview_notification_email(instance, created):
+
+def queue_interview_notification_email(instance, created):
     """
-    Sends an email notification for an interview invitation if the interview is scheduled.
+    Adds the interview invitation to the outbox instead of sending it right away.
 
     Args:
-        instance (object): The interview instance to be used for rendering the email.
+        instance (Interview): The interview the invitation is for.
         created (bool): A flag indicating whether the interview was just created or updated.
+
+    Returns:
+        EmailNotification: The queued notification, or None if no email should be sent.
     """
-    subject = f"{instance.application.vacancy} Application Interview"
-    from_email = email
+    if created or instance.status != "scheduled":
+        return None
 
-    first_name = getattr(instance.application, "first_name", None)
-    last_name = getattr(instance.application, "last_name", None)
-    recipient_list = [instance.application.email]
+    return EmailNotification.objects.create(
+        subject=f"{instance.application.vacancy} Application Interview",
+        template_name="interview.html",
+        recipient=instance.application.email,
+        recipient_name=get_recipient_name(instance.application),
+        interview=instance,
+    )
+
+
+def queue_no_response_notification_emails(interviews):
+    """
+    Adds a notification for each interview whose response deadline passed to the outbox.
+
+    Args:
+        interviews (iterable): The Interview instances, with their applications loaded.
+
+    Returns:
+        list: The queued notifications.
+    """
+    return EmailNotification.objects.bulk_create(
+        [
+            EmailNotification(
+                subject=f"{interview.application.vacancy} Interview Invitation Expired",
+                template_name="no_response.html",
+                recipient=interview.application.email,
+                recipient_name=get_recipient_name(interview.application),
+                interview=interview,
+            )
+            for interview in interviews
+        ]
+    )
+
+
+def render_email_notification(notification):
+    """
+    Renders a queued notification into an email message.
+
+    Args:
+        notification (EmailNotification): The queued notification.
+
+    Returns:
+        EmailMessage: The rendered email message, not yet sent.
+    """
+    context = {}
+    instance = notification.application
+    if notification.interview is not None:
+        instance = notification.interview
+        context["invitation_url"] = get_invitation_url(instance)
 
-    recipient_name = f"{first_name} {last_name}" if first_name and last_name else "Applicant"
+    return build_email_message(
+        subject=notification.subject,
+        template_name=notification.template_name,
+        instance=instance,
+        recipient_name=notification.recipient_name,
+        recipient_list=[notification.recipient],
+        **context,
+    )
 
-    if not created and instance.status == "scheduled":
-        invitation_link = reverse("recruitment:interview_invitation", kwargs={"pk": instance.pk}).lstrip("/")
-        invitation_url = f"http://training.telecom.na/{invitation_link}"
 
-        template = env.get_template("interview.html")
+def claim_email_notifications(batch_size):
+    """
+    Marks up to `batch_size` pending notifications as being sent and returns their IDs.
 
-        message = template.render(
-            instance=instance,
-            recipient_name=recipient_name,
-            invitation_url=invitation_url,
+    Rows locked by another worker are skipped, so concurrent dispatchers never send the
+    same notification twice. Notifications claimed more than `EMAIL_CLAIM_LEASE` seconds
+    ago are claimed again, as the worker that claimed them was stopped before it finished.
+    """
+    now = timezone.now()
+    expired = now - timedelta(seconds=settings.EMAIL_CLAIM_LEASE)
+    with transaction.atomic():
+        ids = list(
+            EmailNotification.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=EmailNotification.STATUS.PENDING)
+                | Q(status=EmailNotification.STATUS.SENDING, claimed_at__lt=expired)
+            )
+            .order_by("created_at")
+            .values_list("id", flat=True)[:batch_size]
         )
-        send_email = EmailMessage(
-            subject=subject,
-            body=message,
-            from_email=from_email,
-            to=recipient_list,
+        EmailNotification.objects.filter(id__in=ids).update(status=EmailNotification.STATUS.SENDING, claimed_at=now)
+    return ids
+
+
+def dispatch_email_notifications(batch_size=None, connection=None):
+    """
+    Sends a batch of queued notifications over a single mail server connection.
+
+    Each message is sent on its own within the shared connection, so one rejected message
+    does not fail the batch. Failed messages go back to the outbox to be retried until they
+    reach `EMAIL_MAX_ATTEMPTS`. If the connection itself cannot be opened the whole batch is
+    returned to the outbox and the error is raised for the caller to retry.
+
+    Args:
+        batch_size (int, optional): The maximum number of notifications to send, defaults to
+            `EMAIL_BATCH_SIZE`.
+        connection (optional): The email backend to send with, defaults to `get_connection()`.
+
+    Returns:
+        tuple: The number of notifications sent and failed.
+    """
+    ids = claim_email_notifications(batch_size or settings.EMAIL_BATCH_SIZE)
+    if not ids:
+        return 0, 0
+
+    notifications = list(
+        EmailNotification.objects.filter(id__in=ids)
+        .select_related(
+            "application__vacancy",
+            "interview__location",
+            "interview__application__vacancy",
         )
-        send_email.content_subtype = "html"
-        send_email.send()
+        .order_by("created_at")
+    )
+
+    connection = connection or get_connection()
+    try:
+        connection.open()
+    except Exception:
+        EmailNotification.objects.filter(id__in=ids).update(status=EmailNotification.STATUS.PENDING)
+        raise
+
+    sent, failed = [], []
+    try:
+        for notification in notifications:
+            try:
+                message = render_email_notification(notification)
+                message.connection = connection
+                message.send()
+            except Exception as ex:
+                notification.attempts += 1
+                notification.last_error = str(ex)
+                if notification.attempts >= settings.EMAIL_MAX_ATTEMPTS:
+                    notification.status = EmailNotification.STATUS.FAILED
+                else:
+                    notification.status = EmailNotification.STATUS.PENDING
+                failed.append(notification)
+            else:
+                notification.status = EmailNotification.STATUS.SENT
+                notification.sent_at = timezone.now()
+                sent.append(notification)
+    finally:
+        connection.close()
+        EmailNotification.objects.bulk_update(sent + failed, ["status", "attempts", "last_error", "sent_at"])
+
+    return len(sent), len(failed)
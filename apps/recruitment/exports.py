@@ -0,0 +1,143 @@
+import csv
+import datetime
+import logging
+import os
+
+from django.conf import settings
+from django.utils import timezone
+
+from apps.accounts.roles import is_admin
+
+from .models import Application, ApplicationExport
+
+logger = logging.getLogger(__name__)
+
+# (header, lookup) of every exported column, read with values_list so no model is built per row
+EXPORT_COLUMNS = [
+    ("Vacancy", "vacancy__title"),
+    ("First name", "first_name"),
+    ("Middle name", "middle_name"),
+    ("Last name", "last_name"),
+    ("Email", "email"),
+    ("Primary contact", "primary_contact"),
+    ("Secondary contact", "secondary_contact"),
+    ("Date of birth", "date_of_birth"),
+    ("Gender", "gender"),
+    ("Status", "status"),
+    ("Internal", "is_internal"),
+    ("Submitted at", "submitted_at"),
+    ("Reviewed at", "reviewed_at"),
+    ("Review comments", "review_comments"),
+]
+
+
+def get_export_queryset(export):
+    """
+    Returns the applications an export covers, limited to what the requester may review.
+
+    Args:
+        export (ApplicationExport): The export.
+
+    Returns:
+        QuerySet: The applications, in submission order.
+    """
+    queryset = Application.objects.all()
+    if not is_admin(export.requested_by):
+        queryset = queryset.filter(vacancy__reviewers=export.requested_by)
+    if export.year:
+        queryset = queryset.filter(submitted_at__year=export.year)
+    return queryset.order_by("submitted_at", "id")
+
+
+def format_value(value):
+    if isinstance(value, datetime.datetime):
+        # Spreadsheets have no time zones, so datetimes are written in local time
+        return timezone.localtime(value).replace(tzinfo=None) if timezone.is_aware(value) else value
+    if value is None or isinstance(value, (str, int, float, bool, datetime.date)):
+        return value
+    return str(value)
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow([header for header, _ in EXPORT_COLUMNS])
+        for row in rows:
+            writer.writerow(row)
+
+
+def write_xlsx(path, rows):
+    # openpyxl is only needed for XLSX exports
+    from openpyxl import Workbook
+
+    # A write-only workbook streams rows to disk instead of keeping the sheet in memory
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Applications")
+    sheet.append([header for header, _ in EXPORT_COLUMNS])
+    for row in rows:
+        sheet.append(row)
+    workbook.save(path)
+
+
+WRITERS = {
+    ApplicationExport.FORMAT.CSV: write_csv,
+    ApplicationExport.FORMAT.XLSX: write_xlsx,
+}
+
+
+def run_application_export(export_id):
+    """
+    Writes an export to disk, streaming the rows from a chunked cursor.
+
+    At most `EXPORT_CHUNK_SIZE` rows are held in memory at a time, and the progress is saved
+    after every chunk. The file is written under a temporary name and only moved into place
+    once complete.
+
+    Args:
+        export_id (UUID): The ID of the export.
+
+    Returns:
+        ApplicationExport: The finished export.
+    """
+    export = ApplicationExport.objects.select_related("requested_by").get(pk=export_id)
+    queryset = get_export_queryset(export)
+    chunk_size = settings.EXPORT_CHUNK_SIZE
+
+    export.status = ApplicationExport.STATUS.RUNNING
+    export.rows_total = queryset.count()
+    export.rows_done = 0
+    export.save(update_fields=["status", "rows_total", "rows_done"])
+
+    def rows():
+        lookups = [lookup for _, lookup in EXPORT_COLUMNS]
+        for count, row in enumerate(queryset.values_list(*lookups).iterator(chunk_size=chunk_size), 1):
+            yield [format_value(value) for value in row]
+            if count % chunk_size == 0:
+                ApplicationExport.objects.filter(pk=export.pk).update(rows_done=count)
+
+    storage = export.file.storage
+    name = storage.generate_filename(
+        export.file.field.generate_filename(
+            export, f"applications-{export.year or 'all'}-{timezone.localdate():%Y%m%d}.{export.file_format}"
+        )
+    )
+    name = storage.get_available_name(name)
+    path = storage.path(name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    try:
+        WRITERS[export.file_format](f"{path}.part", rows())
+        os.replace(f"{path}.part", path)
+    except Exception as ex:
+        logger.exception("Application export %s failed", export.pk)
+        if os.path.exists(f"{path}.part"):
+            os.remove(f"{path}.part")
+        export.status = ApplicationExport.STATUS.FAILED
+        export.error = str(ex)
+    else:
+        export.file.name = name
+        export.status = ApplicationExport.STATUS.DONE
+        export.rows_done = export.rows_total
+    export.finished_at = timezone.now()
+    export.save(update_fields=["file", "status", "rows_done", "error", "finished_at"])
+    return export
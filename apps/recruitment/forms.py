@@ -3,20 +3,26 @@ from datetime import date, timedelta
 from django import forms
 from django.contrib import messages
 from django.utils import timezone
-from phonenumber_field.formfields import PhoneNumberField
 from tinymce.widgets import TinyMCE
 from unfold.widgets import UnfoldAdminSelectWidget
 from import_export.forms import SelectableFieldsExportForm # Added this import
 
+from apps.utils.phone import PhoneNumberFormField
 
 from .models import (
     Application,
+    ApplicationExport,
+    CVUpload,
     Interview,
     MinimumRequirement,
     MinimumRequirementAnswer,
     SelectQuestionTypeOptions,
     Vacancy,
 )
+from .schema import get_requirement_schema
+from .summary import get_application_years
+from .uploads import open_cv_upload
+from .validation import DUPLICATE_APPLICATION_MESSAGE, has_applied
 
 
 class ApplicationExportForm(SelectableFieldsExportForm):
@@ -29,10 +35,30 @@ class ApplicationExportForm(SelectableFieldsExportForm):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        # Populate year choices dynamically
-        years = Application.objects.all().dates('submitted_at', 'year')
-        unique_years = sorted(list(set([year.year for year in years])), reverse=True)
-        self.fields['year'].choices = [('', 'All Years')] + [(str(year), str(year)) for year in unique_years]
+        # Populate year choices from the maintained year summary
+        years = get_application_years()
+        self.fields['year'].choices = [('', 'All Years')] + [(str(year), str(year)) for year in years]
+
+
+class ApplicationBackgroundExportForm(forms.Form):
+    file_format = forms.ChoiceField(
+        choices=ApplicationExport.FORMAT.choices,
+        label="Format",
+        widget=UnfoldAdminSelectWidget,
+    )
+    year = forms.TypedChoiceField(
+        choices=[],
+        coerce=int,
+        empty_value=None,
+        required=False,
+        label="Filter by Year",
+        widget=UnfoldAdminSelectWidget,
+        help_text="Select a year to export applications from that year.",
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["year"].choices = [("", "All Years")] + [(year, str(year)) for year in get_application_years()]
 
 
 # **********************************************************************************************
@@ -77,8 +103,8 @@ class ApplicationReviewForm(forms.ModelForm):
 
 
 class ApplicationContactForm(forms.ModelForm):
-    primary_contact = PhoneNumberField(region="NA")
-    secondary_contact = PhoneNumberField(region="NA", required=False)
+    primary_contact = PhoneNumberFormField(region="NA")
+    secondary_contact = PhoneNumberFormField(region="NA", required=False)
 
     class Meta:
         model = Application
@@ -91,9 +117,11 @@ class ApplicationForm(forms.ModelForm):
     #     private_key=env("RECAPTCHA_V2_PRIVATE_KEY"),
     #     widget=ReCaptchaV2Invisible,
     # )
-    primary_contact = PhoneNumberField(region="NA")
-    secondary_contact = PhoneNumberField(region="NA", required=False)
+    primary_contact = PhoneNumberFormField(region="NA")
+    secondary_contact = PhoneNumberFormField(region="NA", required=False)
     date_of_birth = forms.DateField(widget=forms.DateInput())
+    # The token of a CV uploaded in chunks beforehand, sent instead of the file itself
+    cv_upload = forms.UUIDField(required=False, widget=forms.HiddenInput())
 
     class Meta:
         model = Application
@@ -111,46 +139,52 @@ class ApplicationForm(forms.ModelForm):
 
     def __init__(self, vacancy, *args, **kwargs):
         self.vacancy = vacancy
-        self.requirements = MinimumRequirement.objects.filter(vacancy=vacancy)
+        self.requirements = get_requirement_schema(vacancy)
         self.request = kwargs.pop("request", None)
+        self.cv_upload = None
         super().__init__(*args, **kwargs)
 
+        # Either the file or the token of its chunked upload is required, see clean()
+        self.fields["cv"].required = False
+
         # We will keep track of the fields that are being added
         fields_to_remove = []
 
         for requirement in self.requirements:
+            field_name = requirement["field_name"]
+
             # Only display requirements that are internal if the request is from the intranet
-            if requirement.is_internal and not self.request.is_intranet:
-                fields_to_remove.append(f"requirement_{requirement.id}")
+            if requirement["is_internal"] and not self.request.is_intranet:
+                fields_to_remove.append(field_name)
                 continue  # Skip this requirement if it's internal and the user is not on the intranet
 
-            if requirement.question_type == MinimumRequirement.QuestionType.TEXT:
-                self.fields[f"requirement_{requirement.id}"] = forms.CharField(
-                    label=requirement.title,
-                    required=requirement.is_required,
+            if requirement["question_type"] == MinimumRequirement.QuestionType.TEXT:
+                self.fields[field_name] = forms.CharField(
+                    label=requirement["title"],
+                    required=requirement["is_required"],
                 )
 
-            elif requirement.question_type == MinimumRequirement.QuestionType.BOOL:
-                self.fields[f"requirement_{requirement.id}"] = forms.BooleanField(
-                    label=requirement.title,
-                    required=requirement.is_required,
+            elif requirement["question_type"] == MinimumRequirement.QuestionType.BOOL:
+                self.fields[field_name] = forms.BooleanField(
+                    label=requirement["title"],
+                    required=requirement["is_required"],
                 )
 
-            elif requirement.question_type == MinimumRequirement.QuestionType.DATE:
-                self.fields[f"requirement_{requirement.id}"] = forms.DateField(
-                    label=requirement.title,
-                    required=requirement.is_required,
+            elif requirement["question_type"] == MinimumRequirement.QuestionType.DATE:
+                self.fields[field_name] = forms.DateField(
+                    label=requirement["title"],
+                    required=requirement["is_required"],
                     widget=forms.DateInput(attrs={"type": "date"}),
                 )
 
-            elif requirement.question_type == MinimumRequirement.QuestionType.SELECT:
-                self.fields[f"requirement_{requirement.id}"] = forms.ChoiceField(
-                    label=requirement.title,
-                    required=requirement.is_required,
-                    choices=[(str(option.option), str(option.option)) for option in requirement.options.all()],
+            elif requirement["question_type"] == MinimumRequirement.QuestionType.SELECT:
+                self.fields[field_name] = forms.ChoiceField(
+                    label=requirement["title"],
+                    required=requirement["is_required"],
+                    choices=[(option, option) for option in requirement["options"]],
                     widget=forms.Select(),
                 )
-                self.fields[f"requirement_{requirement.id}"].is_select = True
+                self.fields[field_name].is_select = True
 
             # elif requirement.question_type == MinimumRequirement.QuestionType.MULTISELECT:
             #     self.fields[f"requirement_{requirement.id}"] = forms.ChoiceField(
@@ -161,6 +195,36 @@ class ApplicationForm(forms.ModelForm):
             #     )
             #     self.fields[f"requirement_{requirement.id}"].is_multiselect = True
 
+    def clean(self):
+        cleaned_data = super().clean()
+        token = cleaned_data.get("cv_upload")
+
+        if token:
+            upload = CVUpload.objects.filter(pk=token).first()
+            if upload is not None and upload.is_complete:
+                try:
+                    cleaned_data["cv"] = open_cv_upload(upload)
+                    self.cv_upload = upload
+                except FileNotFoundError:
+                    # No chunk of it was ever received, so nothing was staged
+                    pass
+            if self.cv_upload is None:
+                self.add_error("cv", "Your CV upload did not finish, please upload it again.")
+        elif not cleaned_data.get("cv") and "cv" not in self.errors:
+            self.add_error("cv", forms.ValidationError(self.fields["cv"].error_messages["required"], code="required"))
+
+        return cleaned_data
+
+    def clean_primary_contact(self):
+        primary_contact = self.cleaned_data["primary_contact"]
+
+        # Rejected here so the CV of a duplicate application is never written to storage
+        if has_applied(self.vacancy.pk, primary_contact):
+            messages.error(self.request, DUPLICATE_APPLICATION_MESSAGE)
+            raise forms.ValidationError(DUPLICATE_APPLICATION_MESSAGE, code="duplicate")
+
+        return primary_contact
+
     def clean_date_of_birth(self):
         dob = self.cleaned_data["date_of_birth"]
         today = date.today()
@@ -0,0 +1,126 @@
+import tempfile
+import time
+from datetime import date, timedelta
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.recruitment.models import Application, MinimumRequirement, SelectQuestionTypeOptions, Vacancy
+from apps.recruitment.views import ApplicationCreateView
+
+QUESTION_TYPES = [
+    MinimumRequirement.QuestionType.TEXT,
+    MinimumRequirement.QuestionType.BOOL,
+    MinimumRequirement.QuestionType.DATE,
+    MinimumRequirement.QuestionType.SELECT,
+]
+
+ANSWERS = {
+    MinimumRequirement.QuestionType.TEXT: "Benchmark answer",
+    MinimumRequirement.QuestionType.BOOL: "on",
+    MinimumRequirement.QuestionType.DATE: "2020-01-01",
+    MinimumRequirement.QuestionType.SELECT: "Yes",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures application submissions per second through ApplicationCreateView "
+        "for vacancies with a given number of minimum requirements."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requirements",
+            nargs="+",
+            type=int,
+            help="Requirement counts to benchmark (default: 5 20 50)",
+            default=[5, 20, 50],
+        )
+        parser.add_argument(
+            "--submissions",
+            type=int,
+            help="Number of applications to submit per vacancy (default: 200)",
+            default=200,
+        )
+
+    def handle(self, *args, **options):
+        # Uploaded CVs are written to a throwaway media root
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            for requirement_count in options["requirements"]:
+                vacancy = self.create_vacancy(requirement_count)
+                try:
+                    self.benchmark(vacancy, options["submissions"])
+                finally:
+                    Application.objects.filter(vacancy=vacancy).delete()
+                    vacancy.delete()
+
+        self.stdout.write(self.style.SUCCESS("Benchmark complete, benchmark vacancies removed."))
+
+    def create_vacancy(self, requirement_count):
+        vacancy = Vacancy.objects.create(
+            title=f"Benchmark Vacancy ({requirement_count} requirements)",
+            content="Benchmark vacancy",
+            deadline=timezone.now() + timedelta(days=7),
+            is_public=True,
+            is_published=True,
+        )
+        for i in range(requirement_count):
+            requirement = MinimumRequirement.objects.create(
+                vacancy=vacancy,
+                title=f"Requirement {i}",
+                question_type=QUESTION_TYPES[i % len(QUESTION_TYPES)],
+                is_required=True,
+            )
+            if requirement.question_type == MinimumRequirement.QuestionType.SELECT:
+                SelectQuestionTypeOptions.objects.bulk_create(
+                    [
+                        SelectQuestionTypeOptions(requirement=requirement, option="Yes"),
+                        SelectQuestionTypeOptions(requirement=requirement, option="No"),
+                    ]
+                )
+        return vacancy
+
+    def get_data(self, vacancy, i):
+        data = {
+            "first_name": "Benchmark",
+            "last_name": f"Applicant{i}",
+            "email": f"applicant{i}@example.com",
+            "primary_contact": f"+26481{i:07d}",
+            "date_of_birth": date(1990, 1, 1).isoformat(),
+            "gender": "female",
+            "cv": SimpleUploadedFile("cv.pdf", b"%PDF-1.4 benchmark", content_type="application/pdf"),
+        }
+        for requirement in vacancy.requirements.all():
+            data[f"requirement_{requirement.id}"] = ANSWERS[requirement.question_type]
+        return data
+
+    def benchmark(self, vacancy, submissions):
+        factory = RequestFactory()
+        view = ApplicationCreateView.as_view()
+        requirement_count = vacancy.requirements.count()
+        requests = []
+        for i in range(submissions):
+            request = factory.post(vacancy.get_absolute_url(), self.get_data(vacancy, i))
+            request.is_intranet = False
+            requests.append(request)
+
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            for request in requests:
+                response = view(request, slug=vacancy.slug)
+                if response.status_code != 302:
+                    raise RuntimeError(f"Submission failed with status {response.status_code}")
+            elapsed = time.perf_counter() - start
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{requirement_count} requirements: {submissions / elapsed:.1f} submissions/s, "
+                f"{elapsed / submissions * 1000:.2f} ms and "
+                f"{len(queries) / submissions:.1f} queries per submission"
+            )
+        )
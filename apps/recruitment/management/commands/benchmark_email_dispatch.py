@@ -0,0 +1,161 @@
+import socketserver
+import threading
+import time
+from datetime import date, timedelta
+
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from apps.recruitment.emails import dispatch_email_notifications, render_email_notification
+from apps.recruitment.models import Application, EmailNotification, Vacancy
+
+
+class RollbackBenchmarkError(Exception):
+    """Raised to discard the seeded applications and notifications once the benchmark is done."""
+
+
+class SMTPStandInHandler(socketserver.StreamRequestHandler):
+    """Speaks just enough SMTP to accept messages, counting them instead of delivering them."""
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        # Stands in for the greeting and TLS handshake cost of a real relay
+        time.sleep(self.server.handshake_latency)
+        self.reply("220 localhost SMTP stand-in")
+
+        while line := self.rfile.readline():
+            command = line.decode(errors="replace").strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                self.reply("250 localhost")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                with self.server.lock:
+                    self.server.message_count += 1
+                self.reply("250 OK")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                break
+            else:
+                self.reply("250 OK")
+
+
+class SMTPStandIn(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, handshake_latency):
+        super().__init__(("127.0.0.1", 0), SMTPStandInHandler)
+        self.handshake_latency = handshake_latency
+        self.message_count = 0
+        self.lock = threading.Lock()
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares sending notification emails with one SMTP connection per message against the "
+        "batch dispatcher's single shared connection, using a local SMTP stand-in."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--messages",
+            type=int,
+            help="Number of notifications to send (default: 500)",
+            default=500,
+        )
+        parser.add_argument(
+            "--handshake-latency",
+            type=float,
+            help="Milliseconds the stand-in waits before greeting each new connection (default: 20)",
+            default=20,
+        )
+
+    def handle(self, *args, **options):
+        server = SMTPStandIn(options["handshake_latency"] / 1000)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        host, port = server.server_address
+
+        def connect():
+            return get_connection(
+                "django.core.mail.backends.smtp.EmailBackend",
+                host=host,
+                port=port,
+                username="",
+                password="",
+                use_tls=False,
+                use_ssl=False,
+                timeout=10,
+            )
+
+        try:
+            with transaction.atomic():
+                notifications = self.seed(options["messages"])
+
+                start = time.perf_counter()
+                for notification in notifications:
+                    message = render_email_notification(notification)
+                    message.connection = connect()
+                    message.send()
+                self.report("One connection per message", len(notifications), time.perf_counter() - start)
+
+                start = time.perf_counter()
+                sent, failed = dispatch_email_notifications(batch_size=len(notifications), connection=connect())
+                self.report("Batched over one connection", sent, time.perf_counter() - start, failed)
+
+                raise RollbackBenchmarkError
+        except RollbackBenchmarkError:
+            pass
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Benchmark complete, the stand-in accepted {server.message_count} messages.")
+        )
+
+    def seed(self, count):
+        vacancy = Vacancy.objects.create(
+            title="Benchmark Vacancy",
+            content="Benchmark vacancy",
+            deadline=timezone.now() + timedelta(days=7),
+            slug="benchmark-email-dispatch",
+        )
+        applications = Application.objects.bulk_create(
+            [
+                Application(
+                    vacancy=vacancy,
+                    first_name="Benchmark",
+                    last_name=f"Applicant{i}",
+                    email=f"applicant{i}@example.com",
+                    primary_contact=f"+26481{i:07d}",
+                    date_of_birth=date(1990, 1, 1),
+                    cv="cv/benchmark.pdf",
+                )
+                for i in range(count)
+            ]
+        )
+        return EmailNotification.objects.bulk_create(
+            [
+                EmailNotification(
+                    subject="Application Submitted",
+                    template_name="submitted.html",
+                    recipient=application.email,
+                    recipient_name=f"{application.first_name} {application.last_name}",
+                    application=application,
+                )
+                for application in applications
+            ]
+        )
+
+    def report(self, label, count, elapsed, failed=0):
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{label}: {count} sent, {failed} failed in {elapsed:.2f} s ({count / elapsed:.1f} messages/s)"
+            )
+        )
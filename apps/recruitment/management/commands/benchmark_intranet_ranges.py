@@ -0,0 +1,81 @@
+import ipaddress
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.recruitment.middleware import IPRangeClassifier
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares classifying client IPs against thousands of intranet ranges by scanning the "
+        "prefixes one by one with the sorted-interval lookup, with and without its cache of recent IPs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--ranges",
+            type=int,
+            help="Number of intranet ranges to generate (default: 5000)",
+            default=5000,
+        )
+        parser.add_argument(
+            "--lookups",
+            type=int,
+            help="Number of client IPs to classify (default: 100000)",
+            default=100000,
+        )
+        parser.add_argument(
+            "--distinct-ips",
+            type=int,
+            help="Number of distinct client IPs the lookups are drawn from (default: 2000)",
+            default=2000,
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)
+        networks = [
+            ipaddress.IPv4Network((rng.getrandbits(32), rng.randint(16, 28)), strict=False)
+            for _ in range(options["ranges"])
+        ]
+        ranges = [str(network) for network in networks]
+        pool = [str(ipaddress.IPv4Address(rng.getrandbits(32))) for _ in range(options["distinct_ips"])]
+        # Half the pool inside the ranges, so both answers are exercised
+        inside = rng.choices(networks, k=len(pool[::2]))
+        pool[::2] = [str(network[rng.randrange(network.num_addresses)]) for network in inside]
+        ips = rng.choices(pool, k=options["lookups"])
+
+        start = time.perf_counter()
+        classifier = IPRangeClassifier(ranges)
+        self.stdout.write(f"Parsed {len(ranges)} ranges in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        scan_ips = ips[: max(1, len(ips) // 100)]
+        start = time.perf_counter()
+        expected = [any(ipaddress.ip_address(ip) in network for network in networks) for ip in scan_ips]
+        self.report("Linear scan of the networks", len(scan_ips), time.perf_counter() - start)
+
+        uncached = IPRangeClassifier(ranges, cache_size=0)
+        start = time.perf_counter()
+        answers = [ip in uncached for ip in ips]
+        self.report("Sorted intervals, uncached", len(ips), time.perf_counter() - start)
+
+        start = time.perf_counter()
+        cached = [ip in classifier for ip in ips]
+        self.report("Sorted intervals, cached", len(ips), time.perf_counter() - start)
+
+        if answers[: len(expected)] != expected or cached != answers:
+            self.stderr.write(self.style.ERROR("The lookups disagree with the linear scan."))
+            return
+        info = classifier.contains.cache_info()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Benchmark complete, {sum(answers)} of {len(ips)} lookups matched an intranet range "
+                f"({info.hits} cache hits, {info.misses} misses)."
+            )
+        )
+
+    def report(self, label, count, elapsed):
+        self.stdout.write(
+            self.style.SUCCESS(f"{label}: {count} lookups in {elapsed:.3f} s ({elapsed / count * 1e6:.2f} µs/lookup)")
+        )
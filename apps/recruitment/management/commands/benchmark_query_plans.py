@@ -0,0 +1,161 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.recruitment.models import Application, Vacancy
+
+
+class RollbackBenchmarkError(Exception):
+    """Raised to discard the seeded dataset and the index changes once the benchmark is done."""
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds a large dataset inside a transaction and prints EXPLAIN plans and timings of the "
+        "listing and review queries with and without their indexes. Nothing is kept afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--vacancies",
+            type=int,
+            help="Number of vacancies to seed (default: 2000)",
+            default=2000,
+        )
+        parser.add_argument(
+            "--applications",
+            type=int,
+            help="Number of applications to seed (default: 100000)",
+            default=100000,
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            help="Number of times each query is run when timing it (default: 20)",
+            default=20,
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS(f"Benchmarking on {connection.vendor}..."))
+
+        # SQLite can only alter the schema inside a transaction with foreign key checks turned off
+        connection.disable_constraint_checking()
+        try:
+            with transaction.atomic():
+                self.seed(options["vacancies"], options["applications"])
+
+                self.drop_indexes()
+                self.stdout.write(self.style.WARNING("\n=== Without indexes ==="))
+                self.run_queries(options["repeat"])
+
+                self.create_indexes()
+                self.stdout.write(self.style.WARNING("\n=== With indexes ==="))
+                self.run_queries(options["repeat"])
+
+                raise RollbackBenchmarkError
+        except RollbackBenchmarkError:
+            pass
+        finally:
+            connection.enable_constraint_checking()
+
+        self.stdout.write(self.style.SUCCESS("\nBenchmark complete, seeded data rolled back."))
+
+    def seed(self, vacancy_count, application_count):
+        self.stdout.write(f"Seeding {vacancy_count} vacancies and {application_count} applications...")
+        now = timezone.now()
+
+        vacancies = Vacancy.objects.bulk_create(
+            [
+                Vacancy(
+                    title=f"Benchmark Vacancy {i}",
+                    content="Benchmark vacancy",
+                    # Roughly one in ten vacancies is still open
+                    deadline=now + timedelta(days=(i % 100) - 90),
+                    is_public=i % 2 == 0,
+                    is_published=i % 5 != 0,
+                    slug=f"benchmark-vacancy-{i}",
+                )
+                for i in range(vacancy_count)
+            ],
+            batch_size=1000,
+        )
+
+        statuses = [choice for choice, _ in Application.STATUS.choices]
+        Application.objects.bulk_create(
+            (
+                Application(
+                    vacancy=vacancies[i % len(vacancies)],
+                    status=statuses[i % len(statuses)],
+                    submitted_at=now - timedelta(minutes=i),
+                    first_name=f"First{i}",
+                    last_name=f"Last{i}",
+                    email=f"applicant{i}@example.com",
+                    primary_contact=f"+26481{i:07d}",
+                    date_of_birth=now.date() - timedelta(days=365 * 25),
+                    gender="female" if i % 2 else "male",
+                    cv="cv/benchmark.pdf",
+                )
+                for i in range(application_count)
+            ),
+            batch_size=5000,
+        )
+
+        self.analyze()
+
+    def get_indexes(self):
+        return [(model, index) for model in (Vacancy, Application) for index in model._meta.indexes]
+
+    def drop_indexes(self):
+        with connection.cursor() as cursor:
+            existing = {
+                model: connection.introspection.get_constraints(cursor, model._meta.db_table)
+                for model in (Vacancy, Application)
+            }
+        with connection.schema_editor() as schema_editor:
+            for model, index in self.get_indexes():
+                if index.name in existing[model]:
+                    schema_editor.remove_index(model, index)
+        self.analyze()
+
+    def create_indexes(self):
+        with connection.schema_editor() as schema_editor:
+            for model, index in self.get_indexes():
+                schema_editor.add_index(model, index)
+        self.analyze()
+
+    def analyze(self):
+        """Refreshes the planner statistics so the plans reflect the seeded data."""
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def get_queries(self):
+        now = timezone.now()
+        reviewed_vacancy = Vacancy.objects.order_by("created_at").first()
+
+        return {
+            "Public vacancy listing": Vacancy.objects.filter(
+                is_public=True, is_published=True, deadline__gt=now
+            ).order_by("-created_at"),
+            "Intranet vacancy listing": Vacancy.objects.filter(is_published=True, deadline__gt=now).order_by(
+                "-created_at"
+            ),
+            "Application review queue": Application.objects.order_by("-status", "-submitted_at")[:100],
+            "Reviewer application queue": Application.objects.filter(vacancy=reviewed_vacancy).order_by(
+                "-status", "-submitted_at"
+            )[:100],
+            "Staff applications by email": Application.objects.filter(email="applicant4242@example.com"),
+        }
+
+    def run_queries(self, repeat):
+        for label, queryset in self.get_queries().items():
+            self.stdout.write(self.style.MIGRATE_HEADING(f"\n{label}"))
+            self.stdout.write(queryset.explain())
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                list(queryset.all())
+            elapsed = (time.perf_counter() - start) / repeat * 1000
+            self.stdout.write(self.style.SUCCESS(f"{elapsed:.2f} ms per query (average of {repeat} runs)"))
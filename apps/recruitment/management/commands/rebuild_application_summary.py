@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.recruitment.summary import rebuild_application_year_summary
+
+
+class Command(BaseCommand):
+    help = (
+        "Recounts the per-year application summary from the applications table. Run it once after "
+        "deploying the summary, and after bulk changes that bypass the model signals."
+    )
+
+    def handle(self, *args, **options):
+        years = rebuild_application_year_summary()
+        self.stdout.write(self.style.SUCCESS(f"Application summary rebuilt for {years} years."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.recruitment.search import rebuild_search_documents
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the search documents of all applications. Run it once after deploying the "
+        "indexed search, and after bulk changes that bypass the model signals."
+    )
+
+    def handle(self, *args, **options):
+        changed = rebuild_search_documents()
+        self.stdout.write(self.style.SUCCESS(f"Search documents rebuilt for {changed} applications."))
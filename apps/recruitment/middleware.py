@@ -1,20 +1,122 @@
+import ipaddress
+from bisect import bisect_right
+from functools import lru_cache
+
 from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+# The number of recently seen client IPs whose classification is remembered
+RECENT_IP_CACHE_SIZE = 4096
+
+
+def parse_ip_range(value):
+    """
+    Parses an intranet range into a network.
+
+    Ranges are given in CIDR notation, e.g. "10.0.0.0/8" or "fd00::/8", as single addresses,
+    or as the dotted IPv4 prefixes used before CIDR was supported, e.g. "192.168" or "127.0.",
+    which cover every address starting with those octets.
+
+    Args:
+        value (str): The range.
+
+    Returns:
+        IPv4Network | IPv6Network: The network of the range.
+
+    Raises:
+        ImproperlyConfigured: If the range is neither valid CIDR notation nor a dotted prefix.
+    """
+    value = value.strip()
+    octets = value.rstrip(".").split(".")
+    if "/" not in value and ":" not in value and len(octets) < 4:
+        if not all(octet.isdigit() and int(octet) <= 255 for octet in octets):
+            raise ImproperlyConfigured(f"Invalid intranet IP range: {value!r}")
+        value = "{}/{}".format(".".join(octets + ["0"] * (4 - len(octets))), 8 * len(octets))
+    try:
+        return ipaddress.ip_network(value, strict=False)
+    except ValueError as ex:
+        raise ImproperlyConfigured(f"Invalid intranet IP range: {value!r}") from ex
+
+
+class IPRangeClassifier:
+    """
+    Answers whether an IP address falls within any of a set of ranges.
+
+    The ranges are parsed once and merged into sorted, non-overlapping intervals per IP
+    version, so a lookup is a binary search however many ranges there are. The answers for
+    recently seen addresses are cached.
+
+    Args:
+        ranges (iterable): The ranges, in any format accepted by `parse_ip_range`.
+        cache_size (int): The number of recent addresses whose answers are cached.
+    """
+
+    def __init__(self, ranges, cache_size=RECENT_IP_CACHE_SIZE):
+        intervals = {4: [], 6: []}
+        for network in map(parse_ip_range, ranges):
+            intervals[network.version].append((int(network.network_address), int(network.broadcast_address)))
+
+        self.starts, self.ends = {}, {}
+        for version, spans in intervals.items():
+            merged = []
+            for start, end in sorted(spans):
+                if merged and start <= merged[-1][1] + 1:
+                    merged[-1][1] = max(merged[-1][1], end)
+                else:
+                    merged.append([start, end])
+            self.starts[version] = [start for start, _ in merged]
+            self.ends[version] = [end for _, end in merged]
+
+        self.contains = lru_cache(maxsize=cache_size)(self._contains)
+
+    def _contains(self, ip):
+        try:
+            address = ipaddress.ip_address(ip.strip())
+        except ValueError:
+            return False
+        if address.version == 6 and address.ipv4_mapped:
+            address = address.ipv4_mapped
+
+        value = int(address)
+        i = bisect_right(self.starts[address.version], value) - 1
+        return i >= 0 and value <= self.ends[address.version][i]
+
+    def __contains__(self, ip):
+        return self.contains(ip)
+
+
+def get_client_ip(request, trusted_proxy_count):
+    """
+    Returns the IP address of the client that made a request.
+
+    Each trusted proxy in front of the app appends the address it received the request from
+    to X-Forwarded-For, so the client is the entry that many hops from the right. Entries
+    further left are supplied by the client and can't be trusted.
+
+    Args:
+        request (HttpRequest): The request.
+        trusted_proxy_count (int): The number of reverse proxies in front of the app.
+
+    Returns:
+        str: The IP address of the client.
+    """
+    remote_addr = request.META.get("REMOTE_ADDR", "")
+    forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR", "")
+    if not trusted_proxy_count or not forwarded_for:
+        return remote_addr
+
+    hops = [hop.strip() for hop in forwarded_for.split(",")]
+    return hops[-min(trusted_proxy_count, len(hops))]
 
 
 class InternalAccessMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
+        self.trusted_proxy_count = settings.INTRANET_TRUSTED_PROXY_COUNT
+        self.intranet = IPRangeClassifier(settings.INTRANET_IP_RANGES)
 
     def __call__(self, request):
-        # ip = request.META.get("REMOTE_ADDR", "")
-        # ip = request.META.get("HTTP_X_FORWARDED_FOR", "").split(",")[0]
-        ip = request.META.get("HTTP_X_FORWARDED_FOR", request.META.get("REMOTE_ADDR", ""))
-        ip = ip.split(",")[0]
-
         # Check if IP belongs to internal network
-        if any(ip.startswith(prefix) for prefix in settings.INTRANET_IP_RANGES):
-            request.is_intranet = True
-        else:
-            request.is_intranet = False
+        request.is_intranet = get_client_ip(request, self.trusted_proxy_count) in self.intranet
 
         return self.get_response(request)
@@ -0,0 +1,35 @@
+from django.shortcuts import get_object_or_404
+from django.utils.functional import cached_property
+
+from .models import Vacancy
+
+
+class VacancyMixin:
+    """
+    Resolves the vacancy named by the `slug` URL keyword argument once per request.
+
+    Class-based views are instantiated per request, so caching the vacancy on the view
+    lets `get`, `get_form_kwargs`, `get_context_data` and `form_valid` share a single query.
+    """
+
+    vacancy_queryset = Vacancy.objects.all()
+
+    @cached_property
+    def vacancy(self):
+        return get_object_or_404(self.vacancy_queryset, slug=self.kwargs.get("slug"))
+
+
+class CachedObjectMixin:
+    """
+    Caches the result of `get_object` for the rest of the request.
+
+    `UpdateView` and friends call `get_object` from several places while handling a single
+    request; with this mixin only the first call reaches the database.
+    """
+
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return super().get_object(queryset)
+        if not hasattr(self, "_cached_object"):
+            self._cached_object = super().get_object()
+        return self._cached_object
@@ -10,11 +10,12 @@ from django.urls import reverse
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django_extensions.db.fields import AutoSlugField
-from phonenumber_field.modelfields import PhoneNumberField
 from tinymce.models import HTMLField
 
 from apps.organisation.models import Location, Town
-from apps.utils.validators import FileValidator
+from apps.utils.phone import PhoneNumberField
+from apps.utils.storage import content_addressed_storage, export_storage
+from apps.utils.validators import FileSignatureValidator, FileValidator
 
 
 # **********************************************************************************************
@@ -42,6 +43,7 @@ class Vacancy(models.Model):
         upload_to="adverts/vacancy/",
         validators=[
             FileExtensionValidator(allowed_extensions=["pdf"]),
+            FileSignatureValidator(),
             FileValidator(max_size=10 * 1024 * 1024),
         ],
         blank=True,
@@ -72,6 +74,20 @@ class Vacancy(models.Model):
 
     class Meta:
         verbose_name_plural = "Vacancies"
+        indexes = [
+            # Public listing: is_public, is_published and an open deadline, newest first
+            models.Index(
+                fields=["is_public", "deadline"],
+                condition=models.Q(is_published=True),
+                name="vacancy_public_deadline_idx",
+            ),
+            # Intranet listing and the staff dashboard, which ignore is_public
+            models.Index(
+                fields=["deadline"],
+                condition=models.Q(is_published=True),
+                name="vacancy_published_deadline_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -156,8 +172,10 @@ class Application(models.Model):
     )
     cv = models.FileField(
         upload_to="cv/",
+        storage=content_addressed_storage,
         validators=[
             FileExtensionValidator(allowed_extensions=["pdf", "docx"]),
+            FileSignatureValidator(),
             FileValidator(max_size=10 * 1024 * 1024),
         ],
         help_text="Please upload a PDF/DOCX file, maximum size 10MB.",
@@ -180,10 +198,24 @@ class Application(models.Model):
     )
     reviewed_at = models.DateTimeField(blank=True, null=True)
     review_comments = models.CharField(max_length=255, blank=True, null=True)
+    # Normalised names, email, phone numbers and vacancy title, maintained by apps.recruitment.search
+    search_document = models.TextField(blank=True, default="", editable=False)
 
     def __str__(self):
         return f"{self.vacancy.title} - {self.first_name} {self.last_name}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what the year summary counted this application under, to adjust it on save
+        loaded = dict(zip(field_names, values))
+        if "status" in loaded and "submitted_at" in loaded:
+            instance._summary_state = (loaded["submitted_at"], loaded["status"])
+        # And which vacancy's pipeline counters it is counted in
+        if "status" in loaded and "vacancy_id" in loaded:
+            instance._pipeline_state = (loaded["vacancy_id"], loaded["status"])
+        return instance
+
     def clean(self):
         if self.date_of_birth:
             today = date.today()
@@ -205,6 +237,16 @@ class Application(models.Model):
                 name="unique_vacancy_primary_contact",
             ),
         ]
+        indexes = [
+            # Review queue ordering in ApplicationAdmin, scanned backwards for "-status", "-submitted_at"
+            models.Index(fields=["status", "submitted_at"], name="application_status_idx"),
+            # Review queue restricted to the vacancies a reviewer is assigned to
+            models.Index(fields=["vacancy", "status", "submitted_at"], name="application_vacancy_status_idx"),
+            # Staff dashboard lookup of a user's own applications
+            models.Index(fields=["email"], name="application_email_idx"),
+            # Recruitment dashboard KPIs over the most recent applications
+            models.Index(fields=["submitted_at"], name="application_submitted_idx"),
+        ]
 
 
 class MinimumRequirementAnswer(models.Model):
@@ -230,6 +272,7 @@ class Interview(models.Model):
         WAITING = "Waiting"
         REJECTED = "rejected"
         ACCEPTED = "accepted"
+        NO_RESPONSE = "no_response"
 
     class InterviewTypes(models.TextChoices): ...
 
@@ -259,9 +302,24 @@ class Interview(models.Model):
     )
     reschedule_date = models.DateField(blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            # The response deadline sweeper looks up scheduled interviews past their deadline
+            models.Index(fields=["status", "response_deadline"], name="interview_status_deadline_idx"),
+        ]
+
     def __str__(self):
         return f"{self.application.vacancy.title} - {self.application.first_name} {self.application.last_name}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what the pipeline counters counted this interview under, to adjust them on save
+        loaded = dict(zip(field_names, values))
+        if "status" in loaded and "application_id" in loaded:
+            instance._pipeline_state = (loaded["application_id"], loaded["status"])
+        return instance
+
     def clean(self):
         if not self.schedule_datetime:
             raise ValidationError("Scheduled datetime cannot be empty.")
@@ -287,7 +345,7 @@ class Interview(models.Model):
 
     def update_no_response_status(self):
         if self.response_deadline and self.response_deadline < timezone.now():
-            self.status = "no_response"
+            self.status = self.STATUS.NO_RESPONSE
             self.save()
 
     def save(self, *args, **kwargs):
@@ -295,3 +353,203 @@ class Interview(models.Model):
         if self.schedule_datetime:
             self.response_deadline = self.schedule_datetime - timedelta(days=2)
         super().save(*args, **kwargs)
+
+
+# **********************************************************************************************
+#                                       NOTIFICATION
+# **********************************************************************************************
+class EmailNotification(models.Model):
+    """
+    An email waiting in the outbox to be rendered and sent by the batch dispatcher.
+
+    The subject and template are decided when the event happens; the body is rendered from
+    the related application or interview when the batch is sent.
+    """
+
+    class STATUS(models.TextChoices):
+        PENDING = "pending"
+        SENDING = "sending"
+        SENT = "sent"
+        FAILED = "failed"
+
+    subject = models.CharField(max_length=255)
+    template_name = models.CharField(max_length=100)
+    recipient = models.EmailField()
+    recipient_name = models.CharField(max_length=255)
+    application = models.ForeignKey(
+        Application,
+        blank=True,
+        null=True,
+        on_delete=models.CASCADE,
+        related_name="email_notifications",
+    )
+    interview = models.ForeignKey(
+        Interview,
+        blank=True,
+        null=True,
+        on_delete=models.CASCADE,
+        related_name="email_notifications",
+    )
+    status = models.CharField(max_length=20, choices=STATUS.choices, default=STATUS.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    claimed_at = models.DateTimeField(blank=True, null=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="emailnotification_status_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} - {self.recipient}"
+
+
+# **********************************************************************************************
+#                                       SUMMARY
+# **********************************************************************************************
+class ApplicationYearSummary(models.Model):
+    """
+    The number of applications submitted in a year, in total and by status.
+
+    Kept up to date by the receivers in `summary.py` as applications are created, change
+    status or are deleted, so listing the years with applications doesn't scan the table.
+    """
+
+    year = models.PositiveSmallIntegerField(primary_key=True)
+    total = models.PositiveIntegerField(default=0)
+    submitted = models.PositiveIntegerField(default=0)
+    accepted = models.PositiveIntegerField(default=0)
+    rejected = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["-year"]
+        verbose_name_plural = "application year summaries"
+
+    def __str__(self):
+        return f"{self.year}: {self.total} applications"
+
+
+# **********************************************************************************************
+#                                       PIPELINE
+# **********************************************************************************************
+class PipelineCounters(models.Model):
+    """
+    Application and interview counts, by status, maintained by the receivers in `pipeline.py`
+    and reconciled periodically against the applications and interviews tables.
+    """
+
+    applications = models.PositiveIntegerField(default=0)
+    submitted = models.PositiveIntegerField(default=0)
+    accepted = models.PositiveIntegerField(default=0)
+    rejected = models.PositiveIntegerField(default=0)
+    interviews = models.PositiveIntegerField(default=0)
+    upcoming_interviews = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+
+class VacancyPipeline(PipelineCounters):
+    """The pipeline counts of the applications to a vacancy."""
+
+    vacancy = models.OneToOneField(Vacancy, on_delete=models.CASCADE, primary_key=True, related_name="pipeline")
+
+    def __str__(self):
+        return f"{self.vacancy_id}: {self.applications} applications"
+
+
+class ReviewerPipeline(PipelineCounters):
+    """The pipeline counts of the applications to all vacancies a user reviews."""
+
+    user = models.OneToOneField(
+        get_user_model(),
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="review_pipeline",
+    )
+
+    def __str__(self):
+        return f"{self.user_id}: {self.submitted} awaiting review"
+
+
+# **********************************************************************************************
+#                                       EXPORT
+# **********************************************************************************************
+class ApplicationExport(models.Model):
+    """
+    A background export of applications to a CSV or XLSX file, written by a Celery task.
+    """
+
+    class STATUS(models.TextChoices):
+        PENDING = "pending"
+        RUNNING = "running"
+        DONE = "done"
+        FAILED = "failed"
+
+    class FORMAT(models.TextChoices):
+        CSV = "csv", "CSV"
+        XLSX = "xlsx", "Excel (XLSX)"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    requested_by = models.ForeignKey(
+        get_user_model(),
+        on_delete=models.CASCADE,
+        related_name="application_exports",
+    )
+    file_format = models.CharField(max_length=10, choices=FORMAT.choices, default=FORMAT.CSV)
+    year = models.PositiveSmallIntegerField(blank=True, null=True)
+    status = models.CharField(max_length=20, choices=STATUS.choices, default=STATUS.PENDING)
+    rows_total = models.PositiveIntegerField(default=0)
+    rows_done = models.PositiveIntegerField(default=0)
+    file = models.FileField(upload_to="applications/", storage=export_storage, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"Applications {self.year or 'all years'} ({self.file_format}) - {self.status}"
+
+    @property
+    def progress(self):
+        if self.status == self.STATUS.DONE:
+            return 100
+        if not self.rows_total:
+            return 0
+        return min(100, self.rows_done * 100 // self.rows_total)
+
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS.DONE, self.STATUS.FAILED)
+
+
+# **********************************************************************************************
+#                                       UPLOAD
+# **********************************************************************************************
+class CVUpload(models.Model):
+    """
+    A CV uploaded in chunks ahead of the application it belongs to, so a dropped connection
+    resumes at the last chunk received. Its ID is the token the apply form references it by.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    filename = models.CharField(max_length=255)
+    length = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.length} bytes)"
+
+    @property
+    def staging_name(self):
+        return f"cv/{self.pk}.part"
+
+    @property
+    def is_complete(self):
+        return self.offset == self.length
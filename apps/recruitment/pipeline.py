@@ -0,0 +1,263 @@
+from collections import Counter, defaultdict
+from functools import partial
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Greatest
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from apps.accounts.roles import is_admin
+
+from .models import Application, Interview, ReviewerPipeline, Vacancy, VacancyPipeline
+
+COUNTER_FIELDS = ["applications", "submitted", "accepted", "rejected", "interviews", "upcoming_interviews"]
+APPLICATION_STATUS_FIELDS = {status.value for status in Application.STATUS}
+UPCOMING_INTERVIEW_STATUSES = [Interview.STATUS.SCHEDULED, Interview.STATUS.RESCHEDULED]
+
+VacancyReviewer = Vacancy.reviewers.through
+
+
+def application_counts(status, sign=1):
+    """Returns what an application with `status` adds to the pipeline counters."""
+    counts = Counter(applications=sign)
+    if status in APPLICATION_STATUS_FIELDS:
+        counts[status] += sign
+    return counts
+
+
+def interview_counts(status, sign=1):
+    """Returns what an interview with `status` adds to the pipeline counters."""
+    counts = Counter(interviews=sign)
+    if status in UPCOMING_INTERVIEW_STATUSES:
+        counts["upcoming_interviews"] += sign
+    return counts
+
+
+def update_pipeline_counters(vacancy_id, changes):
+    """
+    Adds changes to the pipeline counters of a vacancy and of each of its reviewers, once
+    the current transaction commits.
+
+    The counters are shared by every application to the vacancy and every vacancy of the
+    reviewers, so they are updated after the commit rather than locked for the rest of the
+    transaction. Changes lost between the commit and the update are corrected by
+    `reconcile_pipeline_counters_task`.
+
+    Args:
+        vacancy_id (UUID): The ID of the vacancy.
+        changes (dict): The change of each counter, positive or negative.
+    """
+    changes = {field: change for field, change in changes.items() if change}
+    if changes:
+        transaction.on_commit(partial(apply_pipeline_counter_changes, vacancy_id, changes))
+
+
+def apply_pipeline_counter_changes(vacancy_id, changes):
+    """
+    Updates the counters in place with two UPDATE statements. A vacancy without counters is
+    counted from scratch instead.
+    """
+    updates = {field: Greatest(F(field) + change, 0) for field, change in changes.items()}
+    if not VacancyPipeline.objects.filter(vacancy_id=vacancy_id).update(**updates):
+        reconcile_pipeline_counters(vacancy_ids=[vacancy_id])
+        return
+    reviewers = VacancyReviewer.objects.filter(vacancy_id=vacancy_id).values("user_id")
+    ReviewerPipeline.objects.filter(user__in=reviewers).update(**updates)
+
+
+def count_pipelines(key, applications, interviews):
+    """
+    Counts applications and interviews grouped by `key`, a lookup from an application.
+
+    Returns:
+        dict: The counters of each key.
+    """
+    counts = defaultdict(lambda: dict.fromkeys(COUNTER_FIELDS, 0))
+    application_rows = (
+        applications.values(key=F(key))
+        .annotate(
+            applications=Count("id"),
+            **{status: Count("id", filter=Q(status=status)) for status in APPLICATION_STATUS_FIELDS},
+        )
+        .order_by()
+    )
+    interview_rows = (
+        interviews.values(key=F(f"application__{key}"))
+        .annotate(
+            interviews=Count("id"),
+            upcoming_interviews=Count("id", filter=Q(status__in=UPCOMING_INTERVIEW_STATUSES)),
+        )
+        .order_by()
+    )
+    for row in [*application_rows, *interview_rows]:
+        counts[row.pop("key")].update(row)
+    return counts
+
+
+def reconcile(model, keys, counts):
+    """
+    Brings the stored counters of `keys` in line with `counts`, only writing rows that drifted.
+
+    Returns:
+        int: The number of rows created or corrected.
+    """
+    stored = {row.pk: row for row in model.objects.filter(pk__in=keys)}
+    created, corrected = [], []
+    for key in keys:
+        expected = counts.get(key, dict.fromkeys(COUNTER_FIELDS, 0))
+        row = stored.get(key)
+        if row is None:
+            created.append(model(pk=key, **expected))
+        elif any(getattr(row, field) != expected[field] for field in COUNTER_FIELDS):
+            for field in COUNTER_FIELDS:
+                setattr(row, field, expected[field])
+            corrected.append(row)
+
+    with transaction.atomic():
+        model.objects.bulk_create(created, ignore_conflicts=True)
+        model.objects.bulk_update(corrected, COUNTER_FIELDS)
+    return len(created) + len(corrected)
+
+
+def reconcile_reviewer_counters(user_ids):
+    """
+    Recounts the pipeline counters of reviewers from the applications and interviews tables.
+
+    Args:
+        user_ids (iterable): The IDs of the reviewers.
+
+    Returns:
+        int: The number of reviewer counters created or corrected.
+    """
+    user_ids = set(user_ids)
+    if not user_ids:
+        return 0
+    counts = count_pipelines(
+        "vacancy__reviewers",
+        Application.objects.filter(vacancy__reviewers__in=user_ids),
+        Interview.objects.filter(application__vacancy__reviewers__in=user_ids),
+    )
+    return reconcile(ReviewerPipeline, user_ids, counts)
+
+
+def reconcile_pipeline_counters(vacancy_ids=None):
+    """
+    Recounts the pipeline counters from the applications and interviews tables and corrects
+    any drift, such as after bulk operations that bypass the model signals.
+
+    Args:
+        vacancy_ids (iterable, optional): The vacancies to recount, along with their reviewers.
+            All vacancies and reviewers by default.
+
+    Returns:
+        dict: The number of vacancy and reviewer counters created or corrected.
+    """
+    vacancies = Vacancy.objects.all()
+    applications = Application.objects.all()
+    interviews = Interview.objects.all()
+    reviewers = VacancyReviewer.objects.all()
+    if vacancy_ids is not None:
+        vacancy_ids = set(vacancy_ids)
+        vacancies = vacancies.filter(pk__in=vacancy_ids)
+        applications = applications.filter(vacancy_id__in=vacancy_ids)
+        interviews = interviews.filter(application__vacancy_id__in=vacancy_ids)
+        reviewers = reviewers.filter(vacancy_id__in=vacancy_ids)
+
+    counts = count_pipelines("vacancy_id", applications, interviews)
+    keys = set(vacancies.values_list("pk", flat=True))
+    return {
+        "vacancies": reconcile(VacancyPipeline, keys, counts),
+        "reviewers": reconcile_reviewer_counters(reviewers.values_list("user_id", flat=True)),
+    }
+
+
+def applications_awaiting_review_badge(request):
+    """
+    A sidebar badge with the number of submitted applications awaiting the user's review,
+    read from the pipeline counters.
+    """
+    if is_admin(request.user):
+        return VacancyPipeline.objects.aggregate(total=Sum("submitted"))["total"] or 0
+    return ReviewerPipeline.objects.filter(user=request.user).values_list("submitted", flat=True).first() or 0
+
+
+def get_application_vacancy_id(interview, application_id):
+    field = Interview._meta.get_field("application")
+    if field.is_cached(interview) and interview.application.pk == application_id:
+        return interview.application.vacancy_id
+    return Application.objects.filter(pk=application_id).values_list("vacancy_id", flat=True).first()
+
+
+@receiver(post_save, sender=Vacancy)
+def create_vacancy_pipeline(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        VacancyPipeline.objects.create(vacancy=instance)
+
+
+@receiver(post_save, sender=Application)
+def count_application_on_save(sender, instance, created, **kwargs):
+    """Counts a new application, or moves a saved one to its new status or vacancy."""
+    state = getattr(instance, "_pipeline_state", None)
+    if created:
+        update_pipeline_counters(instance.vacancy_id, application_counts(instance.status))
+    elif state is None:
+        # Loaded without its status or vacancy, recount the vacancy
+        reconcile_pipeline_counters(vacancy_ids=[instance.vacancy_id])
+    elif state[0] != instance.vacancy_id:
+        # Moved to another vacancy together with its interviews
+        reconcile_pipeline_counters(vacancy_ids=[state[0], instance.vacancy_id])
+    elif state[1] != instance.status:
+        changes = application_counts(instance.status)
+        changes.update(application_counts(state[1], sign=-1))
+        update_pipeline_counters(instance.vacancy_id, changes)
+
+    instance._pipeline_state = (instance.vacancy_id, instance.status)
+
+
+@receiver(post_delete, sender=Application)
+def count_application_on_delete(sender, instance, **kwargs):
+    vacancy_id, status = getattr(instance, "_pipeline_state", (instance.vacancy_id, instance.status))
+    update_pipeline_counters(vacancy_id, application_counts(status, sign=-1))
+
+
+@receiver(post_save, sender=Interview)
+def count_interview_on_save(sender, instance, created, **kwargs):
+    """Counts a new interview, or moves a saved one to its new status or application."""
+    state = getattr(instance, "_pipeline_state", None)
+    if created:
+        vacancy_id = get_application_vacancy_id(instance, instance.application_id)
+        update_pipeline_counters(vacancy_id, interview_counts(instance.status))
+    elif state is None or state[0] != instance.application_id:
+        old_vacancy_id = get_application_vacancy_id(instance, state[0]) if state else None
+        vacancy_ids = {get_application_vacancy_id(instance, instance.application_id), old_vacancy_id} - {None}
+        reconcile_pipeline_counters(vacancy_ids=vacancy_ids)
+    elif state[1] != instance.status:
+        changes = interview_counts(instance.status)
+        changes.update(interview_counts(state[1], sign=-1))
+        update_pipeline_counters(get_application_vacancy_id(instance, instance.application_id), changes)
+
+    instance._pipeline_state = (instance.application_id, instance.status)
+
+
+@receiver(post_delete, sender=Interview)
+def count_interview_on_delete(sender, instance, **kwargs):
+    application_id, status = getattr(instance, "_pipeline_state", (instance.application_id, instance.status))
+    vacancy_id = get_application_vacancy_id(instance, application_id)
+    if vacancy_id is not None:
+        update_pipeline_counters(vacancy_id, interview_counts(status, sign=-1))
+
+
+@receiver(m2m_changed, sender=VacancyReviewer)
+def count_reviewers_on_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Recounts the reviewers added to or removed from a vacancy."""
+    if reverse:
+        if action.startswith("post_"):
+            reconcile_reviewer_counters([instance.pk])
+    elif action == "pre_clear":
+        # The reviewers of a vacancy being cleared are only known before the clear
+        instance._cleared_reviewers = list(instance.reviewers.values_list("pk", flat=True))
+    elif action == "post_clear":
+        reconcile_reviewer_counters(getattr(instance, "_cleared_reviewers", []))
+    elif action in ("post_add", "post_remove"):
+        reconcile_reviewer_counters(pk_set)
@@ -0,0 +1,99 @@
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import MinimumRequirement, SelectQuestionTypeOptions
+
+REQUIREMENT_SCHEMA_CACHE_KEY = "recruitment:requirement_schema:{vacancy_id}"
+REQUIREMENT_SCHEMA_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def requirement_schema_cache_key(vacancy_id):
+    return REQUIREMENT_SCHEMA_CACHE_KEY.format(vacancy_id=vacancy_id)
+
+
+def build_requirement_schema(vacancy_id):
+    """
+    Builds the requirement schema of a vacancy from the database.
+
+    The schema is a plain list of dictionaries, one per minimum requirement, holding
+    everything the application form needs to render and store the answers, including
+    the options of select questions. It is loaded with two queries however many
+    requirements the vacancy has.
+
+    Args:
+        vacancy_id (UUID): The ID of the vacancy.
+
+    Returns:
+        list: The requirement schema, in the order the requirements were created.
+    """
+    requirements = MinimumRequirement.objects.filter(vacancy_id=vacancy_id).prefetch_related("options").order_by("id")
+    return [
+        {
+            "id": requirement.id,
+            "field_name": f"requirement_{requirement.id}",
+            "title": requirement.title,
+            "question_type": requirement.question_type,
+            "is_internal": requirement.is_internal,
+            "is_required": requirement.is_required,
+            "options": [option.option for option in requirement.options.all()],
+        }
+        for requirement in requirements
+    ]
+
+
+def get_requirement_schema(vacancy):
+    """
+    Returns the cached requirement schema of a vacancy, building it on a cache miss.
+
+    Args:
+        vacancy (Vacancy): The vacancy being applied for.
+
+    Returns:
+        list: The requirement schema, see `build_requirement_schema`.
+    """
+    cache_key = requirement_schema_cache_key(vacancy.pk)
+    schema = cache.get(cache_key)
+    if schema is None:
+        schema = build_requirement_schema(vacancy.pk)
+        cache.set(cache_key, schema, REQUIREMENT_SCHEMA_CACHE_TIMEOUT)
+    return schema
+
+
+def invalidate_requirement_schema(vacancy_id):
+    cache.delete(requirement_schema_cache_key(vacancy_id))
+
+
+@receiver(post_save, sender=MinimumRequirement)
+@receiver(post_delete, sender=MinimumRequirement)
+def invalidate_requirement_schema_on_requirement_change(sender, instance, **kwargs):
+    """
+    Drops the cached requirement schema of the vacancy a requirement belongs to.
+
+    Args:
+        sender: The model class (MinimumRequirement).
+        instance: The requirement that was saved or deleted.
+        kwargs: Additional keyword arguments.
+    """
+    invalidate_requirement_schema(instance.vacancy_id)
+
+
+@receiver(post_save, sender=SelectQuestionTypeOptions)
+@receiver(post_delete, sender=SelectQuestionTypeOptions)
+def invalidate_requirement_schema_on_option_change(sender, instance, **kwargs):
+    """
+    Drops the cached requirement schema of the vacancy a select option belongs to.
+
+    When the option is deleted together with its requirement the requirement is already
+    gone, in which case its own post_delete receiver has invalidated the schema.
+
+    Args:
+        sender: The model class (SelectQuestionTypeOptions).
+        instance: The option that was saved or deleted.
+        kwargs: Additional keyword arguments.
+    """
+    vacancy_id = (
+        MinimumRequirement.objects.filter(pk=instance.requirement_id).values_list("vacancy_id", flat=True).first()
+    )
+    if vacancy_id is not None:
+        invalidate_requirement_schema(vacancy_id)
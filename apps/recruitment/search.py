@@ -0,0 +1,238 @@
+import logging
+import re
+import unicodedata
+
+from django.db import DatabaseError, connections
+from django.db.models import FloatField, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_migrate, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.utils.phone import normalise_phone_number
+
+from .models import Application, Vacancy
+
+logger = logging.getLogger(__name__)
+
+# The application fields that make up its search document
+SEARCH_DOCUMENT_FIELDS = {"first_name", "middle_name", "last_name", "email", "primary_contact", "secondary_contact"}
+
+# Trigram indexes serving the case-insensitive `icontains` searches of the admin, which
+# PostgreSQL compiles to UPPER(column::text) LIKE UPPER('%term%'), and the substring searches
+# of the already lowercased application search documents
+POSTGRESQL_SEARCH_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS vacancy_title_trgm_idx "
+    "ON recruitment_vacancy USING gin (UPPER(title::text) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS application_search_trgm_idx "
+    "ON recruitment_application USING gin (search_document gin_trgm_ops)",
+]
+
+# An FTS5 index over the application search documents, kept in sync by triggers. Django
+# rebuilds SQLite tables to alter them, which drops the triggers, so they are recreated and
+# the index rebuilt after every migration.
+SQLITE_SEARCH_TABLE = "recruitment_application_search"
+SQLITE_SEARCH_INDEXES = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_SEARCH_TABLE} USING fts5("
+    "search_document, content='recruitment_application', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS application_search_ai AFTER INSERT ON recruitment_application BEGIN "
+    f"INSERT INTO {SQLITE_SEARCH_TABLE}(rowid, search_document) VALUES (new.rowid, new.search_document); END",
+    "CREATE TRIGGER IF NOT EXISTS application_search_ad AFTER DELETE ON recruitment_application BEGIN "
+    f"INSERT INTO {SQLITE_SEARCH_TABLE}({SQLITE_SEARCH_TABLE}, rowid, search_document) "
+    "VALUES ('delete', old.rowid, old.search_document); END",
+    "CREATE TRIGGER IF NOT EXISTS application_search_au AFTER UPDATE OF search_document ON recruitment_application "
+    f"BEGIN INSERT INTO {SQLITE_SEARCH_TABLE}({SQLITE_SEARCH_TABLE}, rowid, search_document) "
+    "VALUES ('delete', old.rowid, old.search_document); "
+    f"INSERT INTO {SQLITE_SEARCH_TABLE}(rowid, search_document) VALUES (new.rowid, new.search_document); END",
+    f"INSERT INTO {SQLITE_SEARCH_TABLE}({SQLITE_SEARCH_TABLE}) VALUES ('rebuild')",
+]
+
+# The FTS5 trigram tokenizer only matches terms of at least three characters
+SQLITE_MIN_TERM_LENGTH = 3
+
+
+def normalise(text):
+    """
+    Normalises text for searching: lowercased, without accents, and split into words of
+    letters, digits and the characters of email addresses.
+
+    Args:
+        text (str): The text to normalise.
+
+    Returns:
+        str: The normalised words, separated by single spaces.
+    """
+    text = unicodedata.normalize("NFKD", str(text)).encode("ascii", "ignore").decode("ascii")
+    return " ".join(re.findall(r"[a-z0-9@._-]+", text.lower()))
+
+
+def build_search_document(application):
+    """
+    Builds the search document of an application from its names, email, phone numbers and
+    vacancy title. Phone numbers are included in international and national format.
+
+    Args:
+        application (Application): The application.
+
+    Returns:
+        str: The normalised search document.
+    """
+    parts = [application.first_name, application.middle_name, application.last_name, application.email]
+    for number in (application.primary_contact, application.secondary_contact):
+        if normalise_phone_number(number):
+            parts += [f"{number.country_code}{number.national_number}", f"0{number.national_number}"]
+        elif number:
+            parts.append(re.sub(r"\D", "", str(number)))
+    parts.append(application.vacancy.title)
+    return normalise(" ".join(part for part in parts if part))
+
+
+def search_applications(queryset, search_term):
+    """
+    Filters applications to those whose search document contains every word of the search
+    term, and annotates a `search_rank` relevance, higher for better matches.
+
+    PostgreSQL matches with the trigram index and ranks by word similarity, SQLite matches
+    with the FTS5 index and ranks by BM25. Other databases scan the search documents.
+
+    Args:
+        queryset (QuerySet): The applications to search.
+        search_term (str): The search term as typed.
+
+    Returns:
+        QuerySet: The matching applications, annotated with `search_rank`.
+    """
+    terms = normalise(search_term).split()
+    if not terms:
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    vendor = connections[queryset.db].vendor
+    if vendor == "postgresql":
+        from django.contrib.postgres.search import TrigramWordSimilarity
+
+        for term in terms:
+            queryset = queryset.filter(search_document__contains=term)
+        rank = TrigramWordSimilarity(terms[0], "search_document")
+        for term in terms[1:]:
+            rank += TrigramWordSimilarity(term, "search_document")
+        return queryset.annotate(search_rank=rank)
+
+    if vendor == "sqlite":
+        indexed = [term for term in terms if len(term) >= SQLITE_MIN_TERM_LENGTH]
+        for term in terms:
+            if term not in indexed:
+                queryset = queryset.filter(search_document__contains=term)
+        if indexed:
+            match = " ".join('"%s"' % term.replace('"', '""') for term in indexed)
+            table = Application._meta.db_table
+            queryset = queryset.filter(
+                pk__in=RawSQL(
+                    f"SELECT a.id FROM {SQLITE_SEARCH_TABLE} s JOIN {table} a ON a.rowid = s.rowid "
+                    f"WHERE {SQLITE_SEARCH_TABLE} MATCH %s",
+                    [match],
+                )
+            )
+            # bm25() is lower for better matches
+            rank = RawSQL(
+                f"SELECT -bm25({SQLITE_SEARCH_TABLE}) FROM {SQLITE_SEARCH_TABLE} "
+                f"WHERE {SQLITE_SEARCH_TABLE} MATCH %s AND rowid = {table}.rowid",
+                [match],
+                output_field=FloatField(),
+            )
+            return queryset.annotate(search_rank=rank)
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    for term in terms:
+        queryset = queryset.filter(search_document__contains=term)
+    return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+def rebuild_search_documents(queryset=None, batch_size=1000):
+    """
+    Rebuilds the search documents of applications.
+
+    Needed once to fill the documents of existing applications, and after bulk operations
+    that bypass the model signals, such as `QuerySet.update()` or `bulk_create()`.
+
+    Args:
+        queryset (QuerySet, optional): The applications to rebuild, all of them by default.
+        batch_size (int): The number of applications loaded and updated at a time.
+
+    Returns:
+        int: The number of search documents that changed.
+    """
+    if queryset is None:
+        queryset = Application.objects.all()
+    queryset = queryset.select_related("vacancy").only(
+        "id", "search_document", "vacancy__title", *SEARCH_DOCUMENT_FIELDS
+    )
+
+    changed, batch = 0, []
+    for application in queryset.iterator(chunk_size=batch_size):
+        document = build_search_document(application)
+        if document != application.search_document:
+            application.search_document = document
+            batch.append(application)
+        if len(batch) >= batch_size:
+            changed += Application.objects.bulk_update(batch, ["search_document"])
+            batch = []
+    if batch:
+        changed += Application.objects.bulk_update(batch, ["search_document"])
+    return changed
+
+
+@receiver(pre_save, sender=Application)
+def update_search_document(sender, instance, update_fields=None, **kwargs):
+    """Keeps the search document of an application in step with its fields."""
+    if update_fields is not None and not SEARCH_DOCUMENT_FIELDS & set(update_fields):
+        return
+    instance.search_document = build_search_document(instance)
+
+
+@receiver(post_save, sender=Application)
+def save_search_document(sender, instance, update_fields=None, **kwargs):
+    """Writes the search document when a partial save changed a searched field without it."""
+    if update_fields and "search_document" not in update_fields and SEARCH_DOCUMENT_FIELDS & set(update_fields):
+        Application.objects.filter(pk=instance.pk).update(search_document=instance.search_document)
+
+
+@receiver(pre_save, sender=Vacancy)
+def remember_vacancy_title(sender, instance, update_fields=None, **kwargs):
+    if instance._state.adding or (update_fields is not None and "title" not in update_fields):
+        instance._search_title_changed = False
+        return
+    old_title = Vacancy.objects.filter(pk=instance.pk).values_list("title", flat=True).first()
+    instance._search_title_changed = old_title is not None and old_title != instance.title
+
+
+@receiver(post_save, sender=Vacancy)
+def update_vacancy_search_documents(sender, instance, **kwargs):
+    """Rebuilds the search documents of a vacancy's applications when its title changes."""
+    if getattr(instance, "_search_title_changed", False):
+        rebuild_search_documents(Application.objects.filter(vacancy=instance))
+
+
+@receiver(post_migrate)
+def create_search_indexes(sender, using, **kwargs):
+    """
+    Creates the database specific search indexes after the recruitment app is migrated.
+
+    Model `Meta.indexes` can't express trigram or FTS5 indexes, so they are created here:
+    trigram indexes on PostgreSQL and an FTS5 table on SQLite. The statements are idempotent.
+    """
+    if sender.label != "recruitment":
+        return
+
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        statements = ["CREATE EXTENSION IF NOT EXISTS pg_trgm", *POSTGRESQL_SEARCH_INDEXES]
+    elif connection.vendor == "sqlite":
+        statements = SQLITE_SEARCH_INDEXES
+    else:
+        return
+
+    try:
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+    except DatabaseError as ex:
+        logger.warning("Could not create the search indexes: %s", ex)
@@ -0,0 +1,147 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from apps.utils.phone import mask_phone_number
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """Spaces calls evenly so that no more than `rate` of them start per second, across threads."""
+
+    def __init__(self, rate=None):
+        self.interval = 1 / rate if rate else 0
+        self.next_call = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_call - now
+            self.next_call = max(now, self.next_call) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+class SMSGateway:
+    """
+    Client for the SMS gateway's `sendmessage` API.
+
+    All requests go through one pooled HTTP session with a timeout, with the credentials
+    and message in the POST body so they never appear in URLs or logs. Server errors and
+    failures to connect are retried with exponential backoff. Client errors and read
+    timeouts fail straight away, as the gateway may already have accepted the message
+    and sending it again would deliver it twice. Requests are rate limited to the gateway's
+    contract, and `send_many` sends bulk messages with bounded concurrency.
+
+    Counters of sent and failed messages and of the total gateway latency are kept in
+    `stats` for the lifetime of the client.
+    """
+
+    def __init__(
+        self,
+        uri,
+        username,
+        password,
+        timeout=10,
+        max_retries=3,
+        backoff=0.5,
+        rate_limit=None,
+        max_workers=4,
+    ):
+        self.url = f"{uri}/api"
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_workers = max_workers
+        self.rate_limiter = RateLimiter(rate_limit)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.stats = {"sent": 0, "failed": 0, "latency": 0.0}
+        self.stats_lock = threading.Lock()
+
+    def record(self, sent, latency):
+        with self.stats_lock:
+            self.stats["sent" if sent else "failed"] += 1
+            self.stats["latency"] += latency
+
+    def send(self, recipient, message):
+        """
+        Sends a single SMS, retrying transient failures.
+
+        Args:
+            recipient (str): The phone number to send the message to.
+            message (str): The text of the message.
+
+        Returns:
+            bool: True if the gateway accepted the message, otherwise False.
+        """
+        params = {
+            "action": "sendmessage",
+            "username": self.username,
+            "password": self.password,
+            "recipient": recipient,
+            "messagetype": "SMS:TEXT",
+            "messagedata": message,
+        }
+
+        masked_recipient = mask_phone_number(recipient)
+        start = time.monotonic()
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+            self.rate_limiter.wait()
+
+            try:
+                response = self.session.post(self.url, data=params, timeout=self.timeout)
+            except requests.exceptions.ConnectionError as ex:
+                # Includes ConnectTimeout. Only the type is logged, the exception text can hold request details.
+                logger.warning("SMS to %s failed on attempt %d: %s", masked_recipient, attempt + 1, type(ex).__name__)
+                continue
+            except requests.exceptions.RequestException as ex:
+                logger.error(
+                    "SMS to %s failed, not retried as it may have been sent: %s", masked_recipient, type(ex).__name__
+                )
+                break
+
+            if response.status_code >= 500:
+                logger.warning(
+                    "SMS to %s failed on attempt %d with status %d", masked_recipient, attempt + 1, response.status_code
+                )
+                continue
+
+            if response.ok:
+                self.record(True, time.monotonic() - start)
+                return True
+
+            logger.error("SMS to %s rejected with status %d: %s", masked_recipient, response.status_code, response.text)
+            break
+
+        self.record(False, time.monotonic() - start)
+        return False
+
+    def send_many(self, messages):
+        """
+        Sends messages concurrently with at most `max_workers` requests in flight.
+
+        Args:
+            messages (list): (recipient, message) tuples.
+
+        Returns:
+            list: Whether each message was accepted, in the order given.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(lambda item: self.send(*item), messages))
@@ -0,0 +1,138 @@
+from functools import partial
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import ExtractYear
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Application, ApplicationYearSummary
+
+STATUS_FIELDS = {status.value for status in Application.STATUS}
+
+
+def get_summary_key(submitted_at, status):
+    """Returns the (year, status) an application submitted at `submitted_at` is counted under."""
+    return timezone.localtime(submitted_at).year, status
+
+
+def get_application_years():
+    """
+    Returns the years with at least one application, most recent first.
+
+    Returns:
+        list: The years as integers.
+    """
+    return list(ApplicationYearSummary.objects.filter(total__gt=0).values_list("year", flat=True))
+
+
+def add_to_summary(year, status):
+    changes = {"total": F("total") + 1}
+    if status in STATUS_FIELDS:
+        changes[status] = F(status) + 1
+
+    if ApplicationYearSummary.objects.filter(year=year).update(**changes):
+        return
+
+    try:
+        with transaction.atomic():
+            ApplicationYearSummary.objects.create(
+                year=year, total=1, **({status: 1} if status in STATUS_FIELDS else {})
+            )
+    except IntegrityError:
+        # Another application created the year first
+        ApplicationYearSummary.objects.filter(year=year).update(**changes)
+
+
+def remove_from_summary(year, status):
+    changes = {"total": F("total") - 1}
+    lookups = {"year": year, "total__gt": 0}
+    if status in STATUS_FIELDS:
+        changes[status] = F(status) - 1
+        lookups[f"{status}__gt"] = 0
+
+    ApplicationYearSummary.objects.filter(**lookups).update(**changes)
+    # Years without applications disappear from the filters
+    ApplicationYearSummary.objects.filter(year=year, total__lte=0).delete()
+
+
+def move_in_summary(year, old_status, new_status):
+    changes, lookups = {}, {"year": year}
+    if old_status in STATUS_FIELDS:
+        changes[old_status] = F(old_status) - 1
+        lookups[f"{old_status}__gt"] = 0
+    if new_status in STATUS_FIELDS:
+        changes[new_status] = F(new_status) + 1
+    if changes:
+        ApplicationYearSummary.objects.filter(**lookups).update(**changes)
+
+
+def rebuild_application_year_summary():
+    """
+    Recounts the year summary from the applications table with a single grouped query.
+
+    Needed once to fill the summary for existing applications, and after bulk operations
+    that bypass the model signals, such as `QuerySet.update()` or `bulk_create()`.
+
+    Returns:
+        int: The number of years with applications.
+    """
+    rows = (
+        Application.objects.annotate(year=ExtractYear("submitted_at"))
+        .values("year")
+        .annotate(
+            total=Count("id"),
+            **{status: Count("id", filter=Q(status=status)) for status in STATUS_FIELDS},
+        )
+        .order_by()
+    )
+    with transaction.atomic():
+        ApplicationYearSummary.objects.all().delete()
+        summaries = ApplicationYearSummary.objects.bulk_create([ApplicationYearSummary(**row) for row in rows])
+    return len(summaries)
+
+
+def schedule_summary_rebuild():
+    # Imported here, the tasks module imports this one
+    from .tasks import rebuild_application_year_summary_task
+
+    rebuild_application_year_summary_task.delay()
+
+
+@receiver(post_save, sender=Application)
+def update_summary_on_save(sender, instance, created, **kwargs):
+    """
+    Counts a new application, or moves a saved one to its new year and status.
+
+    The summary is changed once the saving transaction commits, in a statement of its own,
+    so concurrent applications don't wait on the row of the year while their transactions
+    are open. Changes lost between the commit and the update are corrected by the periodic
+    rebuild.
+    """
+    new = get_summary_key(instance.submitted_at, instance.status)
+
+    if created:
+        transaction.on_commit(partial(add_to_summary, *new))
+    else:
+        state = getattr(instance, "_summary_state", None)
+        if state is None:
+            # Loaded without its status or submission date, recount in the background
+            transaction.on_commit(schedule_summary_rebuild)
+        else:
+            old = get_summary_key(*state)
+            if old[0] == new[0]:
+                if old[1] != new[1]:
+                    transaction.on_commit(partial(move_in_summary, new[0], old[1], new[1]))
+            else:
+                transaction.on_commit(partial(remove_from_summary, *old))
+                transaction.on_commit(partial(add_to_summary, *new))
+
+    instance._summary_state = (instance.submitted_at, instance.status)
+
+
+@receiver(post_delete, sender=Application)
+def update_summary_on_delete(sender, instance, **kwargs):
+    """Stops counting a deleted application, once the deleting transaction commits."""
+    state = getattr(instance, "_summary_state", (instance.submitted_at, instance.status))
+    transaction.on_commit(partial(remove_from_summary, *get_summary_key(*state)))
@@ -1,15 +1,65 @@
+import logging
+from collections import Counter
+from smtplib import SMTPException
+
 from celery import shared_task
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 
 from .emails import (
-    send_interview_notification_email,
-    send_vacancy_application_notification_email,
+    dispatch_email_notifications,
+    queue_interview_notification_email,
+    queue_no_response_notification_emails,
+    queue_vacancy_application_notification_email,
 )
-from .models import Application, Interview
+from .exports import run_application_export
+from .models import Application, EmailNotification, Interview
+from .pipeline import reconcile_pipeline_counters, update_pipeline_counters
+from .summary import rebuild_application_year_summary
 from .texts import (
     send_vacancy_application_notification_text,
     send_vacancy_interview_notification_text,
 )
+from .uploads import purge_stale_cv_uploads
+
+logger = logging.getLogger(__name__)
+
+EMAIL_DISPATCH_SCHEDULED_KEY = "recruitment:email_dispatch_scheduled"
+
+
+def schedule_email_dispatch():
+    """
+    Schedules the batch email dispatcher after a notification has been queued.
+
+    The dispatcher runs straight away once `EMAIL_BATCH_SIZE` notifications are pending.
+    Otherwise the first notification of a window schedules a single run `EMAIL_BATCH_WINDOW`
+    seconds later, which picks up everything queued in the meantime.
+    """
+    if EmailNotification.objects.filter(status=EmailNotification.STATUS.PENDING).count() >= settings.EMAIL_BATCH_SIZE:
+        dispatch_email_notifications_task.delay()
+    elif cache.add(EMAIL_DISPATCH_SCHEDULED_KEY, True, settings.EMAIL_BATCH_WINDOW):
+        dispatch_email_notifications_task.apply_async(countdown=settings.EMAIL_BATCH_WINDOW)
+
+
+@shared_task(bind=True, max_retries=5, default_retry_delay=60, time_limit=settings.EMAIL_DISPATCH_TIME_LIMIT)
+def dispatch_email_notifications_task(self):
+    """
+    A Celery task to send queued notification emails in batches.
+
+    Each run sends one batch over a single connection and queues another run while
+    notifications are still pending. Connection failures are retried with a delay.
+    """
+    try:
+        sent, failed = dispatch_email_notifications()
+    except (SMTPException, OSError) as ex:
+        raise self.retry(exc=ex)
+
+    # Keep draining the outbox, backing off when nothing in the last batch could be sent
+    if (sent or failed) and EmailNotification.objects.filter(status=EmailNotification.STATUS.PENDING).exists():
+        dispatch_email_notifications_task.apply_async(countdown=0 if sent else settings.EMAIL_BATCH_WINDOW)
 
 
 @shared_task
@@ -18,14 +68,15 @@ def send_vacancy_application_notification_email_task(instance_id, created):
     A Celery task to send a vacancy application notification email.
 
     This task retrieves the Application instance using the provided instance ID
-    and calls the function to send an application notification email.
+    and queues the application notification email for the batch dispatcher.
 
     Args:
         instance_id (int): The ID of the Application instance.
         created (bool): A flag indicating whether the application was just created or updated.
     """
     instance = get_object_or_404(Application, pk=instance_id)
-    send_vacancy_application_notification_email(instance, created)
+    if queue_vacancy_application_notification_email(instance, created):
+        schedule_email_dispatch()
 
 
 @shared_task
@@ -50,14 +101,15 @@ def send_interview_notification_email_task(instance_id, created):
     A Celery task to send an interview notification email.
 
     This task retrieves the Interview instance using the provided instance ID
-    and calls the function to send an interview notification email.
+    and queues the interview notification email for the batch dispatcher.
 
     Args:
         instance_id (int): The ID of the Interview instance.
         created (bool): A flag indicating whether the interview was just created or updated.
     """
     instance = get_object_or_404(Interview, pk=instance_id)
-    send_interview_notification_email(instance, created)
+    if queue_interview_notification_email(instance, created):
+        schedule_email_dispatch()
 
 
 @shared_task
@@ -74,3 +126,92 @@ def send_interview_notification_text_task(instance_id, created):
     """
     instance = get_object_or_404(Interview, pk=instance_id)
     send_vacancy_interview_notification_text(instance, created)
+
+
+def sweep_interview_response_deadlines():
+    """
+    Marks every scheduled interview past its response deadline as not responded to.
+
+    The interviews are locked and flipped with a single UPDATE, which skips `Interview.save`,
+    its validation and the notification signals. Their follow-up emails are queued together
+    in the same transaction, so a sweep that fails part way leaves the interviews scheduled
+    for the next one, and the pipeline counters of their vacancies are adjusted once it
+    commits. Interviews locked by a concurrent sweep are skipped.
+
+    Returns:
+        dict: The number of interviews swept and follow-up emails queued.
+    """
+    now = timezone.now()
+    queued = []
+    with transaction.atomic():
+        interviews = list(
+            Interview.objects.select_for_update(skip_locked=True, of=("self",))
+            .filter(status=Interview.STATUS.SCHEDULED, response_deadline__lt=now)
+            .select_related("application__vacancy")
+        )
+        swept = Interview.objects.filter(pk__in=[interview.pk for interview in interviews]).update(
+            status=Interview.STATUS.NO_RESPONSE, updated_at=now
+        )
+
+        if swept:
+            for interview in interviews:
+                interview.status = Interview.STATUS.NO_RESPONSE
+                interview.updated_at = now
+            queued = queue_no_response_notification_emails(interviews)
+            transaction.on_commit(schedule_email_dispatch)
+
+            # Every swept interview left the scheduled status, so was counted as upcoming
+            swept_by_vacancy = Counter(interview.application.vacancy_id for interview in interviews)
+            for vacancy_id, count in swept_by_vacancy.items():
+                update_pipeline_counters(vacancy_id, {"upcoming_interviews": -count})
+
+    metrics = {"swept": swept, "queued": len(queued)}
+    logger.info("Interview response deadline sweep: %(swept)d swept, %(queued)d follow-ups queued", metrics)
+    return metrics
+
+
+@shared_task
+def sweep_interview_response_deadlines_task():
+    """
+    A periodic Celery task, run by beat, that sweeps interviews past their response deadline.
+    """
+    return sweep_interview_response_deadlines()
+
+
+@shared_task
+def export_applications_task(export_id):
+    """
+    A Celery task to write a background application export to disk.
+
+    Args:
+        export_id (str): The ID of the ApplicationExport instance.
+    """
+    run_application_export(export_id)
+
+
+@shared_task
+def reconcile_pipeline_counters_task():
+    """
+    A periodic Celery task, run by beat, that corrects drift in the pipeline counters.
+    """
+    drift = reconcile_pipeline_counters()
+    if drift["vacancies"] or drift["reviewers"]:
+        logger.warning("Pipeline counters drifted: %(vacancies)d vacancies, %(reviewers)d reviewers corrected", drift)
+    return drift
+
+
+@shared_task
+def rebuild_application_year_summary_task():
+    """
+    A Celery task, also run periodically by beat, that recounts the per-year application
+    summary and so corrects any drift.
+    """
+    return rebuild_application_year_summary()
+
+
+@shared_task
+def purge_stale_cv_uploads_task():
+    """
+    A periodic Celery task, run by beat, that deletes abandoned chunked CV uploads.
+    """
+    return purge_stale_cv_uploads()
@@ -0,0 +1,59 @@
+import os
+from functools import cached_property
+
+from django.conf import settings
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+
+class EmailTemplateEngine:
+    """
+    Jinja environment for the notification email templates.
+
+    Templates are loaded from `EMAIL_TEMPLATES_DIR`, whatever the working directory, and
+    their compiled bytecode is kept in `EMAIL_TEMPLATE_CACHE_DIR`, so only the first process
+    on a host compiles them. Templates are only checked for changes in `DEBUG`.
+    """
+
+    @cached_property
+    def env(self):
+        os.makedirs(settings.EMAIL_TEMPLATE_CACHE_DIR, exist_ok=True)
+        return Environment(
+            loader=FileSystemLoader(settings.EMAIL_TEMPLATES_DIR),
+            bytecode_cache=FileSystemBytecodeCache(settings.EMAIL_TEMPLATE_CACHE_DIR),
+            auto_reload=settings.DEBUG,
+        )
+
+    def get_template(self, template_name):
+        return self.env.get_template(template_name)
+
+    def warm(self):
+        """
+        Loads every email template, so the first emails sent by a worker don't compile them.
+
+        Returns:
+            list: The names of the loaded templates.
+        """
+        template_names = self.env.list_templates(extensions=["html"])
+        for template_name in template_names:
+            self.get_template(template_name)
+        return template_names
+
+    def render(self, template_name, **context):
+        return self.get_template(template_name).render(**context)
+
+    def render_many(self, template_name, contexts):
+        """
+        Renders one template for many contexts, looking the template up only once.
+
+        Args:
+            template_name (str): The name of the email template to be used.
+            contexts (iterable): A template context dict per body.
+
+        Returns:
+            list: The rendered bodies, in the order of the contexts.
+        """
+        template = self.get_template(template_name)
+        return [template.render(**context) for context in contexts]
+
+
+email_templates = EmailTemplateEngine()
@@ -0,0 +1,142 @@
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.auth.models import Group
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.recruitment.admin import InterviewAdmin
+from apps.recruitment.models import Application, Vacancy
+
+
+class VacancyFilterTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="reviewer@example.com", first_name="Test", last_name="Reviewer")
+        self.user.groups.add(Group.objects.create(name="recruiter"))
+        self.client.force_login(self.user)
+
+        deadline = timezone.now() + timedelta(days=7)
+        self.engineer = Vacancy.objects.create(title="Software Engineer", deadline=deadline)
+        self.tester = Vacancy.objects.create(title="Software Tester", deadline=deadline)
+        self.accountant = Vacancy.objects.create(title="Accountant", deadline=deadline)
+        self.engineer.reviewers.add(self.user)
+        self.accountant.reviewers.add(self.user)
+
+    def test_options_are_searched_and_scoped_to_reviewer(self):
+        url = reverse("Recruitment:recruitment_application_vacancy_options")
+        response = self.client.get(url, {"term": "soft", "query": "?status=submitted"})
+
+        self.assertContains(response, "Software Engineer")
+        self.assertContains(response, f"?status=submitted&amp;vacancy={self.engineer.id}")
+        self.assertNotContains(response, "Software Tester")
+        self.assertNotContains(response, "Accountant")
+
+    def test_options_are_paginated(self):
+        url = reverse("Recruitment:recruitment_interview_vacancy_options")
+        with mock.patch.object(InterviewAdmin, "vacancy_options_per_page", 1):
+            response = self.client.get(url)
+
+        self.assertEqual(len(response.context["options"]), 1)
+        self.assertIn("page=2", response.context["next_url"])
+
+    def test_changelist_shows_only_selected_vacancy(self):
+        url = reverse("Recruitment:recruitment_application_changelist")
+        response = self.client.get(url, {"vacancy": str(self.engineer.id)})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Software Engineer")
+        self.assertNotContains(response, "Accountant")
+
+
+class ApplicationSearchTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="reviewer@example.com", first_name="Test", last_name="Reviewer")
+        self.user.groups.add(Group.objects.create(name="recruiter"))
+        self.client.force_login(self.user)
+
+        deadline = timezone.now() + timedelta(days=7)
+        self.vacancy = Vacancy.objects.create(title="Software Engineer", deadline=deadline)
+        self.vacancy.reviewers.add(self.user)
+        self.johanna = self.create_application("Jöhanna", "Shikongo", "jshikongo@example.com", "+264811234567")
+        self.john = self.create_application("John", "Johnson", "jj@example.com", "+264812222222")
+        self.maria = self.create_application("Maria", "Nghipandulwa", "maria@example.com", "+264813333333")
+
+    def create_application(self, first_name, last_name, email, primary_contact):
+        return Application.objects.create(
+            vacancy=self.vacancy,
+            first_name=first_name,
+            last_name=last_name,
+            email=email,
+            primary_contact=primary_contact,
+            date_of_birth=date(1990, 1, 1),
+        )
+
+    def search(self, term):
+        response = self.client.get(reverse("Recruitment:recruitment_application_changelist"), {"q": term})
+        return list(response.context["cl"].result_list)
+
+    def test_search_document_is_normalised(self):
+        self.assertEqual(
+            self.johanna.search_document,
+            "johanna shikongo jshikongo@example.com 264811234567 0811234567 software engineer",
+        )
+
+    def test_search_matches_names_email_and_phone(self):
+        self.assertEqual(self.search("johanna"), [self.johanna])
+        self.assertEqual(self.search("MARIA@example"), [self.maria])
+        self.assertEqual(self.search("081 222"), [self.john])
+        self.assertEqual(self.search("jo shikongo"), [self.johanna])
+
+    def test_search_results_are_ranked(self):
+        johnathan = self.create_application("Johnathan", "Amutenya", "ja@example.com", "+264814444444")
+
+        # "john" appears twice in John Johnson's document and once in Johnathan's
+        self.assertEqual(self.search("john"), [self.john, johnathan])
+
+    def test_vacancy_rename_updates_search_documents(self):
+        self.vacancy.title = "Data Analyst"
+        self.vacancy.save()
+
+        self.assertEqual(len(self.search("analyst")), 3)
+        self.assertEqual(self.search("engineer"), [])
+
+    def test_interview_autocomplete_uses_search(self):
+        response = self.client.get(
+            reverse("Recruitment:autocomplete"),
+            {"app_label": "recruitment", "model_name": "interview", "field_name": "application", "term": "0813333"},
+        )
+
+        self.assertEqual([result["id"] for result in response.json()["results"]], [str(self.maria.pk)])
+
+
+class VacancyPipelineColumnsTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="reviewer@example.com", first_name="Test", last_name="Reviewer")
+        self.user.groups.add(Group.objects.create(name="recruiter"))
+        self.client.force_login(self.user)
+
+        deadline = timezone.now() + timedelta(days=7)
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(3):
+                vacancy = Vacancy.objects.create(title=f"Vacancy {i}", deadline=deadline)
+                vacancy.reviewers.add(self.user)
+                for j in range(i):
+                    Application.objects.create(
+                        vacancy=vacancy,
+                        first_name="Test",
+                        last_name=f"User{j}",
+                        email=f"user{i}{j}@example.com",
+                        primary_contact=f"+2648112345{i}{j}",
+                        date_of_birth=date(1990, 1, 1),
+                    )
+
+    def test_counts_are_read_from_pipeline_counters(self):
+        url = reverse("Recruitment:recruitment_vacancy_changelist")
+        response = self.client.get(url, {"o": "-5"})
+
+        self.assertEqual(
+            [vacancy.pipeline.applications for vacancy in response.context["cl"].result_list], [2, 1, 0]
+        )
+        self.assertContains(response, "Awaiting review")
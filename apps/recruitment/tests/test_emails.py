@@ -0,0 +1,115 @@
+import os
+import tempfile
+from datetime import date, timedelta
+from smtplib import SMTPRecipientsRefused
+
+from django.conf import settings
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.recruitment.emails import (
+    claim_email_notifications,
+    dispatch_email_notifications,
+    queue_vacancy_application_notification_email,
+    render_many,
+)
+from apps.recruitment.models import Application, EmailNotification, Vacancy
+from apps.recruitment.templating import EmailTemplateEngine
+
+
+class RejectingEmailBackend(EmailBackend):
+    """Rejects messages to one recipient, like a relay refusing a bad address."""
+
+    def send_messages(self, messages):
+        for message in messages:
+            if "bad@example.com" in message.to:
+                raise SMTPRecipientsRefused({"bad@example.com": (550, b"Mailbox unavailable")})
+        return super().send_messages(messages)
+
+
+@override_settings(EMAIL_MAX_ATTEMPTS=2)
+class EmailDispatchTest(TestCase):
+    def setUp(self):
+        self.vacancy = Vacancy.objects.create(title="Test Vacancy", deadline=timezone.now() + timedelta(days=7))
+
+    def queue(self, i, email=None):
+        application = Application.objects.create(
+            vacancy=self.vacancy,
+            first_name="Test",
+            last_name=f"User{i}",
+            email=email or f"user{i}@example.com",
+            primary_contact=f"+26481123456{i}",
+            date_of_birth=date(1990, 1, 1),
+        )
+        return queue_vacancy_application_notification_email(application, created=True)
+
+    def test_batch_sent_in_one_go(self):
+        for i in range(3):
+            self.queue(i)
+
+        self.assertEqual(dispatch_email_notifications(), (3, 0))
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(mail.outbox[0].subject, "Application Submitted")
+        self.assertIn("Test User0", mail.outbox[0].body)
+        self.assertFalse(EmailNotification.objects.exclude(status=EmailNotification.STATUS.SENT).exists())
+
+    def test_batch_size_is_respected(self):
+        for i in range(3):
+            self.queue(i)
+
+        self.assertEqual(dispatch_email_notifications(batch_size=2), (2, 0))
+        self.assertEqual(EmailNotification.objects.filter(status=EmailNotification.STATUS.PENDING).count(), 1)
+
+    def test_failed_message_is_isolated_and_retried(self):
+        self.queue(0)
+        bad = self.queue(1, email="bad@example.com")
+        self.queue(2)
+
+        self.assertEqual(dispatch_email_notifications(connection=RejectingEmailBackend()), (2, 1))
+        bad.refresh_from_db()
+        self.assertEqual(bad.status, EmailNotification.STATUS.PENDING)
+        self.assertEqual(bad.attempts, 1)
+
+        self.assertEqual(dispatch_email_notifications(connection=RejectingEmailBackend()), (0, 1))
+        bad.refresh_from_db()
+        self.assertEqual(bad.status, EmailNotification.STATUS.FAILED)
+        self.assertIn("Mailbox unavailable", bad.last_error)
+
+    def test_batch_of_interrupted_worker_is_reclaimed(self):
+        notification = self.queue(0)
+        # A worker claimed the notification and was killed before recording the outcome
+        self.assertEqual(claim_email_notifications(batch_size=10), [notification.id])
+
+        self.assertEqual(dispatch_email_notifications(), (0, 0))
+        EmailNotification.objects.update(claimed_at=timezone.now() - timedelta(seconds=settings.EMAIL_CLAIM_LEASE + 1))
+
+        self.assertEqual(dispatch_email_notifications(), (1, 0))
+        notification.refresh_from_db()
+        self.assertEqual(notification.status, EmailNotification.STATUS.SENT)
+
+
+class EmailTemplateEngineTest(TestCase):
+    def test_warm_writes_bytecode_cache(self):
+        with tempfile.TemporaryDirectory() as cache_dir, override_settings(EMAIL_TEMPLATE_CACHE_DIR=cache_dir):
+            engine = EmailTemplateEngine()
+
+            self.assertCountEqual(
+                engine.warm(),
+                ["accepted.html", "interview.html", "no_response.html", "rejected.html", "submitted.html"],
+            )
+            self.assertEqual(len(os.listdir(cache_dir)), 5)
+
+    def test_render_many(self):
+        vacancy = Vacancy.objects.create(title="Test Vacancy", deadline=timezone.now() + timedelta(days=7))
+        applications = [
+            Application(vacancy=vacancy, first_name="Test", last_name=f"User{i}", email=f"user{i}@example.com")
+            for i in range(3)
+        ]
+
+        bodies = render_many("submitted.html", applications)
+
+        self.assertEqual(len(bodies), 3)
+        for i, body in enumerate(bodies):
+            self.assertIn(f"Test User{i}", body)
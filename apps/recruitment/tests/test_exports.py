@@ -0,0 +1,116 @@
+import csv
+import shutil
+import tempfile
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.auth.models import Group
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from openpyxl import load_workbook
+
+from apps.accounts.models import User
+from apps.recruitment.exports import run_application_export
+from apps.recruitment.models import Application, ApplicationExport, Vacancy
+
+
+class ApplicationExportTest(TestCase):
+    def setUp(self):
+        self.export_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.export_root, ignore_errors=True)
+        settings_override = override_settings(EXPORT_ROOT=self.export_root, EXPORT_CHUNK_SIZE=2)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = User.objects.create_user(email="reviewer@example.com", first_name="Test", last_name="Reviewer")
+        self.user.groups.add(Group.objects.create(name="recruiter"))
+        self.client.force_login(self.user)
+
+        deadline = timezone.now() + timedelta(days=7)
+        self.vacancy = Vacancy.objects.create(title="Software Engineer", deadline=deadline)
+        self.vacancy.reviewers.add(self.user)
+        other = Vacancy.objects.create(title="Accountant", deadline=deadline)
+        for i, vacancy in enumerate([self.vacancy] * 3 + [other]):
+            Application.objects.create(
+                vacancy=vacancy,
+                first_name="Test",
+                last_name=f"User{i}",
+                email=f"user{i}@example.com",
+                primary_contact=f"+26481123456{i}",
+                date_of_birth=date(1990, 1, 1),
+            )
+
+    def test_export_streams_reviewable_applications_to_csv(self):
+        export = ApplicationExport.objects.create(requested_by=self.user)
+
+        export = run_application_export(export.pk)
+
+        self.assertEqual(export.status, ApplicationExport.STATUS.DONE)
+        self.assertEqual((export.rows_done, export.rows_total, export.progress), (3, 3, 100))
+        with export.file.open("rb") as f:
+            rows = list(csv.reader(f.read().decode("utf-8-sig").splitlines()))
+        self.assertEqual(rows[0][:2], ["Vacancy", "First name"])
+        self.assertEqual([row[3] for row in rows[1:]], ["User0", "User1", "User2"])
+        self.assertEqual(rows[1][5], "+264811234560")
+
+    def test_export_streams_reviewable_applications_to_xlsx(self):
+        export = ApplicationExport.objects.create(requested_by=self.user, file_format=ApplicationExport.FORMAT.XLSX)
+
+        export = run_application_export(export.pk)
+
+        self.assertEqual(export.status, ApplicationExport.STATUS.DONE)
+        self.assertTrue(export.file.name.endswith(".xlsx"))
+        with export.file.open("rb") as f:
+            rows = list(load_workbook(f, read_only=True)["Applications"].iter_rows(values_only=True))
+        self.assertEqual(rows[0][:2], ("Vacancy", "First name"))
+        self.assertEqual([row[3] for row in rows[1:]], ["User0", "User1", "User2"])
+        self.assertEqual(rows[1][5], "+264811234560")
+
+    def test_failed_export_is_recorded(self):
+        export = ApplicationExport.objects.create(requested_by=self.user)
+
+        writer = mock.Mock(side_effect=OSError("Disk full"))
+        with mock.patch.dict("apps.recruitment.exports.WRITERS", {ApplicationExport.FORMAT.CSV: writer}):
+            export = run_application_export(export.pk)
+
+        self.assertEqual(export.status, ApplicationExport.STATUS.FAILED)
+        self.assertEqual(export.error, "Disk full")
+        self.assertFalse(export.file)
+
+    @mock.patch("apps.recruitment.admin.export_applications_task")
+    def test_export_is_started_polled_and_downloaded(self, task):
+        url = reverse("Recruitment:recruitment_application_background_export")
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url, {"file_format": "csv", "year": ""})
+
+        export = ApplicationExport.objects.get()
+        task.delay.assert_called_once_with(str(export.pk))
+        status_url = reverse("Recruitment:recruitment_application_background_export_status", args=[export.pk])
+        self.assertRedirects(response, status_url)
+
+        response = self.client.get(status_url, headers={"HX-Request": "true"})
+        self.assertContains(response, 'hx-trigger="every 2s"')
+
+        run_application_export(export.pk)
+        response = self.client.get(status_url, headers={"HX-Request": "true"})
+        self.assertNotContains(response, "hx-trigger")
+
+        download_url = reverse("Recruitment:recruitment_application_background_export_download", args=[export.pk])
+        response = self.client.get(download_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("attachment", response["Content-Disposition"])
+
+    def test_exports_of_other_users_are_not_served(self):
+        other = User.objects.create_user(email="other@example.com", first_name="Other", last_name="Reviewer")
+        export = run_application_export(ApplicationExport.objects.create(requested_by=other).pk)
+
+        url = reverse("Recruitment:recruitment_application_background_export_download", args=[export.pk])
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_changelist_links_background_export(self):
+        response = self.client.get(reverse("Recruitment:recruitment_application_changelist"))
+
+        self.assertContains(response, reverse("Recruitment:recruitment_application_background_export"))
+        response = self.client.get(reverse("Recruitment:recruitment_application_background_export"))
+        self.assertContains(response, "Start export")
@@ -0,0 +1,52 @@
+from datetime import timedelta
+
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+
+from apps.recruitment.forms import ApplicationForm
+from apps.recruitment.models import MinimumRequirement, SelectQuestionTypeOptions, Vacancy
+
+
+class ApplicationFormRequirementSchemaTest(TestCase):
+    def setUp(self):
+        self.vacancy = Vacancy.objects.create(title="Test Vacancy", deadline=timezone.now() + timedelta(days=7))
+        for i in range(5):
+            requirement = MinimumRequirement.objects.create(
+                vacancy=self.vacancy,
+                title=f"Select requirement {i}",
+                question_type=MinimumRequirement.QuestionType.SELECT,
+            )
+            SelectQuestionTypeOptions.objects.create(requirement=requirement, option="Yes")
+            SelectQuestionTypeOptions.objects.create(requirement=requirement, option="No")
+        MinimumRequirement.objects.create(vacancy=self.vacancy, title="Internal only", is_internal=True)
+
+        self.request = RequestFactory().get("/")
+        self.request.is_intranet = False
+
+    def test_requirement_fields_are_built(self):
+        form = ApplicationForm(self.vacancy, request=self.request)
+        select_fields = [name for name in form.fields if name.startswith("requirement_")]
+
+        self.assertEqual(len(select_fields), 5)
+        self.assertEqual(form.fields[select_fields[0]].choices, [("Yes", "Yes"), ("No", "No")])
+
+    def test_schema_is_built_once(self):
+        with self.assertNumQueries(2):
+            ApplicationForm(self.vacancy, request=self.request)
+        with self.assertNumQueries(0):
+            ApplicationForm(self.vacancy, request=self.request)
+
+    def test_schema_invalidated_when_option_changes(self):
+        ApplicationForm(self.vacancy, request=self.request)
+        requirement = self.vacancy.requirements.filter(question_type=MinimumRequirement.QuestionType.SELECT).first()
+        SelectQuestionTypeOptions.objects.create(requirement=requirement, option="Maybe")
+
+        form = ApplicationForm(self.vacancy, request=self.request)
+        self.assertIn(("Maybe", "Maybe"), form.fields[f"requirement_{requirement.id}"].choices)
+
+    def test_schema_invalidated_when_requirement_deleted(self):
+        ApplicationForm(self.vacancy, request=self.request)
+        self.vacancy.requirements.filter(question_type=MinimumRequirement.QuestionType.SELECT).first().delete()
+
+        form = ApplicationForm(self.vacancy, request=self.request)
+        self.assertEqual(len([name for name in form.fields if name.startswith("requirement_")]), 4)
@@ -0,0 +1,47 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from apps.recruitment.middleware import InternalAccessMiddleware, IPRangeClassifier, parse_ip_range
+
+
+class IPRangeClassifierTest(SimpleTestCase):
+    def test_legacy_prefixes_are_parsed_by_octet(self):
+        self.assertEqual(str(parse_ip_range("192.168")), "192.168.0.0/16")
+        self.assertEqual(str(parse_ip_range("127.0.")), "127.0.0.0/16")
+        self.assertEqual(str(parse_ip_range("10.1.2.3")), "10.1.2.3/32")
+        with self.assertRaises(ImproperlyConfigured):
+            parse_ip_range("intranet")
+
+    def test_addresses_are_matched_against_merged_ranges(self):
+        classifier = IPRangeClassifier(["10.0.0.0/16", "10.0.128.0/17", "10.1.0.0/16", "172.16.0.0/12", "fd00::/8"])
+
+        self.assertIn("10.0.200.1", classifier)
+        self.assertIn("10.1.255.255", classifier)
+        self.assertIn("172.31.0.1", classifier)
+        self.assertIn("fd12::1", classifier)
+        self.assertIn("::ffff:10.0.0.1", classifier)
+        self.assertNotIn("10.2.0.0", classifier)
+        self.assertNotIn("9.255.255.255", classifier)
+        self.assertNotIn("fe80::1", classifier)
+        self.assertNotIn("", classifier)
+        self.assertNotIn("not-an-ip", classifier)
+
+
+@override_settings(INTRANET_IP_RANGES=["192.168.0.0/16"])
+class InternalAccessMiddlewareTest(SimpleTestCase):
+    def is_intranet(self, **meta):
+        request = RequestFactory().get("/", **meta)
+        InternalAccessMiddleware(lambda request: HttpResponse())(request)
+        return request.is_intranet
+
+    @override_settings(INTRANET_TRUSTED_PROXY_COUNT=1)
+    def test_client_is_the_address_the_proxy_received_from(self):
+        self.assertTrue(self.is_intranet(REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR="192.168.1.5"))
+        # A spoofed entry is ignored, the client is the entry appended by the proxy
+        self.assertFalse(self.is_intranet(REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR="192.168.1.5, 8.8.8.8"))
+        self.assertTrue(self.is_intranet(REMOTE_ADDR="192.168.1.5"))
+
+    @override_settings(INTRANET_TRUSTED_PROXY_COUNT=0)
+    def test_forwarded_for_is_ignored_without_proxies(self):
+        self.assertFalse(self.is_intranet(REMOTE_ADDR="8.8.8.8", HTTP_X_FORWARDED_FOR="192.168.1.5"))
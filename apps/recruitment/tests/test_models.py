@@ -0,0 +1,283 @@
+import os
+import shutil
+import tempfile
+from datetime import date, timedelta
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.db import IntegrityError
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.recruitment.models import (
+    Application,
+    ApplicationYearSummary,
+    Interview,
+    ReviewerPipeline,
+    Vacancy,
+    VacancyPipeline,
+)
+from apps.recruitment.pipeline import COUNTER_FIELDS, reconcile_pipeline_counters
+from apps.recruitment.summary import get_application_years, rebuild_application_year_summary
+from apps.utils.phone import normalise_phone_number, to_e164, to_phone_number
+from apps.utils.storage import content_addressed_storage
+
+
+class ApplicationCVStorageTest(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.vacancies = [
+            Vacancy.objects.create(title=f"Test Vacancy {i}", deadline=timezone.now() + timedelta(days=7))
+            for i in range(2)
+        ]
+
+    def create_application(self, vacancy, content):
+        application = Application(
+            vacancy=vacancy,
+            first_name="Test",
+            last_name="User",
+            email="test@example.com",
+            primary_contact="+264811234567",
+            date_of_birth=date(1990, 1, 1),
+        )
+        application.cv.save("My CV.pdf", ContentFile(content), save=False)
+        application.save()
+        return application
+
+    def test_identical_cvs_share_one_file(self):
+        first = self.create_application(self.vacancies[0], b"%PDF-1.4 same cv")
+        second = self.create_application(self.vacancies[1], b"%PDF-1.4 same cv")
+
+        self.assertEqual(first.cv.name, second.cv.name)
+        self.assertRegex(first.cv.name, r"^cv/[0-9a-f]{2}/[0-9a-f]{64}\.pdf$")
+        self.assertTrue(content_addressed_storage.exists(first.cv.name))
+
+    def test_different_cvs_are_stored_separately(self):
+        first = self.create_application(self.vacancies[0], b"%PDF-1.4 first cv")
+        second = self.create_application(self.vacancies[1], b"%PDF-1.4 second cv")
+
+        self.assertNotEqual(first.cv.name, second.cv.name)
+
+    def test_unreferenced_file_is_collected_after_grace_period(self):
+        first = self.create_application(self.vacancies[0], b"%PDF-1.4 same cv")
+        second = self.create_application(self.vacancies[1], b"%PDF-1.4 same cv")
+        name = first.cv.name
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertEqual(content_addressed_storage.collect_garbage(grace_period=0), 0)
+        self.assertTrue(content_addressed_storage.exists(name))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertTrue(content_addressed_storage.exists(name))
+        self.assertEqual(content_addressed_storage.collect_garbage(grace_period=60), 0)
+        self.assertEqual(content_addressed_storage.collect_garbage(grace_period=0), 1)
+        self.assertFalse(content_addressed_storage.exists(name))
+
+    def test_reused_file_is_kept_until_its_row_is_committed(self):
+        first = self.create_application(self.vacancies[0], b"%PDF-1.4 same cv")
+        path = content_addressed_storage.path(first.cv.name)
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        os.utime(path, (0, 0))
+
+        # Saved again for a new application whose row is not written yet
+        name = content_addressed_storage.save("cv/My CV.pdf", ContentFile(b"%PDF-1.4 same cv"))
+
+        self.assertEqual(content_addressed_storage.collect_garbage(grace_period=60), 0)
+        self.assertTrue(content_addressed_storage.exists(name))
+
+
+class ApplicationYearSummaryTest(TestCase):
+    def setUp(self):
+        self.vacancy = Vacancy.objects.create(title="Test Vacancy", deadline=timezone.now() + timedelta(days=7))
+
+    def create_application(self, i, year):
+        return Application.objects.create(
+            vacancy=self.vacancy,
+            first_name="Test",
+            last_name=f"User{i}",
+            email=f"user{i}@example.com",
+            primary_contact=f"+26481123456{i}",
+            date_of_birth=date(1990, 1, 1),
+            submitted_at=timezone.now().replace(year=year),
+        )
+
+    def get_counts(self, year):
+        return ApplicationYearSummary.objects.values("total", "submitted", "accepted", "rejected").get(year=year)
+
+    def test_summary_follows_applications(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            first = self.create_application(0, 2023)
+            self.create_application(1, 2023)
+            self.create_application(2, 2024)
+        self.assertEqual(get_application_years(), [2024, 2023])
+        self.assertEqual(self.get_counts(2023), {"total": 2, "submitted": 2, "accepted": 0, "rejected": 0})
+
+        first = Application.objects.get(pk=first.pk)
+        first.status = Application.STATUS.ACCEPTED
+        with self.captureOnCommitCallbacks(execute=True):
+            first.save()
+        self.assertEqual(self.get_counts(2023), {"total": 2, "submitted": 1, "accepted": 1, "rejected": 0})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Application.objects.get(last_name="User2").delete()
+        self.assertEqual(get_application_years(), [2023])
+
+    def test_summary_changes_wait_for_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.create_application(0, 2023)
+        self.assertFalse(ApplicationYearSummary.objects.exists())
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.get_counts(2023)["total"], 1)
+
+    @mock.patch("apps.recruitment.tasks.rebuild_application_year_summary_task.delay")
+    def test_save_without_loaded_state_schedules_rebuild(self, delay):
+        with self.captureOnCommitCallbacks(execute=True):
+            application = self.create_application(0, 2023)
+        application = Application.objects.only("pk", "vacancy").get(pk=application.pk)
+        application.first_name = "Changed"
+
+        with self.captureOnCommitCallbacks(execute=True):
+            application.save()
+        delay.assert_called_once_with()
+
+    def test_rebuild_matches_incremental_summary(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for i, year in enumerate([2022, 2023, 2023]):
+                self.create_application(i, year)
+        Application.objects.filter(last_name="User1").update(status=Application.STATUS.REJECTED)
+
+        self.assertEqual(rebuild_application_year_summary(), 2)
+        self.assertEqual(self.get_counts(2023), {"total": 2, "submitted": 1, "accepted": 0, "rejected": 1})
+
+
+class PipelineCountersTest(TestCase):
+    def setUp(self):
+        self.reviewer = User.objects.create_user(email="reviewer@example.com", first_name="Test", last_name="Reviewer")
+        self.other_reviewer = User.objects.create_user(
+            email="other@example.com", first_name="Other", last_name="Reviewer"
+        )
+        deadline = timezone.now() + timedelta(days=7)
+        self.vacancy = Vacancy.objects.create(title="Software Engineer", deadline=deadline)
+        self.other_vacancy = Vacancy.objects.create(title="Accountant", deadline=deadline)
+        self.vacancy.reviewers.add(self.reviewer, self.other_reviewer)
+        self.other_vacancy.reviewers.add(self.reviewer)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.applications = [self.create_application(i, self.vacancy) for i in range(3)]
+            self.create_application(3, self.other_vacancy)
+
+        self.schedule_datetime = timezone.now() + timedelta(days=7)
+        while self.schedule_datetime.weekday() >= 5:
+            self.schedule_datetime += timedelta(days=1)
+
+    def create_application(self, i, vacancy):
+        return Application.objects.create(
+            vacancy=vacancy,
+            first_name="Test",
+            last_name=f"User{i}",
+            email=f"user{i}@example.com",
+            primary_contact=f"+26481123456{i}",
+            date_of_birth=date(1990, 1, 1),
+        )
+
+    def get_counts(self, counters):
+        counters.refresh_from_db()
+        return {field: getattr(counters, field) for field in COUNTER_FIELDS}
+
+    def test_counters_follow_applications_and_interviews(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            application = Application.objects.get(pk=self.applications[0].pk)
+            application.status = Application.STATUS.ACCEPTED
+            application.save()
+            interview = Interview.objects.create(
+                application=application,
+                schedule_datetime=self.schedule_datetime,
+                status=Interview.STATUS.SCHEDULED,
+            )
+            interview = Interview.objects.get(pk=interview.pk)
+            interview.status = Interview.STATUS.DONE
+            interview.save()
+            Interview.objects.create(
+                application=self.applications[1],
+                schedule_datetime=self.schedule_datetime,
+                status=Interview.STATUS.SCHEDULED,
+            )
+            Application.objects.get(pk=self.applications[2].pk).delete()
+
+        expected = {
+            "applications": 2,
+            "submitted": 1,
+            "accepted": 1,
+            "rejected": 0,
+            "interviews": 2,
+            "upcoming_interviews": 1,
+        }
+        self.assertEqual(self.get_counts(self.vacancy.pipeline), expected)
+        self.assertEqual(self.get_counts(ReviewerPipeline.objects.get(user=self.other_reviewer)), expected)
+        self.assertEqual(
+            self.get_counts(ReviewerPipeline.objects.get(user=self.reviewer)),
+            {**expected, "applications": 3, "submitted": 2},
+        )
+
+    def test_counter_changes_wait_for_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.create_application(4, self.vacancy)
+        self.assertEqual(self.get_counts(self.vacancy.pipeline)["applications"], 3)
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.get_counts(self.vacancy.pipeline)["applications"], 4)
+
+    def test_reviewer_counters_follow_vacancy_reviewers(self):
+        self.vacancy.reviewers.remove(self.reviewer)
+        self.assertEqual(ReviewerPipeline.objects.get(user=self.reviewer).submitted, 1)
+
+        self.vacancy.reviewers.clear()
+        self.assertEqual(ReviewerPipeline.objects.get(user=self.other_reviewer).submitted, 0)
+
+    def test_reconciliation_corrects_drift(self):
+        self.assertEqual(reconcile_pipeline_counters(), {"vacancies": 0, "reviewers": 0})
+
+        Application.objects.filter(pk=self.applications[0].pk).update(status=Application.STATUS.REJECTED)
+        VacancyPipeline.objects.filter(vacancy=self.other_vacancy).delete()
+
+        self.assertEqual(reconcile_pipeline_counters(), {"vacancies": 2, "reviewers": 2})
+        self.assertEqual(self.get_counts(self.vacancy.pipeline)["rejected"], 1)
+        self.assertEqual(VacancyPipeline.objects.get(vacancy=self.other_vacancy).applications, 1)
+
+
+class PhoneNumberNormalisationTest(SimpleTestCase):
+    def test_numbers_are_normalised_to_e164(self):
+        for value in ["+264811234567", "0811234567", "+264 81 123 4567", "(081) 123-4567", "264811234567"]:
+            self.assertEqual(normalise_phone_number(value), "+264811234567", value)
+        self.assertEqual(normalise_phone_number("+27821234567"), "+27821234567")
+        self.assertEqual(normalise_phone_number(to_phone_number("0601234567")), "+264601234567")
+
+    def test_invalid_numbers_agree_with_full_parsing(self):
+        # 86 and 88 aren't Namibian mobile ranges, so they miss the fast path and fail parsing
+        for value in ["0861234567", "0881234567", "081123456", "not a number"]:
+            self.assertIsNone(normalise_phone_number(value), value)
+        self.assertEqual(to_e164("081123456"), "081123456")
+
+
+class ApplicationPhoneNumberTest(TestCase):
+    def test_primary_contact_is_unique_per_vacancy_in_any_format(self):
+        vacancy = Vacancy.objects.create(title="Software Engineer", deadline=timezone.now() + timedelta(days=7))
+        fields = {"vacancy": vacancy, "first_name": "Test", "last_name": "User", "date_of_birth": date(1990, 1, 1)}
+        Application.objects.create(email="one@example.com", primary_contact="081 123 4567", **fields)
+
+        self.assertTrue(Application.objects.filter(primary_contact="+264811234567").exists())
+        self.assertEqual(str(Application.objects.get().primary_contact), "+264811234567")
+        with self.assertRaises(IntegrityError):
+            Application.objects.create(email="two@example.com", primary_contact="+264811234567", **fields)
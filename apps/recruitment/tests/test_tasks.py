@@ -0,0 +1,78 @@
+from datetime import date, timedelta
+from unittest import mock
+
+from django.db import DatabaseError
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.recruitment.models import Application, EmailNotification, Interview, Vacancy
+from apps.recruitment.tasks import sweep_interview_response_deadlines
+
+
+@mock.patch("apps.recruitment.tasks.schedule_email_dispatch")
+class InterviewResponseDeadlineSweepTest(TestCase):
+    def setUp(self):
+        vacancy = Vacancy.objects.create(title="Test Vacancy", deadline=timezone.now() + timedelta(days=7))
+        schedule_datetime = timezone.now() + timedelta(days=7)
+        while schedule_datetime.weekday() >= 5:
+            schedule_datetime += timedelta(days=1)
+
+        self.interviews = []
+        for i in range(3):
+            application = Application.objects.create(
+                vacancy=vacancy,
+                first_name="Test",
+                last_name=f"User{i}",
+                email=f"user{i}@example.com",
+                primary_contact=f"+26481123456{i}",
+                date_of_birth=date(1990, 1, 1),
+            )
+            self.interviews.append(
+                Interview.objects.create(
+                    application=application,
+                    schedule_datetime=schedule_datetime,
+                    status=Interview.STATUS.SCHEDULED,
+                )
+            )
+
+    def expire(self, interview):
+        Interview.objects.filter(pk=interview.pk).update(response_deadline=timezone.now() - timedelta(hours=1))
+
+    def test_only_expired_interviews_are_swept(self, schedule_email_dispatch):
+        self.expire(self.interviews[0])
+        self.expire(self.interviews[1])
+        Interview.objects.filter(pk=self.interviews[1].pk).update(status=Interview.STATUS.ACCEPTED)
+
+        # In one transaction: expired interviews, sweep and outbox insert. The counters follow the commit.
+        with self.captureOnCommitCallbacks(execute=True), self.assertNumQueries(5):
+            metrics = sweep_interview_response_deadlines()
+
+        self.assertEqual(metrics, {"swept": 1, "queued": 1})
+        self.assertEqual(
+            list(Interview.objects.filter(status=Interview.STATUS.NO_RESPONSE)), [self.interviews[0]]
+        )
+        notification = EmailNotification.objects.get()
+        self.assertEqual(notification.interview, self.interviews[0])
+        self.assertEqual(notification.template_name, "no_response.html")
+        schedule_email_dispatch.assert_called_once()
+
+    def test_failed_sweep_leaves_interviews_scheduled(self, schedule_email_dispatch):
+        self.expire(self.interviews[0])
+
+        with (
+            mock.patch("apps.recruitment.tasks.queue_no_response_notification_emails", side_effect=DatabaseError),
+            self.assertRaises(DatabaseError),
+        ):
+            sweep_interview_response_deadlines()
+
+        self.interviews[0].refresh_from_db()
+        self.assertEqual(self.interviews[0].status, Interview.STATUS.SCHEDULED)
+        schedule_email_dispatch.assert_not_called()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(sweep_interview_response_deadlines(), {"swept": 1, "queued": 1})
+
+    def test_nothing_to_sweep(self, schedule_email_dispatch):
+        self.assertEqual(sweep_interview_response_deadlines(), {"swept": 0, "queued": 0})
+        self.assertFalse(EmailNotification.objects.exists())
+        schedule_email_dispatch.assert_not_called()
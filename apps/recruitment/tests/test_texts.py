@@ -0,0 +1,105 @@
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from django.test import SimpleTestCase
+
+from apps.recruitment.sms import SMSGateway
+
+
+class FakeGatewayHandler(BaseHTTPRequestHandler):
+    """
+    Answers each request with the next queued status code, recording the query and the form
+    body it received. A status of None stalls the response past the client's timeout.
+    """
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"])).decode()
+        with self.server.lock:
+            self.server.requests.append({**parse_qs(urlparse(self.path).query), **parse_qs(body)})
+            self.server.queries.append(urlparse(self.path).query)
+            status = self.server.statuses.pop(0) if self.server.statuses else 200
+        if status is None:
+            time.sleep(0.5)
+            status = 200
+        self.send_response(status)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"OK")
+
+    def log_message(self, format, *args):
+        pass
+
+
+class SMSGatewayTest(SimpleTestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeGatewayHandler)
+        self.server.requests = []
+        self.server.queries = []
+        self.server.statuses = []
+        self.server.lock = threading.Lock()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        host, port = self.server.server_address
+        self.gateway = SMSGateway(f"http://{host}:{port}", "user", "secret", timeout=2, backoff=0)
+
+    def test_message_and_credentials_are_sent_in_body(self):
+        self.assertTrue(self.gateway.send("+264811234567", "Hello & welcome #1"))
+
+        params = self.server.requests[0]
+        self.assertEqual(params["recipient"], ["+264811234567"])
+        self.assertEqual(params["messagedata"], ["Hello & welcome #1"])
+        self.assertEqual(params["password"], ["secret"])
+        self.assertEqual(self.server.queries, [""])
+        self.assertEqual(self.gateway.stats["sent"], 1)
+
+    def test_server_errors_are_retried(self):
+        self.server.statuses = [503, 502]
+
+        self.assertTrue(self.gateway.send("+264811234567", "Hello"))
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertEqual(self.gateway.stats["sent"], 1)
+        self.assertEqual(self.gateway.stats["failed"], 0)
+
+    def test_client_errors_are_not_retried(self):
+        self.server.statuses = [400]
+
+        self.assertFalse(self.gateway.send("+264811234567", "Hello"))
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(self.gateway.stats["failed"], 1)
+
+    def test_read_timeouts_are_not_retried(self):
+        self.server.statuses = [None]
+        self.gateway.timeout = 0.1
+
+        with self.assertLogs("apps.recruitment.sms", "ERROR"):
+            self.assertFalse(self.gateway.send("+264811234567", "Hello"))
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_connection_errors_are_retried_without_logging_credentials_or_recipient(self):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        gateway = SMSGateway(f"http://127.0.0.1:{port}", "user", "secret", timeout=2, max_retries=1, backoff=0)
+
+        with self.assertLogs("apps.recruitment.sms", "WARNING") as logs:
+            self.assertFalse(gateway.send("+264811234567", "Hello"))
+        self.assertEqual(len(logs.output), 2)
+        self.assertNotIn("secret", "".join(logs.output))
+        self.assertNotIn("264811234567", "".join(logs.output))
+        self.assertIn("*********567", logs.output[0])
+
+    def test_send_many_keeps_order(self):
+        self.server.statuses = [200, 400, 200]
+        self.gateway.max_retries = 0
+        self.gateway.max_workers = 1
+
+        results = self.gateway.send_many([("+264811234560", "a"), ("+264811234561", "b"), ("+264811234562", "c")])
+
+        self.assertEqual(results, [True, False, True])
+        self.assertEqual(self.gateway.stats["sent"], 2)
+        self.assertEqual(self.gateway.stats["failed"], 1)
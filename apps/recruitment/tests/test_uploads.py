@@ -0,0 +1,209 @@
+import base64
+import hashlib
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import BytesIO
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.recruitment.models import Application, CVUpload, Vacancy
+from apps.recruitment.uploads import UploadOffsetConflictError, append_cv_upload_chunk, purge_stale_cv_uploads
+from apps.utils.storage import upload_staging_storage
+from apps.utils.validators import FileValidator
+
+CV = b"%PDF-1.4\n" + b"x" * 2500
+
+
+class CVUploadTest(TestCase):
+    def setUp(self):
+        for setting in ("MEDIA_ROOT", "UPLOAD_STAGING_ROOT"):
+            root = tempfile.mkdtemp()
+            self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+            settings_override = override_settings(**{setting: root}, CV_UPLOAD_CHUNK_SIZE=1024)
+            settings_override.enable()
+            self.addCleanup(settings_override.disable)
+
+        self.vacancy = Vacancy.objects.create(
+            title="Test Vacancy", deadline=timezone.now() + timedelta(days=7), is_public=True, is_published=True
+        )
+
+    def create_upload(self, filename="cv.pdf", length=len(CV)):
+        metadata = "filename " + base64.b64encode(filename.encode()).decode()
+        return self.client.post(
+            reverse("recruitment:cv_upload_create"),
+            headers={"Upload-Length": str(length), "Upload-Metadata": metadata},
+        )
+
+    def patch(self, location, offset, data):
+        return self.client.generic(
+            "PATCH",
+            location,
+            data,
+            content_type="application/offset+octet-stream",
+            headers={"Upload-Offset": str(offset)},
+        )
+
+    def apply(self, upload):
+        return self.client.post(
+            reverse("recruitment:vacancy_detail", args=[self.vacancy.slug]),
+            {
+                "first_name": "Test",
+                "last_name": "User",
+                "email": "test@example.com",
+                "primary_contact": "+264811234567",
+                "date_of_birth": "1990-01-01",
+                "gender": "male",
+                "cv_upload": str(upload.pk),
+            },
+        )
+
+    def test_upload_is_resumed_and_referenced_by_the_application(self):
+        response = self.create_upload()
+        self.assertEqual(response.status_code, 201)
+        location = response["Location"]
+
+        self.assertEqual(self.patch(location, 0, CV[:1024])["Upload-Offset"], "1024")
+        # A chunk resent after its response was lost conflicts and reports the offset to resume at
+        response = self.patch(location, 0, CV[:1024])
+        self.assertEqual((response.status_code, response["Upload-Offset"]), (409, "1024"))
+        self.assertEqual(self.patch(location, 1024, CV[1024:2048]).status_code, 204)
+        self.assertEqual(self.client.head(location)["Upload-Offset"], "2048")
+        self.assertEqual(self.patch(location, 2048, CV[2048:]).status_code, 204)
+
+        upload = CVUpload.objects.get()
+        self.assertTrue(upload.is_complete)
+        response = self.apply(upload)
+
+        self.assertRedirects(response, reverse("recruitment:application_success"), fetch_redirect_response=False)
+        with Application.objects.get().cv.open("rb") as f:
+            self.assertEqual(f.read(), CV)
+        self.assertFalse(CVUpload.objects.exists())
+        self.assertFalse(upload_staging_storage.exists(upload.staging_name))
+
+    def test_stale_duplicate_chunk_leaves_the_file_untouched(self):
+        location = self.create_upload()["Location"]
+        # Loaded before the chunks below, like a request for a resent chunk that was slow to arrive
+        stale = CVUpload.objects.get()
+        self.patch(location, 0, CV[:1024])
+        self.patch(location, 1024, CV[1024:2048])
+
+        with self.assertRaises(UploadOffsetConflictError):
+            append_cv_upload_chunk(stale, 0, BytesIO(CV[:1024]), 1024)
+
+        self.assertEqual(self.patch(location, 2048, CV[2048:]).status_code, 204)
+        with upload_staging_storage.open(stale.staging_name, "rb") as f:
+            self.assertEqual(f.read(), CV)
+
+    def test_chunk_is_received_before_the_upload_is_locked(self):
+        self.create_upload()
+        upload = CVUpload.objects.get()
+        savepoints = len(connection.savepoint_ids)
+        stream = BytesIO(CV[:1024])
+        read = stream.read
+
+        def read_outside_transaction(size):
+            # No transaction of the upload's own, so no row lock, while the client sends the chunk
+            self.assertEqual(len(connection.savepoint_ids), savepoints)
+            return read(size)
+
+        stream.read = read_outside_transaction
+        self.assertEqual(append_cv_upload_chunk(upload, 0, stream, 1024), 1024)
+
+    def test_unacceptable_files_are_rejected_before_upload(self):
+        self.assertEqual(self.create_upload(filename="cv.exe").status_code, 400)
+        self.assertEqual(self.create_upload(length=11 * 1024 * 1024).status_code, 400)
+        self.assertEqual(self.create_upload(length=0).status_code, 400)
+        self.assertFalse(CVUpload.objects.exists())
+
+    def test_upload_without_staged_file_is_unfinished(self):
+        upload = CVUpload.objects.create(filename="cv.pdf", length=0)
+
+        response = self.apply(upload)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.context["form"].errors["cv"], ["Your CV upload did not finish, please upload it again."]
+        )
+        self.assertFalse(Application.objects.exists())
+
+    def test_oversized_chunks_are_rejected(self):
+        location = self.create_upload()["Location"]
+
+        self.assertEqual(self.patch(location, 0, CV[:1025]).status_code, 413)
+        self.assertEqual(CVUpload.objects.get().offset, 0)
+
+    def test_stale_uploads_are_purged(self):
+        location = self.create_upload()["Location"]
+        self.patch(location, 0, CV[:1024])
+        upload = CVUpload.objects.get()
+        CVUpload.objects.update(updated_at=timezone.now() - timedelta(days=2))
+
+        self.assertEqual(purge_stale_cv_uploads(), 1)
+        self.assertFalse(upload_staging_storage.exists(upload.staging_name))
+
+
+class CVUploadHandlerTest(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        vacancy = Vacancy.objects.create(
+            title="Test Vacancy", deadline=timezone.now() + timedelta(days=7), is_public=True, is_published=True
+        )
+        self.url = reverse("recruitment:vacancy_detail", args=[vacancy.slug])
+
+    def apply(self, name, content):
+        return self.client.post(
+            self.url,
+            {
+                "first_name": "Test",
+                "last_name": "User",
+                "email": "test@example.com",
+                "primary_contact": "+264811234567",
+                "date_of_birth": "1990-01-01",
+                "gender": "male",
+                "cv": SimpleUploadedFile(name, content, content_type="application/pdf"),
+            },
+        )
+
+    def stored_files(self):
+        return sorted(
+            os.path.relpath(os.path.join(directory, name), self.media_root)
+            for directory, _, names in os.walk(self.media_root)
+            for name in names
+        )
+
+    def test_accepted_upload_is_moved_into_place(self):
+        response = self.apply("cv.pdf", CV)
+
+        self.assertEqual(response.status_code, 302)
+        digest = hashlib.sha256(CV).hexdigest()
+        self.assertEqual(Application.objects.get().cv.name, f"cv/{digest[:2]}/{digest}.pdf")
+        self.assertEqual(self.stored_files(), [f"cv/{digest[:2]}/{digest}.pdf"])
+
+    def test_upload_with_wrong_magic_bytes_is_rejected(self):
+        response = self.apply("cv.pdf", b"MZ\x90\x00" + b"x" * 2500)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["form"].errors["cv"], ["The file is not a valid PDF file."])
+        self.assertEqual(self.stored_files(), [])
+
+    def test_oversized_upload_is_dropped_once_past_the_limit(self):
+        validator = next(v for v in Application._meta.get_field("cv").validators if isinstance(v, FileValidator))
+
+        with mock.patch.object(validator, "max_size", 1024):
+            response = self.apply("cv.pdf", CV)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("File size exceeds the maximum allowed (1024 bytes)", response.context["form"].errors["cv"])
+        self.assertEqual(self.stored_files(), [])
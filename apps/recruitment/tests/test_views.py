@@ -0,0 +1,159 @@
+import shutil
+import tempfile
+from datetime import date, timedelta
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.recruitment.models import (
+    Application,
+    Interview,
+    MinimumRequirement,
+    MinimumRequirementAnswer,
+    SelectQuestionTypeOptions,
+    Vacancy,
+)
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ApplicationCreateViewQueryTest(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.vacancy = Vacancy.objects.create(
+            title="Test Vacancy",
+            deadline=timezone.now() + timedelta(days=7),
+            is_public=True,
+            is_published=True,
+        )
+        self.requirements = [
+            MinimumRequirement.objects.create(vacancy=self.vacancy, title="Text", question_type="text"),
+            MinimumRequirement.objects.create(vacancy=self.vacancy, title="Bool", question_type="bool"),
+            MinimumRequirement.objects.create(vacancy=self.vacancy, title="Select", question_type="select"),
+        ]
+        SelectQuestionTypeOptions.objects.create(requirement=self.requirements[2], option="Yes")
+        self.url = reverse("recruitment:vacancy_detail", args=[self.vacancy.slug])
+
+    def get_data(self):
+        with open("apps/recruitment/tests/test.pdf", "rb") as f:
+            cv = SimpleUploadedFile("cv.pdf", f.read(), content_type="application/pdf")
+        return {
+            "first_name": "Test",
+            "last_name": "User",
+            "email": "test@example.com",
+            "primary_contact": "+264811234567",
+            "date_of_birth": date(1990, 1, 1).isoformat(),
+            "gender": "female",
+            "cv": cv,
+            f"requirement_{self.requirements[0].id}": "An answer",
+            f"requirement_{self.requirements[1].id}": "on",
+            f"requirement_{self.requirements[2].id}": "Yes",
+        }
+
+    def test_get_query_count(self):
+        # Vacancy, requirements and their options
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Test Vacancy")
+
+    def test_post_query_count(self):
+        # Vacancy, requirement schema, duplicate check, then the savepoint, application and a single
+        # insert of all answers. The year summary and pipeline counters are updated once the
+        # transaction commits.
+        with self.assertNumQueries(8):
+            response = self.client.post(self.url, self.get_data())
+        self.assertRedirects(response, reverse("recruitment:application_success"), fetch_redirect_response=False)
+
+        application = Application.objects.get()
+        self.assertEqual(application.vacancy, self.vacancy)
+        answers = MinimumRequirementAnswer.objects.filter(application=application).order_by("requirement_id")
+        self.assertEqual([answer.answer for answer in answers], ["An answer", "True", "Yes"])
+
+    def test_post_duplicate_primary_contact(self):
+        self.client.post(self.url, self.get_data())
+        data = self.get_data()
+        data["primary_contact"] = "081 123 4567"
+        with mock.patch("apps.utils.storage.ContentAddressedStorage._save") as save:
+            response = self.client.post(self.url, data)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "You have already applied for this vacancy.")
+        save.assert_not_called()
+        self.assertEqual(Application.objects.count(), 1)
+        self.assertEqual(MinimumRequirementAnswer.objects.count(), 3)
+
+    def test_duplicate_check_before_upload(self):
+        url = reverse("recruitment:duplicate_application_validation", args=[self.vacancy.pk])
+        self.assertEqual(self.client.post(url, {"primary_contact": "0811234567"}).content, b"")
+
+        self.client.post(self.url, self.get_data())
+
+        with self.assertNumQueries(1):
+            response = self.client.post(url, {"primary_contact": "0811234567"})
+        self.assertContains(response, "You have already applied for this vacancy.")
+
+
+class InterviewResponseViewQueryTest(TestCase):
+    def setUp(self):
+        vacancy = Vacancy.objects.create(title="Test Vacancy", deadline=timezone.now() + timedelta(days=7))
+        application = Application.objects.create(
+            vacancy=vacancy,
+            first_name="Test",
+            last_name="User",
+            email="test@example.com",
+            primary_contact="+264811234567",
+            date_of_birth=date(1990, 1, 1),
+        )
+        schedule_datetime = timezone.now() + timedelta(days=7)
+        while schedule_datetime.weekday() >= 5:
+            schedule_datetime += timedelta(days=1)
+        self.interview = Interview.objects.create(
+            application=application,
+            schedule_datetime=schedule_datetime,
+            status=Interview.STATUS.SCHEDULED,
+        )
+        self.url = reverse("recruitment:interview_invitation", args=[self.interview.pk])
+
+    def test_get_query_count(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+
+class BatchValidationTest(TestCase):
+    def test_fields_are_validated_in_one_request(self):
+        client = self.client_class(enforce_csrf_checks=True)
+        data = {"first_name": "J0hn", "last_name": "Doe", "email": "john@", "primary_contact": "+264811234567"}
+
+        with self.assertNumQueries(0):
+            response = client.post(reverse("batch_validation"), data)
+
+        # Answered ahead of the CSRF middleware, which would reject the tokenless request
+        self.assertEqual(response.status_code, 200)
+        content = response.content.decode()
+        self.assertEqual(content.count('hx-swap-oob="true"'), 4)
+        self.assertIn(
+            "<div id=\"first_name-error\" hx-swap-oob=\"true\"><p class='text-red-500 text-xs mt-1'>", content
+        )
+        self.assertIn('<div id="last_name-error" hx-swap-oob="true"></div>', content)
+        self.assertIn("Invalid: Enter Valid Email", content)
+        self.assertIn('<div id="primary_contact-error" hx-swap-oob="true"></div>', content)
+
+    def test_apply_form_uses_batch_validation(self):
+        vacancy = Vacancy.objects.create(
+            title="Test Vacancy", deadline=timezone.now() + timedelta(days=7), is_public=True, is_published=True
+        )
+
+        response = self.client.get(reverse("recruitment:vacancy_detail", args=[vacancy.slug]))
+
+        self.assertContains(response, f'hx-post="{reverse("batch_validation")}"')
+        self.assertContains(response, '<div id="primary_contact-error"></div>', html=True)
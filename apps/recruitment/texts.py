@@ -1,7 +1,8 @@
-import requests
-
+from apps.utils.phone import to_e164
 from config.env import env
 
+from .sms import SMSGateway
+
 # This URL is used for sending messages
 my_uri = env("SMS_URI")
 
@@ -9,6 +10,38 @@ my_uri = env("SMS_URI")
 my_username = str(env("SMS_USERNAME"))
 my_password = str(env("SMS_PASSWORD"))
 
+# Shared by every text sent from this process, so connections to the gateway are reused
+gateway = SMSGateway(
+    my_uri,
+    my_username,
+    my_password,
+    timeout=env.float("SMS_TIMEOUT", default=10),
+    max_retries=env.int("SMS_MAX_RETRIES", default=3),
+    backoff=env.float("SMS_RETRY_BACKOFF", default=0.5),
+    rate_limit=env.float("SMS_RATE_LIMIT", default=10),  # messages per second
+    max_workers=env.int("SMS_MAX_WORKERS", default=4),
+)
+
+
+def get_vacancy_application_notification_text(instance, created):
+    """
+    Composes the vacancy application notification for the application status.
+
+    Args:
+        instance (Application): The application instance related to the vacancy.
+        created (bool): A flag indicating whether the application was just created or updated.
+
+    Returns:
+        str: The message to send, or None if no text should be sent.
+    """
+    if created and instance.status == "submitted":
+        return f"Thank you for submitting your application for the {instance.vacancy.title} opportunity at Telecom Namibia. We acknowledge receipt of your application and will carefully assess your qualifications. You will be notified once the review process has been completed.Thank you for your interest in joining Telecom Namibia."
+    if not created and instance.status == "accepted":
+        return f"Thank you for submitting your application for the {instance.vacancy.title} opportunity at Telecom Namibia. Your application has successfully met the minimum criteria for further assessment. We will review your submission and inform you of the next steps in due course. We appreciate your interest in a career with Telecom Namibia."
+    if not created and instance.status == "rejected":
+        return f"Thank you for your application for the {instance.vacancy.title} opportunity at Telecom Namibia. After a thorough review, we regret to inform you that your application does not meet the minimum criteria. Reason: {instance.review_comments} We value your interest in Telecom Namibia and encourage you to apply for future opportunities. Wishing you success in your job search."
+    return None
+
 
 def send_vacancy_application_notification_text(instance, created):
     """
@@ -24,68 +57,28 @@ def send_vacancy_application_notification_text(instance, created):
         - If the application status is "accepted", a success message is sent.
         - If the application status is "rejected", a rejection message with review comments is sent.
     """
-    if created and instance.status == "submitted":
-        recipient = str(instance.primary_contact)
-        message_body = f"Thank you for submitting your application for the {instance.vacancy.title} opportunity at Telecom Namibia. We acknowledge receipt of your application and will carefully assess your qualifications. You will be notified once the review process has been completed.Thank you for your interest in joining Telecom Namibia."
-        http_req = (
-            f"{my_uri}/api?action=sendmessage"
-            f"&username={my_username}"
-            f"&password={my_password}"
-            f"&recipient={recipient}"
-            f"&messagetype=SMS:TEXT"
-            f"&messagedata={message_body}"
-        )
-        try:
-            response = requests.post(http_req)
-            response.raise_for_status()
-            print("Message sent")
-
-        except requests.exceptions.RequestException as ex:
-            print("An error occurred: {}".format(ex))
-            if ex.response is not None:
-                print("Error details: {}".format(ex.response.text))
+    message = get_vacancy_application_notification_text(instance, created)
+    if message is not None:
+        gateway.send(to_e164(instance.primary_contact), message)
 
-    if not created and instance.status == "accepted":
-        recipient = str(instance.primary_contact)
-        message_body = f"Thank you for submitting your application for the {instance.vacancy.title} opportunity at Telecom Namibia. Your application has successfully met the minimum criteria for further assessment. We will review your submission and inform you of the next steps in due course. We appreciate your interest in a career with Telecom Namibia."
-        http_req = (
-            f"{my_uri}/api?action=sendmessage"
-            f"&username={my_username}"
-            f"&password={my_password}"
-            f"&recipient={recipient}"
-            f"&messagetype=SMS:TEXT"
-            f"&messagedata={message_body}"
-        )
-        try:
-            response = requests.post(http_req)
-            response.raise_for_status()
-            print("Message sent")
-
-        except requests.exceptions.RequestException as ex:
-            print("An error occurred: {}".format(ex))
-            if ex.response is not None:
-                print("Error details: {}".format(ex.response.text))
 
-    if not created and instance.status == "rejected":
-        recipient = str(instance.primary_contact)
-        message_body = f"Thank you for your application for the {instance.vacancy.title} opportunity at Telecom Namibia. After a thorough review, we regret to inform you that your application does not meet the minimum criteria. Reason: {instance.review_comments} We value your interest in Telecom Namibia and encourage you to apply for future opportunities. Wishing you success in your job search."
-        http_req = (
-            f"{my_uri}/api?action=sendmessage"
-            f"&username={my_username}"
-            f"&password={my_password}"
-            f"&recipient={recipient}"
-            f"&messagetype=SMS:TEXT"
-            f"&messagedata={message_body}"
-        )
-        try:
-            response = requests.post(http_req)
-            response.raise_for_status()
-            print("Message sent")
-
-        except requests.exceptions.RequestException as ex:
-            print("An error occurred: {}".format(ex))
-            if ex.response is not None:
-                print("Error details: {}".format(ex.response.text))
+def send_vacancy_application_notification_texts(instances, created):
+    """
+    Sends vacancy application notifications for many applications concurrently.
+
+    Args:
+        instances (iterable): The Application instances to notify.
+        created (bool): A flag indicating whether the applications were just created or updated.
+
+    Returns:
+        list: Whether each text that was due was accepted by the gateway.
+    """
+    messages = []
+    for instance in instances:
+        message = get_vacancy_application_notification_text(instance, created)
+        if message is not None:
+            messages.append((to_e164(instance.primary_contact), message))
+    return gateway.send_many(messages)
 
 
 def send_vacancy_interview_notification_text(instance, created):
@@ -100,22 +93,5 @@ def send_vacancy_interview_notification_text(instance, created):
     Sends a message with an interview invitation link if the interview status is "scheduled".
     """
     if created and instance.status == "scheduled":
-        recipient = str(instance.primary_contact)
-        message_body = f"Telecom Namibia invites you for a {instance.application.vacancy.title} interview, please check your email inbox or spam folder for more information."
-        http_req = (
-            f"{my_uri}/api?action=sendmessage"
-            f"&username={my_username}"
-            f"&password={my_password}"
-            f"&recipient={recipient}"
-            f"&messagetype=SMS:TEXT"
-            f"&messagedata={message_body}"
-        )
-        try:
-            response = requests.post(http_req)
-            response.raise_for_status()
-            print("Message sent")
-
-        except requests.exceptions.RequestException as ex:
-            print("An error occurred: {}".format(ex))
-            if ex.response is not None:
-                print("Error details: {}".format(ex.response.text))
+        message = f"Telecom Namibia invites you for a {instance.application.vacancy.title} interview, please check your email inbox or spam folder for more information."
+        gateway.send(to_e164(instance.application.primary_contact), message)
@@ -0,0 +1,179 @@
+import base64
+import binascii
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+from apps.utils.storage import upload_staging_storage
+
+from .models import Application, CVUpload
+
+# The bytes read from the request at a time while a chunk is written
+READ_SIZE = 64 * 1024
+
+
+class UploadOffsetConflictError(Exception):
+    """Raised when a chunk doesn't start at the offset the upload has reached."""
+
+
+class UploadChunkTooLargeError(Exception):
+    """Raised when a chunk is larger than `CV_UPLOAD_CHUNK_SIZE` or runs past the upload length."""
+
+
+def parse_upload_metadata(header):
+    """
+    Parses a tus `Upload-Metadata` header, comma separated keys with base64 encoded values.
+
+    Args:
+        header (str): The header value.
+
+    Returns:
+        dict: The decoded values by key. Malformed values are left out.
+    """
+    metadata = {}
+    for pair in filter(None, (pair.strip() for pair in header.split(","))):
+        key, _, value = pair.partition(" ")
+        try:
+            metadata[key] = base64.b64decode(value, validate=True).decode("utf-8")
+        except (binascii.Error, UnicodeDecodeError):
+            continue
+    return metadata
+
+
+def create_cv_upload(filename, length):
+    """
+    Starts a chunked CV upload after checking the announced file against the validators of
+    `Application.cv`, so an unacceptable file is rejected before any of it is sent.
+
+    Args:
+        filename (str): The name of the file being uploaded.
+        length (int): The size of the file in bytes.
+
+    Returns:
+        CVUpload: The upload.
+
+    Raises:
+        ValidationError: If the file is empty or its type or size isn't accepted.
+    """
+    if length == 0:
+        raise ValidationError("The submitted file is empty.", code="empty")
+    filename = os.path.basename(filename)
+    stand_in = File(None, name=filename)
+    stand_in.size = length
+    for validator in Application._meta.get_field("cv").validators:
+        validator(stand_in)
+    return CVUpload.objects.create(filename=filename, length=length)
+
+
+def receive_cv_upload_chunk(upload, stream, size):
+    """
+    Reads a chunk from the client into a temporary file beside the staging file of its upload.
+
+    Args:
+        upload (CVUpload): The upload.
+        stream (file-like): The chunk, such as the request.
+        size (int): The size of the chunk in bytes.
+
+    Returns:
+        file: The temporary file, positioned at its start. Shorter than `size` if the client
+            stopped sending part way.
+    """
+    directory = os.path.dirname(upload_staging_storage.path(upload.staging_name))
+    os.makedirs(directory, exist_ok=True)
+    chunk = tempfile.TemporaryFile(dir=directory)
+    received = 0
+    while received < size and (data := stream.read(min(READ_SIZE, size - received))):
+        chunk.write(data)
+        received += len(data)
+    chunk.seek(0)
+    return chunk
+
+
+def append_cv_upload_chunk(upload, offset, stream, size):
+    """
+    Writes a chunk of an upload to its staging file and moves its offset past it.
+
+    The chunk is first received in full into a temporary file, however slowly the client
+    sends it. Only then is the row of the upload locked, for as long as it takes to copy the
+    chunk into the staging file, so chunks of an upload are written one at a time and only
+    at the offset the upload has reached. A chunk resent after its response was lost
+    conflicts without touching the file.
+
+    Args:
+        upload (CVUpload): The upload.
+        offset (int): The offset of the chunk in the file, which must be the upload's offset.
+        stream (file-like): The chunk, such as the request.
+        size (int): The size of the chunk in bytes.
+
+    Returns:
+        int: The new offset of the upload.
+
+    Raises:
+        CVUpload.DoesNotExist: If the upload has been deleted.
+        UploadOffsetConflictError: If `offset` isn't the offset of the upload.
+        UploadChunkTooLargeError: If the chunk is too large.
+    """
+    # Checked against the upload as loaded first, so a stale chunk isn't received at all
+    if offset != upload.offset:
+        raise UploadOffsetConflictError
+    if size > settings.CV_UPLOAD_CHUNK_SIZE or offset + size > upload.length:
+        raise UploadChunkTooLargeError
+
+    with receive_cv_upload_chunk(upload, stream, size) as chunk:
+        with transaction.atomic():
+            upload.offset = CVUpload.objects.select_for_update().values_list("offset", flat=True).get(pk=upload.pk)
+            if offset != upload.offset:
+                raise UploadOffsetConflictError
+
+            path = upload_staging_storage.path(upload.staging_name)
+            with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+                f.seek(offset)
+                shutil.copyfileobj(chunk, f, READ_SIZE)
+                # Drops what is left of a chunk cut short before, this request owns the rest of the file
+                f.truncate()
+                upload.offset = f.tell()
+
+            CVUpload.objects.filter(pk=upload.pk).update(offset=upload.offset, updated_at=timezone.now())
+    return upload.offset
+
+
+def open_cv_upload(upload):
+    """
+    Opens the staged file of a complete upload, to be saved to `Application.cv`.
+
+    Returns:
+        File: The file, named as it was uploaded.
+
+    Raises:
+        FileNotFoundError: If the staged file is missing, as no chunk of the upload was received.
+    """
+    return File(upload_staging_storage.open(upload.staging_name, "rb"), name=upload.filename)
+
+
+def delete_cv_upload(upload):
+    """Deletes an upload along with its staged file."""
+    upload_staging_storage.delete(upload.staging_name)
+    upload.delete()
+
+
+def purge_stale_cv_uploads():
+    """
+    Deletes the uploads that received no chunk for `CV_UPLOAD_EXPIRY` seconds, abandoned or
+    never referenced by an application.
+
+    Returns:
+        int: The number of uploads deleted.
+    """
+    stale = CVUpload.objects.filter(updated_at__lt=timezone.now() - timedelta(seconds=settings.CV_UPLOAD_EXPIRY))
+    count = 0
+    for upload in stale.iterator():
+        delete_cv_upload(upload)
+        count += 1
+    return count
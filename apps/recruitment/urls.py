@@ -30,6 +30,11 @@ validation_urls = [
         validation.secondary_contact_validation,
         name="secondary_contact_validation",
     ),
+    path(
+        "<uuid:pk>/duplicate_application_validation",
+        validation.duplicate_application_validation,
+        name="duplicate_application_validation",
+    ),
 ]
 
 urlpatterns = [
@@ -47,6 +52,8 @@ urlpatterns = [
         name="interview_invitation",
     ),
     path("success/", views.application_success, name="application_success"),
+    path("uploads/", views.CVUploadCreateView.as_view(), name="cv_upload_create"),
+    path("uploads/<uuid:pk>", views.CVUploadView.as_view(), name="cv_upload"),
     path(
         "interview_response_success/",
         views.interview_response_success,
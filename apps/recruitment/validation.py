@@ -1,6 +1,29 @@
 from django.http import HttpResponse
 
 from apps.utils import validators
+from apps.utils.phone import normalise_phone_number
+
+from .models import Application
+
+DUPLICATE_APPLICATION_MESSAGE = "You have already applied for this vacancy."
+
+
+def has_applied(vacancy_id, primary_contact):
+    """
+    Checks whether an application with a primary contact number was already made for a vacancy.
+
+    The number is normalised as it is stored, so the lookup is served by the index of the
+    `unique_vacancy_primary_contact` constraint.
+
+    Args:
+        vacancy_id (UUID): The ID of the vacancy.
+        primary_contact (str | PhoneNumber): The primary contact number, in any format.
+
+    Returns:
+        bool: Whether an application was found. Always False for an invalid number.
+    """
+    e164 = normalise_phone_number(primary_contact)
+    return e164 is not None and Application.objects.filter(vacancy_id=vacancy_id, primary_contact=e164).exists()
 
 
 # Name validations
@@ -68,3 +91,20 @@ def secondary_contact_validation(request) -> HttpResponse:
         HttpResponse: A response indicating whether the validation was successful or failed.
     """
     return validators.validate_contact(request, "secondary_contact")
+
+
+def duplicate_application_validation(request, pk) -> HttpResponse:
+    """
+    Checks whether the 'primary_contact' in the request already applied for the vacancy, so the
+    applicant is told before uploading their CV.
+
+    Args:
+        request (HttpRequest): The HTTP request containing the data to validate.
+        pk (UUID): The ID of the vacancy.
+
+    Returns:
+        HttpResponse: A response indicating whether the validation was successful or failed.
+    """
+    if has_applied(pk, request.POST.get("primary_contact")):
+        return HttpResponse(f"<p class='text-red-500 text-xs mt-1'>{DUPLICATE_APPLICATION_MESSAGE}</p>")
+    return HttpResponse("")
@@ -13,22 +13,36 @@ from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy
 from django.views.generic import CreateView, DetailView, ListView, UpdateView
 
+from django.core.exceptions import ValidationError
+from django.urls import reverse
+from django.views import View
+
 from apps.recruitment.forms import (
     ApplicationContactForm,
     ApplicationForm,
     InterviewInvitationResponseForm,
 )
+from apps.recruitment.mixins import CachedObjectMixin, VacancyMixin
+from apps.recruitment.uploads import (
+    UploadChunkTooLargeError,
+    UploadOffsetConflictError,
+    append_cv_upload_chunk,
+    create_cv_upload,
+    delete_cv_upload,
+    parse_upload_metadata,
+)
+from apps.recruitment.validation import DUPLICATE_APPLICATION_MESSAGE
 from apps.recruitment.models import (
     Application,
+    CVUpload,
     Interview,
-    MinimumRequirement,
     MinimumRequirementAnswer,
     Vacancy,
 )
 
 
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import HttpResponseRedirect
+from django.http import Http404, HttpResponseRedirect
 from django.conf import settings
 
 
@@ -89,15 +103,14 @@ class VacancyDetailView(DetailView):
     context_object_name = "vacancy"
 
 
-class ApplicationCreateView(CreateView):
+class ApplicationCreateView(VacancyMixin, CreateView):
     model = Application
     form_class = ApplicationForm
     success_url = reverse_lazy("recruitment:application_success")
     template_name = "recruitment/vacancy/detail.html"
 
     def get(self, request, *args, **kwargs):
-        slug = self.kwargs.get("slug")
-        vacancy = get_object_or_404(Vacancy, slug=slug)
+        vacancy = self.vacancy
 
         # Check if the vacancy is internal and the user is not on the intranet
         if vacancy.is_public is False and not request.is_intranet:
@@ -107,8 +120,7 @@ class ApplicationCreateView(CreateView):
         return super().get(request, *args, **kwargs)
 
     def form_valid(self, form):
-        slug = self.kwargs.get("slug")
-        vacancy = get_object_or_404(Vacancy, slug=slug)  # Fetch the vacancy based on the slug
+        vacancy = self.vacancy
         try:
             # Wrap the entire save process in a transaction to ensure atomicity
             with transaction.atomic():
@@ -118,55 +130,62 @@ class ApplicationCreateView(CreateView):
                 application.is_internal = self.request.is_intranet  # if applied via the intranet
                 application.save()  # Save the application to the database
 
-                # Save answers to minimum requirements if any
-                requirements = MinimumRequirement.objects.filter(vacancy=vacancy)
-                for requirement in requirements:
-                    # answer = form.cleaned_data[f"requirement_{requirement.id}"]
-                    # MinimumRequirementAnswer.objects.create(
-                    #     application=application, requirement=requirement, answer=answer
-                    # )
-
-                    field_name = f"requirement_{requirement.id}"
-                    # Check if the field is in the cleaned_data to avoid KeyError
-                    if field_name in form.cleaned_data:
-                        answer = form.cleaned_data[field_name]
-                        MinimumRequirementAnswer.objects.create(
-                            application=application, requirement=requirement, answer=answer
+                # Save answers to minimum requirements if any, using the schema the form was built from.
+                # All answers go in with a single INSERT to keep the transaction short.
+                MinimumRequirementAnswer.objects.bulk_create(
+                    [
+                        MinimumRequirementAnswer(
+                            application=application,
+                            requirement_id=requirement["id"],
+                            answer=form.cleaned_data[requirement["field_name"]],
                         )
+                        for requirement in form.requirements
+                        # Check if the field is in the cleaned_data to avoid KeyError
+                        if requirement["field_name"] in form.cleaned_data
+                    ]
+                )
 
                 # Save many-to-many relationships
                 form.save_m2m()
 
         except IntegrityError:
-            # Handle the case where the user has already applied for the vacancy
+            # Handle the case where the user has already applied for the vacancy. The form checks
+            # this before the CV is stored, so this is a concurrent duplicate. Its CV is left to the
+            # storage's garbage collection, as another application may share the file.
             messages.add_message(
                 self.request,
                 messages.ERROR,
-                "You have already applied for this vacancy.",
+                DUPLICATE_APPLICATION_MESSAGE,
             )
             return self.form_invalid(form)
 
-        return super().form_valid(form)  # Proceed to the success URL
+        # The CV was copied to its storage with the application, so its staged upload can go
+        if form.cv_upload is not None:
+            form.cleaned_data["cv"].close()
+            delete_cv_upload(form.cv_upload)
+
+        # The application is already saved, so redirect directly instead of letting
+        # CreateView.form_valid save it a second time
+        self.object = application
+        return HttpResponseRedirect(self.get_success_url())  # Proceed to the success URL
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        slug = self.kwargs.get("slug")
-        vacancy = get_object_or_404(Vacancy, slug=slug)
+        vacancy = self.vacancy
         context["disable_link"] = timezone.now() > vacancy.deadline  # Disable link if the deadline has passed
         context["vacancy"] = vacancy  # Include the vacancy details in the context
+        context["cv_upload_chunk_size"] = settings.CV_UPLOAD_CHUNK_SIZE
         return context
 
     def get_form_kwargs(self):
         kwargs = super().get_form_kwargs()
-        slug = self.kwargs.get("slug")
-        vacancy = get_object_or_404(Vacancy, slug=slug)
-        kwargs["vacancy"] = vacancy
+        kwargs["vacancy"] = self.vacancy
         kwargs["request"] = self.request
         return kwargs
 
 
-class InterviewResponseView(UpdateView):
-    model = Interview
+class InterviewResponseView(CachedObjectMixin, UpdateView):
+    queryset = Interview.objects.select_related("location")
     form_class = InterviewInvitationResponseForm
     template_name = "recruitment/interview/invitation.html"
     success_url = reverse_lazy("recruitment:interview_response_success")
@@ -187,8 +206,7 @@ class InterviewResponseView(UpdateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        pk = self.kwargs.get("pk")
-        interview = get_object_or_404(Interview, pk=pk)
+        interview = self.object
         context["interview"] = interview
 
         disabled_statuses = ["no_response", "accepted", "rescheduled", "rejected"]
@@ -207,6 +225,79 @@ def interview_response_success(request):
     return render(request, "recruitment/interview/success.html")
 
 
+TUS_HEADERS = {"Tus-Resumable": "1.0.0", "Cache-Control": "no-store"}
+
+
+class CVUploadCreateView(View):
+    """
+    Starts a resumable CV upload, following the tus creation protocol: the file size is sent
+    in `Upload-Length` and its name in `Upload-Metadata`, and the upload's URL is returned in
+    `Location`.
+    """
+
+    http_method_names = ["post"]
+
+    def post(self, request, *args, **kwargs):
+        try:
+            length = int(request.headers.get("Upload-Length", ""))
+        except ValueError:
+            length = -1
+        if length < 0:
+            return HttpResponse("Upload-Length is required.", status=400, headers=TUS_HEADERS)
+        filename = parse_upload_metadata(request.headers.get("Upload-Metadata", "")).get("filename", "")
+
+        try:
+            upload = create_cv_upload(filename, length)
+        except ValidationError as ex:
+            return HttpResponse(" ".join(ex.messages), status=400, headers=TUS_HEADERS)
+
+        location = reverse("recruitment:cv_upload", args=[upload.pk])
+        return HttpResponse(status=201, headers={**TUS_HEADERS, "Location": location, "Upload-Offset": "0"})
+
+
+class CVUploadView(View):
+    """
+    Resumes a CV upload, following the tus core protocol: HEAD returns the offset reached and
+    PATCH sends the chunk starting at that offset.
+    """
+
+    http_method_names = ["head", "patch"]
+
+    def dispatch(self, request, *args, **kwargs):
+        self.upload = get_object_or_404(CVUpload, pk=kwargs["pk"])
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_headers(self):
+        return {
+            **TUS_HEADERS,
+            "Upload-Offset": str(self.upload.offset),
+            "Upload-Length": str(self.upload.length),
+        }
+
+    def head(self, request, *args, **kwargs):
+        return HttpResponse(status=200, headers=self.get_headers())
+
+    def patch(self, request, *args, **kwargs):
+        if request.content_type != "application/offset+octet-stream":
+            return HttpResponse(status=415, headers=TUS_HEADERS)
+        try:
+            offset = int(request.headers.get("Upload-Offset", ""))
+            size = int(request.headers.get("Content-Length", ""))
+        except ValueError:
+            return HttpResponse("Upload-Offset and Content-Length are required.", status=400, headers=TUS_HEADERS)
+
+        try:
+            append_cv_upload_chunk(self.upload, offset, request, size)
+        except CVUpload.DoesNotExist:
+            raise Http404
+        except UploadOffsetConflictError:
+            self.upload.refresh_from_db(fields=["offset"])
+            return HttpResponse(status=409, headers=self.get_headers())
+        except UploadChunkTooLargeError:
+            return HttpResponse(status=413, headers=self.get_headers())
+        return HttpResponse(status=204, headers=self.get_headers())
+
+
 class ApplicationsListView(ListView):
     model = Application
     template_name = "recruitment/application/list.html"
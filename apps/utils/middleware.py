@@ -0,0 +1,28 @@
+from functools import cached_property
+
+from django.urls import reverse
+
+from .views import batch_validation
+
+
+class ValidationFastPathMiddleware:
+    """
+    Answers batch field validation requests before the rest of the middleware runs.
+
+    The apply form validates its fields as they are typed. The validation only reads the
+    posted values, so it doesn't need the session, CSRF, auth, messages or allauth middleware.
+    This middleware should be listed before the session middleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    @cached_property
+    def path(self):
+        return reverse("batch_validation")
+
+    def __call__(self, request):
+        if request.method == "POST" and request.path_info == self.path:
+            return batch_validation(request)
+
+        return self.get_response(request)
@@ -0,0 +1,177 @@
+import re
+from functools import lru_cache
+
+import phonenumbers
+from django.core import validators
+from django.core.exceptions import ValidationError
+from django.db import models
+from phonenumber_field import formfields, modelfields
+from phonenumber_field.phonenumber import PhoneNumber
+
+NAMIBIA_COUNTRY_CODE = 264
+DEFAULT_REGION = "NA"
+
+# The number of recently parsed numbers that fall outside the fast path and whose parse is remembered
+PARSE_CACHE_SIZE = 4096
+
+# Separators allowed between the digits of a number
+SEPARATORS = re.compile(r"[\s().-]")
+
+# Namibian mobile numbers, +264 or 0 followed by nine digits starting with 60, 81, 82, 84 or 85.
+# These match the mobile ranges of the phonenumbers metadata, so anything they accept is valid.
+NAMIBIAN_MOBILE_PATTERN = re.compile(r"^(?:\+264|0)((?:60|8[1245])\d{7})$")
+NAMIBIAN_MOBILE_NATIONAL_PATTERN = re.compile(r"^(?:60|8[1245])\d{7}$")
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse(value, region):
+    """Parses a number with phonenumbers, returning it with its E.164 form or None if invalid."""
+    try:
+        number = phonenumbers.parse(value, region, keep_raw_input=True)
+    except phonenumbers.NumberParseException:
+        return None, None
+    if not phonenumbers.is_valid_number(number):
+        return number, None
+    return number, phonenumbers.format_number(number, phonenumbers.PhoneNumberFormat.E164)
+
+
+def normalise_phone_number(value, region=DEFAULT_REGION):
+    """
+    Normalises a phone number to E.164, the canonical form numbers are stored and compared in.
+
+    Namibian mobile numbers in the +264 and 0 formats are normalised without parsing. Any other
+    number is parsed with phonenumbers, and the parses of recent numbers are cached.
+
+    Args:
+        value (str | PhoneNumber): The phone number.
+        region (str): The region of numbers given without an international prefix.
+
+    Returns:
+        str | None: The number in E.164 format, or None if it isn't a valid phone number.
+    """
+    if value in validators.EMPTY_VALUES:
+        return None
+    if isinstance(value, phonenumbers.PhoneNumber):
+        national_number = str(value.national_number)
+        if (
+            value.country_code == NAMIBIA_COUNTRY_CODE
+            and not value.extension
+            and NAMIBIAN_MOBILE_NATIONAL_PATTERN.match(national_number)
+        ):
+            return f"+{NAMIBIA_COUNTRY_CODE}{national_number}"
+        if not phonenumbers.is_valid_number(value):
+            return None
+        return phonenumbers.format_number(value, phonenumbers.PhoneNumberFormat.E164)
+
+    match = NAMIBIAN_MOBILE_PATTERN.match(SEPARATORS.sub("", value))
+    if match:
+        return f"+{NAMIBIA_COUNTRY_CODE}{match[1]}"
+    return _parse(value, region)[1]
+
+
+def to_e164(value, region=DEFAULT_REGION):
+    """
+    Returns a valid phone number in E.164 format and an invalid one as it was entered.
+
+    Args:
+        value (str | PhoneNumber): The phone number.
+        region (str): The region of numbers given without an international prefix.
+
+    Returns:
+        str: The number.
+    """
+    e164 = normalise_phone_number(value, region)
+    if e164 is not None:
+        return e164
+    return getattr(value, "raw_input", None) or str(value)
+
+
+def to_phone_number(value, region=DEFAULT_REGION):
+    """
+    Converts a value to a `PhoneNumber`, like `phonenumber_field.phonenumber.to_python`, but
+    through the fast path and the parse cache of `normalise_phone_number`.
+
+    Args:
+        value (str | PhoneNumber | None): The phone number.
+        region (str): The region of numbers given without an international prefix.
+
+    Returns:
+        PhoneNumber | str | None: The phone number, or the empty value as given.
+    """
+    if value in validators.EMPTY_VALUES or isinstance(value, PhoneNumber):
+        return value
+    if isinstance(value, phonenumbers.PhoneNumber):
+        number = PhoneNumber()
+        number.merge_from(value)
+        return number
+    if not isinstance(value, str):
+        raise TypeError(f"Can't convert {type(value).__name__} to PhoneNumber.")
+
+    match = NAMIBIAN_MOBILE_PATTERN.match(SEPARATORS.sub("", value))
+    if match:
+        return PhoneNumber(country_code=NAMIBIA_COUNTRY_CODE, national_number=int(match[1]), raw_input=value)
+
+    # A copy, so the cached parse is never changed through the instances it is handed to
+    number = PhoneNumber(raw_input=value)
+    parsed, _ = _parse(value, region)
+    if parsed is not None:
+        number.merge_from(parsed)
+    return number
+
+
+def mask_phone_number(value):
+    """
+    Masks all but the last three digits of a phone number, for logs that mustn't hold it.
+
+    Args:
+        value (str | PhoneNumber): The phone number.
+
+    Returns:
+        str: The masked number, e.g. "*********567".
+    """
+    value = str(value)
+    return "*" * max(len(value) - 3, 0) + value[-3:]
+
+
+def validate_phone_number(value):
+    """Raises a `ValidationError` if the value isn't a valid phone number."""
+    if value not in validators.EMPTY_VALUES and normalise_phone_number(value) is None:
+        raise ValidationError("The phone number entered is not valid.", code="invalid")
+
+
+class PhoneNumberFormField(formfields.PhoneNumberField):
+    """A phone number form field that parses and validates through `normalise_phone_number`."""
+
+    default_validators = [validate_phone_number]
+
+    def to_python(self, value):
+        if value in validators.EMPTY_VALUES:
+            return self.empty_value
+        return to_phone_number(value, region=self.region)
+
+
+class PhoneNumberDescriptor(modelfields.PhoneNumberDescriptor):
+    def __set__(self, instance, value):
+        instance.__dict__[self.field.name] = to_phone_number(value, region=self.field.region)
+
+
+class PhoneNumberField(modelfields.PhoneNumberField):
+    """
+    A phone number model field that stores valid numbers in E.164 format, as normalised by
+    `normalise_phone_number` in the field's region, so equal numbers always compare equal in
+    lookups and unique constraints however they were entered.
+    """
+
+    descriptor_class = PhoneNumberDescriptor
+    default_validators = [validate_phone_number]
+
+    def get_prep_value(self, value):
+        if value not in validators.EMPTY_VALUES:
+            value = to_e164(value, region=self.region)
+        return models.CharField.get_prep_value(self, value)
+
+    def from_db_value(self, value, expression, connection):
+        return to_phone_number(value, region=self.region)
+
+    def formfield(self, **kwargs):
+        return super().formfield(**{"form_class": PhoneNumberFormField, **kwargs})
@@ -0,0 +1,182 @@
+import hashlib
+import os
+import re
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files import locks
+from django.core.files.storage import FileSystemStorage
+from django.db import models
+from django.utils.deconstruct import deconstructible
+from django.utils.functional import cached_property
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File system storage that stores each unique file once, named after its SHA-256 digest.
+
+    Uploads are hashed chunk by chunk and saved as `<upload_to>/<digest[:2]>/<digest><ext>`.
+    When a file with the same digest already exists the write is skipped and the existing
+    name is returned, so identical uploads share one file on disk.
+
+    Because a file may be shared, and a save may reuse a file before the row referencing it
+    is committed, `delete` never removes files. Files no row references are removed by
+    `collect_garbage` once they have not been saved for a grace period.
+    """
+
+    # The names of stored files within a directory, <digest><ext>
+    digest_name_pattern = re.compile(r"^[0-9a-f]{64}(\.\w+)?$")
+
+    def get_digest(self, content):
+        # Uploads hashed while they streamed in, see ValidatingFileUploadHandler
+        if getattr(content, "sha256", None):
+            return content.sha256
+        hasher = hashlib.sha256()
+        for chunk in content.chunks():
+            hasher.update(chunk)
+        return hasher.hexdigest()
+
+    def get_digest_name(self, name, digest):
+        directory, filename = os.path.split(name)
+        extension = os.path.splitext(filename)[1].lower()
+        return os.path.join(directory, digest[:2], f"{digest}{extension}")
+
+    def _save(self, name, content):
+        name = self.get_digest_name(name, self.get_digest(content))
+        if self.touch(name):
+            return name
+        return super()._save(name, content)
+
+    def touch(self, name):
+        """
+        Marks an existing file as just saved, so it is kept for the grace period of
+        `collect_garbage` while the row referencing it is committed.
+
+        The file is locked, so it is either touched before the collector looks at it or
+        found deleted once the collector has removed it.
+
+        Args:
+            name (str): The name of the file in this storage.
+
+        Returns:
+            bool: True if the file exists and was touched.
+        """
+        path = self.path(name)
+        try:
+            with open(path, "rb") as f:
+                locks.lock(f, locks.LOCK_SH)
+                if os.fstat(f.fileno()).st_nlink == 0:
+                    return False
+                os.utime(path)
+                return True
+        except FileNotFoundError:
+            return False
+
+    def delete(self, name):
+        # Shared files are removed by collect_garbage, see the class docstring
+        pass
+
+    def get_fields(self):
+        return [
+            (model, field)
+            for model in apps.get_models()
+            for field in model._meta.get_fields()
+            if isinstance(field, models.FileField) and isinstance(field.storage, ContentAddressedStorage)
+        ]
+
+    def collect_garbage(self, grace_period):
+        """
+        Deletes the files of this storage that no row references and that were last saved
+        more than `grace_period` seconds ago.
+
+        Args:
+            grace_period (int): The seconds a file is kept after it was last saved.
+
+        Returns:
+            int: The number of files deleted.
+        """
+        fields = self.get_fields()
+        referenced = set()
+        directories = set()
+        for model, field in fields:
+            referenced.update(model._default_manager.exclude(**{field.name: ""}).values_list(field.name, flat=True))
+            if isinstance(field.upload_to, str):
+                directories.add(field.upload_to)
+
+        cutoff = time.time() - grace_period
+        deleted = 0
+        for directory in directories:
+            if not self.exists(directory):
+                continue
+            for prefix in self.listdir(directory)[0]:
+                for filename in self.listdir(os.path.join(directory, prefix))[1]:
+                    name = os.path.join(directory, prefix, filename)
+                    if name in referenced or not self.digest_name_pattern.match(filename):
+                        continue
+                    if self.remove_if_unused(name, cutoff):
+                        deleted += 1
+        return deleted
+
+    def remove_if_unused(self, name, cutoff):
+        path = self.path(name)
+        try:
+            with open(path, "rb") as f:
+                locks.lock(f, locks.LOCK_EX)
+                if os.fstat(f.fileno()).st_mtime > cutoff:
+                    return False
+                os.remove(path)
+                return True
+        except FileNotFoundError:
+            return False
+
+
+content_addressed_storage = ContentAddressedStorage()
+
+
+class PrivateStorage(FileSystemStorage):
+    """
+    File system storage rooted at the directory of the `root_setting` setting instead of
+    MEDIA_ROOT, for files that must not be served as media.
+    """
+
+    root_setting = None
+
+    @cached_property
+    def base_location(self):
+        return self._value_or_setting(self._location, getattr(settings, self.root_setting))
+
+    def _clear_cached_properties(self, setting, **kwargs):
+        super()._clear_cached_properties(setting, **kwargs)
+        if setting == self.root_setting:
+            self.__dict__.pop("base_location", None)
+            self.__dict__.pop("location", None)
+
+
+@deconstructible
+class ExportStorage(PrivateStorage):
+    """
+    File system storage for generated exports, rooted at EXPORT_ROOT.
+
+    Exports are not served as media, they are downloaded through views that check who may
+    read them.
+    """
+
+    root_setting = "EXPORT_ROOT"
+
+
+@deconstructible
+class UploadStagingStorage(PrivateStorage):
+    """
+    File system storage for uploads received in chunks, rooted at UPLOAD_STAGING_ROOT.
+
+    Each upload is appended to its own file here until it is complete and moved to its final
+    storage.
+    """
+
+    root_setting = "UPLOAD_STAGING_ROOT"
+
+
+export_storage = ExportStorage()
+upload_staging_storage = UploadStagingStorage()
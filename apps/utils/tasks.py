@@ -0,0 +1,12 @@
+from celery import shared_task
+from django.conf import settings
+
+from .storage import content_addressed_storage
+
+
+@shared_task
+def collect_content_addressed_files_task():
+    """
+    A periodic Celery task, run by beat, that deletes content-addressed files no row references.
+    """
+    return content_addressed_storage.collect_garbage(settings.CONTENT_ADDRESSED_GRACE_PERIOD)
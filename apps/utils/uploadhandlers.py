@@ -0,0 +1,156 @@
+import hashlib
+import os
+import tempfile
+from functools import lru_cache
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import InMemoryUploadedFile, TemporaryUploadedFile, UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, StopFutureHandlers
+from django.core.validators import FileExtensionValidator
+
+from .validators import FileSignatureValidator, FileValidator
+
+# The directory, within the storage of a field, uploads are written to as they stream in
+INCOMING_DIRECTORY = ".incoming"
+
+
+@lru_cache(maxsize=None)
+def get_upload_field(field_name):
+    """
+    Returns the model file field the uploads of a form field are validated against, as
+    configured in `VALIDATED_UPLOAD_FIELDS`.
+
+    Args:
+        field_name (str): The name of the form field.
+
+    Returns:
+        FileField | None: The model field, or None if uploads to the form field aren't validated.
+    """
+    label = settings.VALIDATED_UPLOAD_FIELDS.get(field_name)
+    if label is None:
+        return None
+    model_label, _, name = label.rpartition(".")
+    return apps.get_model(model_label)._meta.get_field(name)
+
+
+def get_field_validator(field, validator_class):
+    return next((validator for validator in field.validators if isinstance(validator, validator_class)), None)
+
+
+class StagedUploadedFile(TemporaryUploadedFile):
+    """
+    An upload written to a temporary file in the directory of the storage it is saved to, so
+    saving it is a rename rather than a copy. It carries the SHA-256 digest of its content.
+    """
+
+    def __init__(self, directory, name, content_type, size, charset, content_type_extra=None):
+        os.makedirs(directory, exist_ok=True)
+        file = tempfile.NamedTemporaryFile(suffix=".upload" + os.path.splitext(name)[1], dir=directory)
+        UploadedFile.__init__(self, file, name, content_type, size, charset, content_type_extra)
+        self.sha256 = None
+
+
+class ValidatingFileUploadHandler(FileUploadHandler):
+    """
+    Streams uploads to the fields of `VALIDATED_UPLOAD_FIELDS` straight to their storage,
+    checking them against the validators of their model field as they arrive.
+
+    The extension is checked before any data is read, the magic bytes on the first chunk and
+    the size on every chunk, so an unacceptable file is dropped as soon as it is recognised
+    instead of after it has been received in full. The rest of a dropped file is discarded
+    as it is read, and a placeholder with its name, first bytes and size is passed on, which
+    fails the field's validators with their usual messages.
+
+    Accepted files are hashed and written to a temporary file beside their storage, from
+    which the storage moves them into place. Uploads to other fields are left to the next
+    handlers.
+    """
+
+    file = None
+
+    def new_file(self, field_name, file_name, content_type, content_length, charset=None, content_type_extra=None):
+        super().new_file(field_name, file_name, content_type, content_length, charset, content_type_extra)
+        self.file = None
+        self.field = get_upload_field(field_name)
+        if self.field is None or not isinstance(self.field.storage, FileSystemStorage):
+            self.field = None
+            return
+
+        extension_validator = get_field_validator(self.field, FileExtensionValidator)
+        size_validator = get_field_validator(self.field, FileValidator)
+        signature_validator = get_field_validator(self.field, FileSignatureValidator)
+        self.max_size = size_validator.max_size if size_validator else None
+        self.signatures = signature_validator.signatures if signature_validator else {}
+        self.received = 0
+        self.header = b""
+        self.hasher = hashlib.sha256()
+        self.rejected = False
+
+        try:
+            if extension_validator is not None:
+                extension_validator(UploadedFile(name=file_name))
+        except ValidationError:
+            self.rejected = True
+        else:
+            self.file = StagedUploadedFile(
+                os.path.join(self.field.storage.location, INCOMING_DIRECTORY),
+                file_name,
+                content_type,
+                0,
+                charset,
+                content_type_extra,
+            )
+        raise StopFutureHandlers
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.field is None:
+            return raw_data
+
+        if start == 0:
+            self.header = raw_data[:64]
+            extension = os.path.splitext(self.file_name)[1][1:].lower()
+            signatures = self.signatures.get(extension)
+            if signatures and not raw_data.startswith(signatures):
+                self.reject()
+        self.received += len(raw_data)
+        if self.max_size is not None and self.received > self.max_size:
+            self.reject()
+
+        if not self.rejected:
+            self.file.write(raw_data)
+            self.hasher.update(raw_data)
+        return None
+
+    def reject(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        self.rejected = True
+
+    def file_complete(self, file_size):
+        if self.field is None:
+            return None
+
+        if self.rejected:
+            return InMemoryUploadedFile(
+                BytesIO(self.header),
+                self.field_name,
+                self.file_name,
+                self.content_type,
+                self.received,
+                self.charset,
+                self.content_type_extra,
+            )
+
+        self.file.seek(0)
+        self.file.size = file_size
+        self.file.sha256 = self.hasher.hexdigest()
+        return self.file
+
+    def upload_interrupted(self):
+        if self.file is not None:
+            self.file.close()
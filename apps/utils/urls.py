@@ -3,5 +3,6 @@ from django.urls import path
 from . import views
 
 urlpatterns = [
+    path("validation/", views.batch_validation, name="batch_validation"),
     path("validation/email/", views.email_validation, name="email_validation"),
 ]
@@ -1,9 +1,13 @@
+import os
 import re
 
 from django.core.exceptions import ValidationError
+from django.db.models.fields.files import FieldFile
 from django.http import HttpResponse
 from django.utils.deconstruct import deconstructible
 
+from .phone import normalise_phone_number
+
 
 @deconstructible
 class FileValidator:
@@ -18,10 +22,47 @@ class FileValidator:
         return self.max_size == other.max_size
 
 
+# The magic bytes files of each extension start with
+FILE_SIGNATURES = {
+    "pdf": (b"%PDF-",),
+    "docx": (b"PK\x03\x04",),
+}
+
+
+@deconstructible
+class FileSignatureValidator:
+    """
+    Checks that an uploaded file starts with the magic bytes of its extension, so a file
+    renamed to an accepted extension is rejected. Extensions without a known signature are
+    left to `FileExtensionValidator`, and files already stored are not read again.
+    """
+
+    def __init__(self, signatures=None):
+        self.signatures = signatures or FILE_SIGNATURES
+
+    def __call__(self, value):
+        extension = os.path.splitext(value.name or "")[1][1:].lower()
+        signatures = self.signatures.get(extension)
+        if not signatures or (isinstance(value, FieldFile) and value._committed):
+            return
+        file = value.file
+        if file is None:
+            return
+
+        position = file.tell()
+        file.seek(0)
+        header = file.read(max(map(len, signatures)))
+        file.seek(position)
+        if not header.startswith(signatures):
+            raise ValidationError(f"The file is not a valid {extension.upper()} file.", code="invalid_signature")
+
+    def __eq__(self, other):
+        return isinstance(other, FileSignatureValidator) and self.signatures == other.signatures
+
+
 # Name validation
-invalid_name_response = HttpResponse(
-    "<p class='text-red-500 text-xs mt-1'>Invalid: Only letters and spaces allowed</p>"
-)
+INVALID_NAME_MESSAGE = "Invalid: Only letters and spaces allowed"
+invalid_name_response = HttpResponse(f"<p class='text-red-500 text-xs mt-1'>{INVALID_NAME_MESSAGE}</p>")
 
 name_pattern = re.compile(r"^[a-zA-Z\s]+$")
 
@@ -39,13 +80,8 @@ def validate_name(request, field_name):
 
 
 # Contact validation
-invalid_contact_response = HttpResponse(
-    "<p class='text-red-500 text-xs mt-1'>Invalid: Enter Valid Namibian Phone Number</p>"
-)
-
-
-# Compile the regex pattern once for better performance
-namibian_phone_regex = re.compile(r"^(?:\+264|0)(81|82|85|86|87|88)[0-9]{7}$")
+INVALID_CONTACT_MESSAGE = "Invalid: Enter Valid Namibian Phone Number"
+invalid_contact_response = HttpResponse(f"<p class='text-red-500 text-xs mt-1'>{INVALID_CONTACT_MESSAGE}</p>")
 
 
 def validate_contact(request, field_name):
@@ -54,7 +90,42 @@ def validate_contact(request, field_name):
     if not contact:
         return HttpResponse("")
 
-    if not namibian_phone_regex.match(contact):
+    if normalise_phone_number(contact) is None:
         return invalid_contact_response
 
     return HttpResponse("")
+
+
+# Email validation
+INVALID_EMAIL_MESSAGE = "Invalid: Enter Valid Email"
+
+email_regex = re.compile(r"^[\w\.-]+@[\w\.-]+\.\w+$")
+
+
+# Batch validation
+FIELD_VALIDATIONS = {
+    "first_name": (name_pattern.match, INVALID_NAME_MESSAGE),
+    "middle_name": (name_pattern.match, INVALID_NAME_MESSAGE),
+    "last_name": (name_pattern.match, INVALID_NAME_MESSAGE),
+    "email": (email_regex.match, INVALID_EMAIL_MESSAGE),
+    "primary_contact": (normalise_phone_number, INVALID_CONTACT_MESSAGE),
+    "secondary_contact": (normalise_phone_number, INVALID_CONTACT_MESSAGE),
+}
+
+
+def validate_fields(data):
+    """
+    Validates every field of `FIELD_VALIDATIONS` present in the data.
+
+    Args:
+        data (QueryDict): The submitted field values.
+
+    Returns:
+        dict: The error message of each validated field, empty if its value is empty or valid.
+    """
+    errors = {}
+    for field_name, (check, message) in FIELD_VALIDATIONS.items():
+        if field_name in data:
+            value = data.get(field_name)
+            errors[field_name] = message if value and not check(value) else ""
+    return errors
@@ -1,6 +1,7 @@
-import re
-
 from django.http import HttpResponse
+from django.utils.html import format_html, format_html_join
+
+from . import validators
 
 # Create your views here.
 
@@ -12,10 +13,35 @@ def email_validation(request):
         return HttpResponse("")
 
     # Define regex for basic email validation
-    email_regex = r"^[\w\.-]+@[\w\.-]+\.\w+$"
-    if not re.match(email_regex, email):
+    if not validators.email_regex.match(email):
         # Customize the response to return a specific error message
-        return HttpResponse("<p class='text-red-500 text-xs mt-1'>Invalid: Enter Valid Email</p>")
+        return HttpResponse(f"<p class='text-red-500 text-xs mt-1'>{validators.INVALID_EMAIL_MESSAGE}</p>")
 
     # Return empty response if email is valid
     return HttpResponse("")
+
+
+def batch_validation(request):
+    """
+    Validates every known field posted in one request.
+
+    Served by `ValidationFastPathMiddleware` ahead of the session, CSRF, auth and messages
+    middleware, as it reads nothing but the posted values.
+
+    Args:
+        request (HttpRequest): The HTTP request containing the fields to validate.
+
+    Returns:
+        HttpResponse: An out-of-band swap of the `<field>-error` element of each validated field.
+    """
+    errors = validators.validate_fields(request.POST)
+    return HttpResponse(
+        format_html_join(
+            "",
+            '<div id="{}-error" hx-swap-oob="true">{}</div>',
+            (
+                (field_name, format_html("<p class='text-red-500 text-xs mt-1'>{}</p>", message) if message else "")
+                for field_name, message in errors.items()
+            ),
+        )
+    )
@@ -1,6 +1,7 @@
 import os
 
 from celery import Celery
+from celery.signals import worker_init
 
 # Set the default Django settings module for the 'celery' program.
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.development")
@@ -13,3 +14,11 @@ app.config_from_object("config.settings.base", namespace="CELERY")
 
 # Automatically discover tasks in each app's 'tasks.py' file
 app.autodiscover_tasks()
+
+
+@worker_init.connect
+def warm_email_templates(**kwargs):
+    """Compiles the email templates before the pool forks, so every child starts with them loaded."""
+    from apps.recruitment.templating import email_templates
+
+    email_templates.warm()
@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 from config.env import BASE_DIR, env
 
@@ -65,6 +66,7 @@ INSTALLED_APPS = (
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",  # whitenoise
+    "apps.utils.middleware.ValidationFastPathMiddleware",  # batch field validation
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -141,6 +143,33 @@ STATICFILES_FINDERS = (
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
+# Content-addressed files are shared between rows and never deleted with them. A periodic task
+# removes the files no row references once they haven't been saved for this many seconds.
+CONTENT_ADDRESSED_GRACE_PERIOD = env.int("CONTENT_ADDRESSED_GRACE_PERIOD", default=24 * 60 * 60)
+
+# Background exports hold applicant data, so they are kept outside MEDIA_ROOT and only served
+# through the admin
+EXPORT_ROOT = env("EXPORT_ROOT", default=os.path.join(BASE_DIR, "exports"))
+EXPORT_CHUNK_SIZE = env.int("EXPORT_CHUNK_SIZE", default=2000)  # rows fetched per round trip
+
+# Uploads to these form fields are checked against the validators of their model field while
+# they stream in and written beside their storage, see apps.utils.uploadhandlers
+FILE_UPLOAD_HANDLERS = [
+    "apps.utils.uploadhandlers.ValidatingFileUploadHandler",
+    "django.core.files.uploadhandler.MemoryFileUploadHandler",
+    "django.core.files.uploadhandler.TemporaryFileUploadHandler",
+]
+VALIDATED_UPLOAD_FIELDS = {
+    "cv": "recruitment.Application.cv",
+    "advert": "recruitment.Vacancy.advert",
+}
+
+# CVs uploaded in resumable chunks are staged here until the application referencing them is
+# submitted. Stale uploads are purged by a periodic task.
+UPLOAD_STAGING_ROOT = env("UPLOAD_STAGING_ROOT", default=os.path.join(BASE_DIR, "uploads"))
+CV_UPLOAD_CHUNK_SIZE = env.int("CV_UPLOAD_CHUNK_SIZE", default=1024 * 1024)  # largest chunk accepted, bytes
+CV_UPLOAD_EXPIRY = env.int("CV_UPLOAD_EXPIRY", default=24 * 60 * 60)  # seconds since the last chunk
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
@@ -152,6 +181,20 @@ AUTHENTICATION_BACKENDS = (
 )
 EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 
+# Notification emails are queued and sent in batches over a single connection
+EMAIL_BATCH_SIZE = env.int("EMAIL_BATCH_SIZE", default=100)  # send as soon as this many are pending
+EMAIL_BATCH_WINDOW = env.int("EMAIL_BATCH_WINDOW", default=10)  # otherwise wait this many seconds
+EMAIL_MAX_ATTEMPTS = env.int("EMAIL_MAX_ATTEMPTS", default=5)
+EMAIL_DISPATCH_TIME_LIMIT = env.int("EMAIL_DISPATCH_TIME_LIMIT", default=300)  # seconds a batch may run for
+# Notifications claimed longer ago than this were left by a worker that died mid batch and are claimed again
+EMAIL_CLAIM_LEASE = env.int("EMAIL_CLAIM_LEASE", default=3 * EMAIL_DISPATCH_TIME_LIMIT)
+
+# Jinja email templates, compiled once and shared between workers through the bytecode cache
+EMAIL_TEMPLATES_DIR = os.path.join(BASE_DIR, "templates", "emails")
+EMAIL_TEMPLATE_CACHE_DIR = env(
+    "EMAIL_TEMPLATE_CACHE_DIR", default=os.path.join(tempfile.gettempdir(), "recroot-email-templates")
+)
+
 STORAGES = {
     "default": {
         "BACKEND": "django.core.files.storage.FileSystemStorage",
@@ -176,5 +219,29 @@ UBLOCK_ORIGIN_EXCEPTIONS = [
 
 AUTH_USER_MODEL = "accounts.User"
 CELERY_BROKER_URL = env("BROKER_URL")
+CELERY_BEAT_SCHEDULE = {
+    "sweep-interview-response-deadlines": {
+        "task": "apps.recruitment.tasks.sweep_interview_response_deadlines_task",
+        "schedule": env.int("INTERVIEW_SWEEP_INTERVAL", default=300),  # seconds
+    },
+    "reconcile-pipeline-counters": {
+        "task": "apps.recruitment.tasks.reconcile_pipeline_counters_task",
+        "schedule": env.int("PIPELINE_RECONCILE_INTERVAL", default=60 * 60),  # seconds
+    },
+    "rebuild-application-summary": {
+        "task": "apps.recruitment.tasks.rebuild_application_year_summary_task",
+        "schedule": env.int("APPLICATION_SUMMARY_REBUILD_INTERVAL", default=60 * 60),  # seconds
+    },
+    "purge-stale-cv-uploads": {
+        "task": "apps.recruitment.tasks.purge_stale_cv_uploads_task",
+        "schedule": env.int("CV_UPLOAD_PURGE_INTERVAL", default=60 * 60),  # seconds
+    },
+    "collect-content-addressed-files": {
+        "task": "apps.utils.tasks.collect_content_addressed_files_task",
+        "schedule": env.int("CONTENT_ADDRESSED_COLLECT_INTERVAL", default=24 * 60 * 60),  # seconds
+    },
+}
 
-INTRANET_IP_RANGES = env.list("INTRANET_IP_RANGES", default=["127.0."])
+INTRANET_IP_RANGES = env.list("INTRANET_IP_RANGES", default=["127.0.0.0/8"])
+# Reverse proxies in front of the app that append to X-Forwarded-For (nginx)
+INTRANET_TRUSTED_PROXY_COUNT = env.int("INTRANET_TRUSTED_PROXY_COUNT", default=1)
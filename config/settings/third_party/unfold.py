@@ -5,6 +5,14 @@ from django.utils.translation import gettext_lazy as _
 
 module = os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.development")
 
+
+def has_role(request, name):
+    # Imported on use, as the settings are loaded before the apps
+    from apps.accounts.roles import has_role
+
+    return has_role(request.user, name)
+
+
 UNFOLD = {
     "SITE_TITLE": "Telecom Namibia",
     "SITE_HEADER": "Telecom Namibia",
@@ -86,6 +94,7 @@ UNFOLD = {
                         "link": "/"
                         + ("admin/" if module == "config.settings.development" else "oshimashakula/")
                         + "recruitment",
+                        "badge": "apps.recruitment.pipeline.applications_awaiting_review_badge",
                         "permission": lambda request: request.user.has_perm("view_application"),
                     },
                     # -----------------------------------------------------------------------
@@ -100,7 +109,7 @@ UNFOLD = {
                             if module == "config.settings.development"
                             else "dashboard/telecom/administrator/"
                         ),
-                        "permission": lambda request: request.user.groups.filter(name="admin").exists()
+                        "permission": lambda request: has_role(request, "admin")
                         and request.path.startswith("/dashboard/admin/"),
                     },
                     {
@@ -113,7 +122,7 @@ UNFOLD = {
                             else "dashboard/telecom/administrator/"
                         )
                         + "accounts/user",
-                        "permission": lambda request: request.user.groups.filter(name="admin").exists()
+                        "permission": lambda request: has_role(request, "admin")
                         and request.path.startswith("/dashboard/admin/"),
                     },
                     {
@@ -126,7 +135,7 @@ UNFOLD = {
                             else "dashboard/telecom/administrator/"
                         )
                         + "organisation",
-                        "permission": lambda request: request.user.groups.filter(name="admin").exists()
+                        "permission": lambda request: has_role(request, "admin")
                         and request.path.startswith("/dashboard/admin/"),
                     },
                     {
@@ -139,7 +148,8 @@ UNFOLD = {
                             else "dashboard/telecom/administrator/"
                         )
                         + "recruitment",
-                        "permission": lambda request: request.user.groups.filter(name="admin").exists()
+                        "badge": "apps.recruitment.pipeline.applications_awaiting_review_badge",
+                        "permission": lambda request: has_role(request, "admin")
                         and request.path.startswith("/dashboard/admin/"),
                     },
                     {
@@ -152,7 +162,7 @@ UNFOLD = {
                             else "dashboard/telecom/administrator/"
                         )
                         + "pages/announcement/",
-                        "permission": lambda request: request.user.groups.filter(name="admin").exists()
+                        "permission": lambda request: has_role(request, "admin")
                         and request.path.startswith("/dashboard/admin/"),
                     },
                     # -----------------------------------------------------------------------
@@ -162,14 +172,14 @@ UNFOLD = {
                         "title": _("Dashboard"),
                         "icon": "dashboard",
                         "link": reverse_lazy("Staff:index"),
-                        "permission": lambda request: request.user.groups.filter(name="staff").exists()
+                        "permission": lambda request: has_role(request, "staff")
                         and request.path.startswith("/dashboard/staff/"),
                     },
                     {
                         "title": _("Recruitment"),
                         "icon": "people",
                         "link": "/dashboard/staff/recruitment",
-                        "permission": lambda request: request.user.groups.filter(name="staff").exists()
+                        "permission": lambda request: has_role(request, "staff")
                         and request.path.startswith("/dashboard/staff/"),
                     },
                 ],
@@ -215,7 +225,7 @@ UNFOLD = {
                         else "dashboard/telecom/administrator/"
                     )
                     + "accounts/user",
-                    "permission": lambda request: request.user.groups.filter(name="admin").exists()
+                    "permission": lambda request: has_role(request, "admin")
                     or request.user.has_perm("view_user"),
                 },
                 {
@@ -227,7 +237,7 @@ UNFOLD = {
                         else "dashboard/telecom/administrator/"
                     )
                     + "auth/group",
-                    "permission": lambda request: request.user.groups.filter(name="admin").exists()
+                    "permission": lambda request: has_role(request, "admin")
                     or request.user.has_perm("view_group"),
                 },
                 {
@@ -239,7 +249,7 @@ UNFOLD = {
                         else "dashboard/telecom/administrator/"
                     )
                     + "account/emailaddress",
-                    "permission": lambda request: request.user.groups.filter(name="admin").exists()
+                    "permission": lambda request: has_role(request, "admin")
                     or request.user.has_perm("view_emailaddress"),
                 },
             ],
@@ -297,7 +307,7 @@ UNFOLD = {
                         else "dashboard/telecom/administrator/"
                     )
                     + "organisation/division",
-                    "permission": lambda request: request.user.groups.filter(name="admin").exists()
+                    "permission": lambda request: has_role(request, "admin")
                     or request.user.has_perm("view_division"),
                 },
                 {
@@ -309,7 +319,7 @@ UNFOLD = {
                         else "dashboard/telecom/administrator/"
                     )
                     + "organisation/position",
-                    "permission": lambda request: request.user.groups.filter(name="admin").exists()
+                    "permission": lambda request: has_role(request, "admin")
                     or request.user.has_perm("view_position"),
                 },
                 {
@@ -321,7 +331,7 @@ UNFOLD = {
                         else "dashboard/telecom/administrator/"
                     )
                     + "organisation/location",
-                    "permission": lambda request: request.user.groups.filter(name="admin").exists()
+                    "permission": lambda request: has_role(request, "admin")
                     or request.user.has_perm("view_location"),
                 },
                 {
@@ -333,7 +343,7 @@ UNFOLD = {
                         else "dashboard/telecom/administrator/"
                     )
                     + "organisation/costcentre",
-                    "permission": lambda request: request.user.groups.filter(name="admin").exists()
+                    "permission": lambda request: has_role(request, "admin")
                     or request.user.has_perm("view_costcentre"),
                 },
                 {
@@ -387,7 +397,7 @@ UNFOLD = {
                         else "dashboard/telecom/administrator/"
                     )
                     + "recruitment/application",
-                    "permission": lambda request: request.user.groups.filter(name="admin").exists()
+                    "permission": lambda request: has_role(request, "admin")
                     or request.user.has_perm("view_application"),
                 },
                 {
@@ -399,7 +409,7 @@ UNFOLD = {
                         else "dashboard/telecom/administrator/"
                     )
                     + "recruitment/vacancy",
-                    "permission": lambda request: request.user.groups.filter(name="admin").exists()
+                    "permission": lambda request: has_role(request, "admin")
                     or request.user.has_perm("view_vacancy"),
                 },
                 {
@@ -411,7 +421,7 @@ UNFOLD = {
                         else "dashboard/telecom/administrator/"
                     )
                     + "recruitment/interview",
-                    "permission": lambda request: request.user.groups.filter(name="admin").exists()
+                    "permission": lambda request: has_role(request, "admin")
                     or request.user.has_perm("view_interview"),
                 },
             ],
@@ -446,7 +456,7 @@ UNFOLD = {
                         else "dashboard/telecom/administrator/"
                     )
                     + "pages/announcement",
-                    "permission": lambda request: request.user.groups.filter(name="admin").exists()
+                    "permission": lambda request: has_role(request, "admin")
                     or request.user.has_perm("view_announcement"),
                 },
                 {
@@ -458,7 +468,7 @@ UNFOLD = {
                         else "dashboard/telecom/administrator/"
                     )
                     + "pages/faq",
-                    "permission": lambda request: request.user.groups.filter(name="admin").exists()
+                    "permission": lambda request: has_role(request, "admin")
                     or request.user.has_perm("view_faq"),
                 },
             ],
@@ -0,0 +1,10 @@
+import pytest
+from django.core.cache import cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Database rollbacks between tests do not fire signals, so cached pages must be dropped explicitly."""
+    cache.clear()
+    yield
+    cache.clear()
@@ -0,0 +1,108 @@
+// Uploads the CV of the apply form in chunks through the resumable (tus style) upload endpoint,
+// so a slow or dropped connection resumes where it stopped and the form itself only posts the
+// token of the finished upload. Without JavaScript the form posts the file as before.
+(function () {
+    const input = document.getElementById("cv");
+    const token = document.getElementById("cv_upload");
+    const status = document.getElementById("cv-upload-status");
+    if (!input || !token || !input.dataset.uploadUrl || !window.fetch) {
+        return;
+    }
+
+    const form = input.form;
+    const chunkSize = parseInt(input.dataset.chunkSize, 10) || 1024 * 1024;
+    const csrfToken = form.querySelector("[name=csrfmiddlewaretoken]").value;
+    const maxRetries = 10;
+    let uploading = null;
+
+    function request(url, method, headers, body) {
+        return fetch(url, {
+            method: method,
+            headers: Object.assign({"Tus-Resumable": "1.0.0", "X-CSRFToken": csrfToken}, headers),
+            body: body,
+            credentials: "same-origin",
+        });
+    }
+
+    function encodeMetadata(value) {
+        return btoa(unescape(encodeURIComponent(value)));
+    }
+
+    function wait(attempt) {
+        return new Promise((resolve) => setTimeout(resolve, Math.min(30000, 1000 * 2 ** attempt)));
+    }
+
+    async function upload(file) {
+        const created = await request(input.dataset.uploadUrl, "POST", {
+            "Upload-Length": String(file.size),
+            "Upload-Metadata": "filename " + encodeMetadata(file.name),
+        });
+        if (created.status !== 201) {
+            throw new Error(await created.text() || "The upload could not be started.");
+        }
+        const location = created.headers.get("Location");
+
+        let offset = 0;
+        let attempt = 0;
+        while (offset < file.size) {
+            status.textContent = "Uploading CV… " + Math.floor((offset * 100) / file.size) + "%";
+            try {
+                const response = await request(
+                    location,
+                    "PATCH",
+                    {"Content-Type": "application/offset+octet-stream", "Upload-Offset": String(offset)},
+                    file.slice(offset, offset + chunkSize),
+                );
+                if (response.status !== 204 && response.status !== 409) {
+                    throw new Error("Unexpected status " + response.status);
+                }
+                // A conflict answers with the offset the server has, so continue from there
+                offset = parseInt(response.headers.get("Upload-Offset"), 10);
+                attempt = 0;
+            } catch (error) {
+                if (++attempt > maxRetries) {
+                    throw new Error("The connection was lost, please try again.");
+                }
+                await wait(attempt);
+                const head = await request(location, "HEAD").catch(() => null);
+                if (head && head.ok) {
+                    offset = parseInt(head.headers.get("Upload-Offset"), 10);
+                }
+            }
+        }
+        return location.split("/").pop();
+    }
+
+    input.addEventListener("change", () => {
+        token.value = "";
+        if (input.dataset.name) {
+            input.name = input.dataset.name;
+        }
+        const file = input.files[0];
+        if (!file) {
+            return;
+        }
+        uploading = upload(file)
+            .then((value) => {
+                token.value = value;
+                // The file is already on the server, don't post it again with the form
+                input.dataset.name = input.name;
+                input.removeAttribute("name");
+                input.required = false;
+                status.textContent = "CV uploaded.";
+            })
+            .catch((error) => {
+                status.textContent = error.message;
+            })
+            .finally(() => {
+                uploading = null;
+            });
+    });
+
+    form.addEventListener("submit", (event) => {
+        if (uploading) {
+            event.preventDefault();
+            status.textContent = "Please wait for your CV to finish uploading.";
+        }
+    });
+})();